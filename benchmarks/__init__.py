@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for The Web Search-inator
+Headless: nothing here needs a display. Run from the repository root:
+
+    python -m benchmarks --sizes 1000,100000 --output results.json
+    python -m benchmarks --baseline results.json --threshold 0.2
+"""
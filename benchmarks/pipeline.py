@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for the query pipeline and persistence paths
+Each case runs on a synthetic client list of the requested size with mixed
+Latin and Devanagari names, a few per cent of them duplicates in another
+case, spacing or Unicode form. The best of several repeats is reported, and
+results can be saved as JSON and compared against an earlier file.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import unicodedata
+from datetime import datetime
+
+from searchinator import engine
+from searchinator.client_index import ClientIndex
+from searchinator.client_store import ClientListStore
+from searchinator.importer import iter_file_rows, sniff_format
+from searchinator.matrix import QueryMatrix
+from searchinator.normalize import dedupe_clients
+from searchinator.persistence import SettingsStore
+from searchinator.priority import SearchHistory, prioritize
+from searchinator.registry import ClientRegistry
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_THRESHOLD = 0.2
+SEED = 20240101
+
+LATIN_FIRST = ['Anil', 'Maria', 'John', 'Priya', 'Rohan', 'Sofia', 'Carlos', 'Neha',
+               'Francis', 'Lourdes', 'Vijay', 'Agnes', 'Dinesh', 'Fatima', 'Savio']
+LATIN_LAST = ['Naik', 'Fernandes', 'Kamat', 'DSouza', 'Gaonkar', 'Pereira', 'Shetye',
+              'Rodrigues', 'Prabhu', 'Dias', 'Sawant', 'Colaco', 'Parab', 'Costa']
+DEVANAGARI_FIRST = ['अनिल', 'प्रिया', 'रोहन', 'नेहा', 'विजय', 'दिनेश', 'सुनीता', 'गणेश',
+                    'क्षितिज', 'श्रद्धा']
+DEVANAGARI_LAST = ['नाईक', 'कामत', 'गावकर', 'प्रभू', 'सावंत', 'परब', 'शेटये', 'देसाई']
+COMPANIES = ['Traders', 'Constructions', 'Enterprises', 'Pvt Ltd', 'Hotels', 'Builders']
+
+
+def make_clients(count, seed=SEED):
+    """count synthetic client names, about a third Devanagari"""
+    rng = random.Random(seed)
+    names = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.35:
+            name = f"{rng.choice(DEVANAGARI_FIRST)} {rng.choice(DEVANAGARI_LAST)}"
+        elif roll < 0.85:
+            name = f"{rng.choice(LATIN_FIRST)} {rng.choice(LATIN_LAST)}"
+        else:
+            name = f"{rng.choice(LATIN_LAST)} {rng.choice(COMPANIES)}"
+        name = f"{name} {i}"
+        # Duplicates as they show up in merged lists
+        if names and rng.random() < 0.03:
+            twin = rng.choice(names)
+            name = rng.choice([twin.upper(), f"  {twin}  ", unicodedata.normalize('NFD', twin)])
+        names.append(name)
+    return names
+
+
+class Case:
+    """One benchmark: setup(clients) -> state, run(state) timed"""
+
+    def __init__(self, name, run, setup=None):
+        self.name = name
+        self.run = run
+        self.setup = setup or (lambda clients, folder: clients)
+
+
+def _settings_roundtrip(state):
+    store, settings = state
+    settings['delay'] = str(float(settings['delay']) + 1)
+    store.save(settings)
+    store.load()
+
+
+def _client_list_setup(clients, folder):
+    return ClientListStore(folder, delay=0), '\n'.join(clients)
+
+
+def _client_list_save(state):
+    store, text = state
+    store.replace_all(text)
+    store.flush()
+
+
+def _client_list_saved_setup(clients, folder):
+    # Only load() is timed, so the snapshot is written here
+    state = _client_list_setup(clients, folder)
+    _client_list_save(state)
+    return folder
+
+
+def _client_list_load(folder):
+    ClientListStore(folder, delay=0).load()
+
+
+def _import_setup(clients, folder):
+    path = os.path.join(folder, 'clients.csv')
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for i, name in enumerate(clients):
+            f.write(f"{name},{i},Goa\n")
+    return path
+
+
+def _import_file(path):
+    import_format, _first_row = sniff_format(path)
+    with open(path, 'rb') as raw:
+        for _name in iter_file_rows(raw, import_format):
+            pass
+
+
+def _registry_import(state):
+    folder, clients = state
+    registry = ClientRegistry(os.path.join(folder, f'registry-{time.perf_counter_ns()}.sqlite3'))
+    registry.import_clients(clients, 'Master')
+    registry.close()
+
+
+def _registry_setup(clients, folder):
+    registry = ClientRegistry.in_folder(folder)
+    registry.import_clients(clients, 'Master')
+    # A daily run of a few hundred clients out of the whole list
+    registry.import_clients(clients[::max(1, len(clients) // 300)], 'Daily', ['daily'])
+    return registry
+
+
+def _priority_setup(clients, folder):
+    searches = [engine.Search(engine.create_search_query(client, "Goa news"), "qdr:d", '',
+                              client) for client in clients]
+    history = SearchHistory.in_folder(folder)
+    # Half the list searched over the last few days, the rest never
+    now = time.time()
+    for i, search in enumerate(searches[::2]):
+        history.record_search(search, now - i % 7 * 86400)
+    return searches, history
+
+
+def _matrix_setup(clients, folder):
+    # Every 50th client with terms of its own, as a registry run has them;
+    # registry names are unique
+    clients = dedupe_clients(clients)[0]
+    overrides = {client: ['court case', 'tender', 'auction'] for client in clients[::50]}
+    periods = [('Past day', 'qdr:d'), ('Past week', 'qdr:w')]
+    matrix = QueryMatrix(clients, ['Goa news', 'fraud'], periods, client_terms=overrides)
+    count = sum(1 for _search in matrix)
+    if len(matrix) != count:
+        raise AssertionError(f"QueryMatrix len() is {len(matrix)} but it yields {count} searches")
+    return matrix
+
+
+CASES = [
+    Case('parse.text', lambda text: engine.parse_clients(text),
+         setup=lambda clients, folder: '\n'.join(clients)),
+    Case('parse.client_index', lambda text: ClientIndex(text).clients(),
+         setup=lambda clients, folder: '\n'.join(clients)),
+    Case('normalize.dedupe', lambda clients: dedupe_clients(clients)),
+    Case('query.create', lambda clients: [engine.create_search_query(c, "Goa news")
+                                          for c in clients]),
+    Case('url.create', lambda queries: [engine.create_search_url(q, "qdr:w") for q in queries],
+         setup=lambda clients, folder: [engine.create_search_query(c, "Goa news")
+                                        for c in clients]),
+    Case('url.batch', lambda clients: list(engine.iter_search_urls(clients, "Goa news",
+                                                                   "qdr:w"))),
+    Case('matrix.iter', lambda matrix: sum(1 for _search in matrix), setup=_matrix_setup),
+    Case('settings.save_load', _settings_roundtrip,
+         setup=lambda clients, folder: (SettingsStore(os.path.join(folder, 'settings.json')),
+                                        {'search_term': 'Goa news', 'time_period': 'qdr:d',
+                                         'delay': '2.0', 'batch_size': '10'})),
+    Case('client_list.save', _client_list_save, setup=_client_list_setup),
+    Case('client_list.load', _client_list_load, setup=_client_list_saved_setup),
+    Case('import.csv', _import_file, setup=_import_setup),
+    Case('registry.import', _registry_import, setup=lambda clients, folder: (folder, clients)),
+    Case('registry.select', lambda registry: registry.select('Daily', ['daily']),
+         setup=_registry_setup),
+    Case('priority.order', lambda state: prioritize(*state), setup=_priority_setup),
+]
+
+
+def time_case(case, clients, repeats):
+    """Run one case; return the list of durations in seconds"""
+    folder = tempfile.mkdtemp(prefix='searchinator-bench-')
+    try:
+        state = case.setup(clients, folder)
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            case.run(state)
+            timings.append(time.perf_counter() - started)
+        return timings
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def run_suite(sizes, repeats=None, only=None, log=print):
+    """Run every case at every size; return result dicts"""
+    results = []
+    for size in sizes:
+        clients = make_clients(size)
+        # Fewer repeats for the big lists keep a full run to minutes
+        case_repeats = repeats or max(1, min(5, 2000000 // max(size, 1)))
+        for case in CASES:
+            if only and not any(case.name.startswith(prefix) for prefix in only):
+                continue
+            timings = time_case(case, clients, case_repeats)
+            best = min(timings)
+            result = {'name': case.name, 'size': size, 'repeats': len(timings),
+                      'best_s': best, 'median_s': statistics.median(timings),
+                      'per_item_us': best / size * 1e6}
+            results.append(result)
+            log(f"{case.name:<22}{size:>10}{best * 1000:>12.2f} ms"
+                f"{result['per_item_us']:>10.3f} µs/item")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return [(name, size, baseline s, now s, change)] for regressions"""
+    before = {(entry['name'], entry['size']): entry['best_s'] for entry in baseline['results']}
+    regressions = []
+    for entry in results:
+        old = before.get((entry['name'], entry['size']))
+        if old is None or old <= 0:
+            continue
+        change = entry['best_s'] / old - 1
+        if change > threshold:
+            regressions.append((entry['name'], entry['size'], old, entry['best_s'], change))
+    return regressions
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Benchmark the query pipeline and persistence.")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="comma separated list sizes, e.g. 1000,1000000")
+    parser.add_argument('--repeats', type=int, default=None,
+                        help="runs per case (default: 5, fewer for big lists)")
+    parser.add_argument('--only', default=None,
+                        help="comma separated case name prefixes, e.g. url,parse")
+    parser.add_argument('--output', default=None, help="write results as JSON to this file")
+    parser.add_argument('--baseline', default=None,
+                        help="earlier --output file to compare against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="fail when a case is this much slower than the baseline "
+                             "(0.2 = 20%%)")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    only = [prefix.strip() for prefix in args.only.split(',')] if args.only else None
+
+    print(f"{'case':<22}{'clients':>10}{'best':>15}{'per item':>17}")
+    results = run_suite(sizes, args.repeats, only)
+    report = {'meta': {'timestamp': datetime.now().isoformat(timespec='seconds'),
+                       'python': platform.python_version(),
+                       'implementation': platform.python_implementation(),
+                       'platform': platform.platform(),
+                       'seed': SEED},
+              'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for name, size, old, new, change in regressions:
+            print(f"REGRESSION {name} @ {size}: {old * 1000:.2f} ms -> {new * 1000:.2f} ms "
+                  f"(+{change:.0%})", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No case slower than baseline by more than {args.threshold:.0%}")
+    return 0
@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+"""
+The Web Search-inator package
+The engine and helpers are importable without tkinter; the GUI lives in
+searchinator.gui and is only loaded when the window is shown.
+"""
+
+from .engine import (
+    SearchEngine,
+    create_search_query,
+    create_search_url,
+    get_last_n_days_param,
+    iter_clients,
+    iter_search_urls,
+    parse_clients,
+)
+from .paths import get_appdata_path, get_resource_path
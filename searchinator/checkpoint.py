@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Checkpoint journal for search runs
+Every run writes its parameters and query list once, then appends a line as
+each query is opened or fails. If the run is cancelled, crashes or the app
+is closed, the journal tells the next session exactly which queries are left.
+Only the latest run is kept. Searches also get their URL, client, term and
+packed members journaled, so a resumed run opens the same URLs and records
+the same coverage and history as the original.
+"""
+
+import json
+import os
+from datetime import datetime
+
+from .engine import Search, create_search_url
+from .persistence import atomic_write_text
+
+RUNS_FOLDER = 'runs'
+HEADER_NAME = 'last_run.json'
+QUERIES_NAME = 'last_run.queries'
+STATE_NAME = 'last_run.state'
+# Per-query time periods, only written for runs that mix several
+TIME_PARAMS_NAME = 'last_run.tbs'
+# Per-query URL, client, label, term and members, one JSON list per line
+SEARCHES_NAME = 'last_run.searches'
+
+
+def _search_record(search):
+    members = None
+    if search.members is not None:
+        members = [[member.query, member.time_param, member.url, member.client,
+                    member.label, member.term] for member in search.members]
+    return [search.url, search.client, search.label, search.term, members]
+
+
+def _search_from_record(query, time_param, record):
+    url, client, label, term, members = record
+    if members is not None:
+        members = [Search(*member) for member in members]
+    return Search(query, time_param, url, client, label, term, members)
+
+
+class RunState:
+    """What a journal says about a run"""
+
+    def __init__(self, header, queries, done, failed, time_params=None, searches=None):
+        self.header = header
+        self.params = header.get('params', {})
+        self.queries = queries
+        self.done = done
+        self.failed = failed
+        self.time_params = time_params
+        # _search_record() lists, or None for runs of plain query strings
+        self.searches = searches
+
+    @property
+    def finished(self):
+        """True once every query was opened"""
+        return len(self.done) >= len(self.queries)
+
+    def pending_indices(self):
+        """Indices still to open: failed ones and never attempted ones, in order"""
+        return [i for i in range(len(self.queries)) if i not in self.done]
+
+    def search(self, index):
+        """The Search for one journaled query"""
+        query = self.queries[index]
+        time_param = (self.time_params[index] if self.time_params is not None
+                      else self.params.get('time_param', ''))
+        if self.searches is not None:
+            return _search_from_record(query, time_param, self.searches[index])
+        return Search(query, time_param, create_search_url(query, time_param))
+
+    def first_unfinished(self):
+        """Index of the first query not attempted yet, or None"""
+        for i in range(len(self.queries)):
+            if i not in self.done and i not in self.failed:
+                return i
+        return None
+
+
+class RunJournal:
+    """Append-only record of one run's progress"""
+
+    def __init__(self, folder):
+        self.folder = os.path.join(folder, RUNS_FOLDER)
+        self.header_path = os.path.join(self.folder, HEADER_NAME)
+        self.queries_path = os.path.join(self.folder, QUERIES_NAME)
+        self.state_path = os.path.join(self.folder, STATE_NAME)
+        self.time_params_path = os.path.join(self.folder, TIME_PARAMS_NAME)
+        self.searches_path = os.path.join(self.folder, SEARCHES_NAME)
+        self._state_file = None
+
+    def start(self, params, queries):
+        """Begin journaling a new run, replacing the previous one
+
+        queries may be query strings or Searches; the time period of each
+        Search is kept when they are not all params['time_param'], and the
+        rest of it always.
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        self.close()
+        time_params = [getattr(query, 'time_param', params.get('time_param', ''))
+                       for query in queries]
+        if queries and isinstance(queries[0], Search):
+            atomic_write_text(self.searches_path, ''.join(
+                json.dumps(_search_record(search), ensure_ascii=False) + '\n'
+                for search in queries))
+        elif os.path.exists(self.searches_path):
+            os.remove(self.searches_path)
+        queries = [getattr(query, 'query', query) for query in queries]
+        # Queries never contain newlines: they come from one-per-line lists
+        atomic_write_text(self.queries_path, '\n'.join(queries))
+        if any(time_param != params.get('time_param', '') for time_param in time_params):
+            atomic_write_text(self.time_params_path, '\n'.join(time_params))
+        elif os.path.exists(self.time_params_path):
+            os.remove(self.time_params_path)
+        open(self.state_path, 'w').close()
+        header = {'started': datetime.now().isoformat(timespec='seconds'),
+                  'count': len(queries), 'params': params}
+        atomic_write_text(self.header_path, json.dumps(header, ensure_ascii=False))
+        self._state_file = open(self.state_path, 'a', encoding='utf-8')
+
+    def reopen(self):
+        """Keep appending to the existing journal, e.g. when resuming"""
+        self.close()
+        self._state_file = open(self.state_path, 'a', encoding='utf-8')
+
+    def record(self, indices, ok):
+        """Mark queries (by index in the journaled list) as opened or failed"""
+        if self._state_file is None:
+            return
+        status = 'done' if ok else 'failed'
+        self._state_file.write(''.join(json.dumps([i, status]) + '\n' for i in indices))
+        self._state_file.flush()
+
+    def close(self):
+        if self._state_file is not None:
+            self._state_file.close()
+            self._state_file = None
+
+    def load(self):
+        """Read the last run, or None if there is none"""
+        try:
+            with open(self.header_path, 'r', encoding='utf-8') as f:
+                header = json.load(f)
+            with open(self.queries_path, 'r', encoding='utf-8') as f:
+                queries = f.read().split('\n')
+        except (OSError, ValueError):
+            return None
+        if header.get('count') != len(queries):
+            return None
+        time_params = None
+        if os.path.exists(self.time_params_path):
+            try:
+                with open(self.time_params_path, 'r', encoding='utf-8') as f:
+                    time_params = f.read().split('\n')
+            except OSError:
+                return None
+            if len(time_params) != len(queries):
+                return None
+        searches = None
+        if os.path.exists(self.searches_path):
+            try:
+                with open(self.searches_path, 'r', encoding='utf-8') as f:
+                    searches = [json.loads(line) for line in f]
+            except (OSError, ValueError):
+                return None
+            if len(searches) != len(queries):
+                return None
+
+        done, failed = set(), set()
+        if os.path.exists(self.state_path):
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        index, status = json.loads(line)
+                    except ValueError:
+                        # Torn last line from a crash
+                        break
+                    if status == 'done':
+                        done.add(index)
+                        failed.discard(index)
+                    else:
+                        failed.add(index)
+        return RunState(header, queries, done, failed, time_params, searches)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Incrementally maintained index of the client list
+Editors report which lines an edit replaced and the index patches just
+those lines, so counting clients and handing the list to a run never
+re-parses the whole buffer.
+"""
+
+
+def _is_client(line):
+    return bool(line.strip())
+
+
+class ClientIndex:
+    """Line-by-line mirror of a client list with an O(1) client count"""
+
+    def __init__(self, text=""):
+        # Called as listener(start, end, new_lines) after every change;
+        # end is None when the whole list was replaced
+        self.listener = None
+        self.reset(text)
+
+    def reset(self, text):
+        """Replace the whole index from a block of text"""
+        self._lines = text.split('\n')
+        self._count = sum(1 for line in self._lines if _is_client(line))
+        self._clients = None
+        if self.listener:
+            self.listener(0, None, self._lines)
+
+    def replace_lines(self, start, end, new_lines):
+        """Replace lines[start:end] (0-based, end exclusive) with new_lines"""
+        removed = self._lines[start:end]
+        self._count -= sum(1 for line in removed if _is_client(line))
+        self._count += sum(1 for line in new_lines if _is_client(line))
+        self._lines[start:end] = new_lines
+        self._clients = None
+        if self.listener:
+            self.listener(start, end, new_lines)
+
+    @property
+    def count(self):
+        """Number of non-blank lines"""
+        return self._count
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def line_count(self):
+        """Number of raw lines, blank ones included"""
+        return len(self._lines)
+
+    def lines(self):
+        """The raw lines as they appear in the editor"""
+        return self._lines
+
+    def text(self):
+        """The whole list as one block of text"""
+        return '\n'.join(self._lines)
+
+    def clients(self):
+        """Stripped client names, cached until the next edit"""
+        if self._clients is None:
+            self._clients = [line.strip() for line in self._lines if _is_client(line)]
+        return self._clients
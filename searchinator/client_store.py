@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Client list storage, kept apart from settings.json
+The list lives in a plain-text snapshot plus an append-only journal of line
+edits, so changing one name appends one small record instead of rewriting
+the whole list. The journal is folded back into the snapshot once it grows.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+from .persistence import CoalescingWriter, atomic_write_bytes
+
+SNAPSHOT_NAME = 'clients.txt'
+JOURNAL_NAME = 'clients.journal'
+
+# Compact once the journal is bigger than this and bigger than the snapshot
+COMPACT_MIN_BYTES = 256 * 1024
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class ClientListStore:
+    """Snapshot + journal store for the client list lines
+
+    record() may be called from the UI thread for every edit; the records are
+    batched and appended by a background writer.
+    """
+
+    def __init__(self, folder, delay=0.5):
+        self.snapshot_path = os.path.join(folder, SNAPSHOT_NAME)
+        self.journal_path = os.path.join(folder, JOURNAL_NAME)
+        self._lines = ['']
+        self._snapshot_size = 0
+        self._journal_size = 0
+        self._journal_records = 0
+        self._lock = threading.Lock()
+        self._pending = []
+        self._writer = CoalescingWriter(lambda _: self._write_pending(), delay=delay)
+
+    def exists(self):
+        """True if a client list has been stored before"""
+        return os.path.exists(self.snapshot_path)
+
+    def load(self):
+        """Read the snapshot, replay the journal and return the list text"""
+        self._journal_size = self._journal_records = 0
+        if not self.exists():
+            self._lines = ['']
+            return ''
+        with open(self.snapshot_path, 'rb') as f:
+            data = f.read()
+        self._snapshot_size = len(data)
+        self._lines = data.decode('utf-8').split('\n')
+        base = _digest(data)
+
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'rb') as f:
+                header = f.readline()
+                # A journal left over from before the last compaction is stale
+                if header.endswith(b'\n') and json.loads(header).get('base') == base:
+                    self._journal_size = len(header)
+                    for line in f:
+                        try:
+                            start, end, new_lines = json.loads(line)
+                        except ValueError:
+                            # Torn final record from a crash mid-append
+                            break
+                        self._lines[start:end] = new_lines
+                        self._journal_size += len(line)
+                        self._journal_records += 1
+        return '\n'.join(self._lines)
+
+    def replace_all(self, text):
+        """Queue text as the new whole list"""
+        self.record(0, None, text.split('\n'))
+
+    def record(self, start, end, new_lines):
+        """Queue an edit replacing lines[start:end] (end None: to the end)"""
+        with self._lock:
+            self._pending.append((start, end, list(new_lines)))
+        self._writer.submit(None)
+
+    def flush(self, timeout=None):
+        """Wait for queued edits to reach the disk"""
+        return self._writer.flush(timeout)
+
+    def close(self, timeout=None):
+        """Write everything, fold the journal into the snapshot and stop"""
+        self._writer.close(timeout)
+        if self._journal_records:
+            self._compact()
+
+    def _write_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        records = []
+        replaced_all = False
+        for start, end, new_lines in pending:
+            if start == 0 and (end is None or end >= len(self._lines)):
+                # Whole list replaced - writing a snapshot is cheaper
+                replaced_all = True
+                end = len(self._lines)
+            self._lines[start:end] = new_lines
+            records.append((start, end, new_lines))
+
+        if replaced_all or not self._journal_size:
+            self._compact()
+            return
+
+        data = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+        data = data.encode('utf-8')
+        if self._journal_size + len(data) > max(COMPACT_MIN_BYTES, self._snapshot_size):
+            self._compact()
+            return
+        with open(self.journal_path, 'ab') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_size += len(data)
+        self._journal_records += len(records)
+
+    def _compact(self):
+        data = '\n'.join(self._lines).encode('utf-8')
+        atomic_write_bytes(self.snapshot_path, data)
+        self._snapshot_size = len(data)
+        header = (json.dumps({'base': _digest(data)}) + '\n').encode('utf-8')
+        atomic_write_bytes(self.journal_path, header)
+        self._journal_size = len(header)
+        self._journal_records = 0
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Per-client search coverage for "since last run" windows
+Picking "Last week" to be safe means re-reading results already seen the
+day before. The coverage store remembers, per client and term, the last day
+a completed search covered without a gap. A since-last-run period then asks
+each client only for the days after that, as a cd_min/cd_max range worked
+out when the run starts. Google ranges are whole days, so the last covered
+day is searched again rather than risk missing its later results.
+"""
+
+import json
+import os
+import re
+import threading
+from datetime import date, datetime, timedelta
+
+from .normalize import client_key
+from .persistence import atomic_write_text
+
+SINCE_LAST_RUN = 'since-last'
+SINCE_LAST_RUN_LABEL = 'Since last run'
+
+# Clients never searched before get this many days
+DEFAULT_FIRST_RUN_DAYS = 7
+
+DATE_FORMAT = '%Y%m%d'
+
+_QDR = re.compile(r'^qdr:([hdwmy])(\d*)$')
+_QDR_DAYS = {'h': 0, 'd': 1, 'w': 7, 'm': 31, 'y': 366}
+_CD_MIN = re.compile(r'cd_min:(\d{8})')
+_CD_MAX = re.compile(r'cd_max:(\d{8})')
+
+
+def date_range_param(start, end):
+    """tbs parameter for the whole days start..end"""
+    return f"cdr:1,cd_min:{start.strftime(DATE_FORMAT)},cd_max:{end.strftime(DATE_FORMAT)}"
+
+
+def window_bounds(time_param, today):
+    """(first day or None if unbounded, last day) a tbs covers, or None if unknown"""
+    if not time_param:
+        return None, today
+    match = _QDR.match(time_param)
+    if match:
+        unit, count = match.groups()
+        return today - timedelta(days=_QDR_DAYS[unit] * int(count or 1)), today
+    start, end = _CD_MIN.search(time_param), _CD_MAX.search(time_param)
+    if start and end:
+        try:
+            return (datetime.strptime(start.group(1), DATE_FORMAT).date(),
+                    datetime.strptime(end.group(1), DATE_FORMAT).date())
+        except ValueError:
+            return None
+    return None
+
+
+def coverage_key(client, term):
+    return f"{client_key(client)}\x1f{client_key(term or '')}"
+
+
+class CoverageStore:
+    """Persistent map from (client, term) to the last day searched without a gap"""
+
+    def __init__(self, path):
+        self.path = path
+        # key -> 'YYYYMMDD'
+        self._covered = None
+        self._dirty = False
+        # Searches are recorded on the worker while the Tk thread may read
+        self._lock = threading.RLock()
+
+    def _load(self):
+        if self._covered is not None:
+            return self._covered
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._covered = dict(json.load(f))
+        except (OSError, ValueError, TypeError):
+            self._covered = {}
+        return self._covered
+
+    def last_covered(self, client, term):
+        """Last day covered for client and term, or None"""
+        with self._lock:
+            stored = self._load().get(coverage_key(client, term))
+        if stored is None:
+            return None
+        try:
+            return datetime.strptime(stored, DATE_FORMAT).date()
+        except ValueError:
+            return None
+
+    def record(self, client, term, time_param, today=None):
+        """Note a completed search; return True if the coverage moved on
+
+        A window that starts after the last covered day leaves a gap, so it
+        does not count: the next since-last-run search still starts there.
+        """
+        today = today or date.today()
+        bounds = window_bounds(time_param, today)
+        if bounds is None:
+            return False
+        start, end = bounds
+        with self._lock:
+            previous = self.last_covered(client, term)
+            if previous is not None and (end <= previous
+                                         or (start is not None and start > previous)):
+                return False
+            self._load()[coverage_key(client, term)] = end.strftime(DATE_FORMAT)
+            self._dirty = True
+            return True
+
+    def record_search(self, search, today=None):
+        """record() every client a (possibly packed) Search covered"""
+        for member in search.covered():
+            if member.client is not None:
+                self.record(member.client, member.term, member.time_param, today)
+
+    def save(self):
+        """Write the store if it changed; return True if written"""
+        with self._lock:
+            if not self._dirty or self._covered is None:
+                return False
+            stored = sorted(self._covered.items())
+            self._dirty = False
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        atomic_write_text(self.path, json.dumps(stored, ensure_ascii=False, separators=(',', ':')))
+        return True
+
+
+class SinceLastRun:
+    """Time period whose cd_min/cd_max range depends on the client
+
+    The day is fixed when the period is created, i.e. when the run starts,
+    so a run going past midnight still asks every client the same question.
+    """
+
+    label = SINCE_LAST_RUN_LABEL
+
+    def __init__(self, store, first_run_days=DEFAULT_FIRST_RUN_DAYS, today=None):
+        self.store = store
+        self.first_run_days = first_run_days
+        self.today = today or date.today()
+
+    def for_client(self, client, term):
+        """tbs covering the days since client and term were last searched"""
+        start = self.store.last_covered(client, term)
+        if start is None:
+            start = self.today - timedelta(days=self.first_run_days)
+        return date_range_param(min(start, self.today), self.today)
@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+"""
+Headless search engine for The Web Search-inator
+Turns a client list into Google searches and opens them, without any UI.
+Nothing in here may import tkinter or PIL - the command line uses it on
+machines that have no display.
+"""
+
+import itertools
+import time
+import urllib.parse
+from datetime import datetime, timedelta
+
+from .launcher import WebbrowserLauncher
+from .pacing import BATCH_PAUSE, DEFAULT_MIN_RATE, AdaptivePacer, FixedPacer
+from .trace import span
+
+DEFAULT_SEARCH_TERM = "Goa news"
+DEFAULT_TIME_PARAM = "qdr:d"
+DEFAULT_TIME_PERIOD = "day"
+DEFAULT_DELAY = 2.0
+DEFAULT_BATCH_SIZE = 10
+
+GOOGLE_SEARCH_URL = "https://www.google.com/search"
+
+
+# Helper function to compute last N days as Google tbs parameter
+def get_last_n_days_param(n: int) -> str:
+    end_date = datetime.today()
+    start_date = end_date - timedelta(days=n)
+    start_str = start_date.strftime("%Y%m%d")
+    end_str = end_date.strftime("%Y%m%d")
+    return f"cdr:1,cd_min:{start_str},cd_max:{end_str}"
+
+
+# Time periods offered by the GUI and the command line: (key, label, tbs factory)
+TIME_PERIODS = [
+    ("day", "Last 24 hours", lambda: "qdr:d"),
+    ("2days", "Last 2 days", lambda: get_last_n_days_param(2)),
+    ("3days", "Last 3 days", lambda: get_last_n_days_param(3)),
+    ("4days", "Last 4 days", lambda: get_last_n_days_param(4)),
+    ("week", "Last week", lambda: "qdr:w"),
+    ("month", "Last month", lambda: "qdr:m"),
+    ("year", "Last year", lambda: "qdr:y"),
+    ("any", "Any time", lambda: ""),
+]
+
+
+def resolve_time_period(key):
+    """Turn a time period key such as 'week' into its tbs parameter"""
+    for period_key, _label, factory in TIME_PERIODS:
+        if period_key == key:
+            return factory()
+    raise ValueError(f"Unknown time period: {key}")
+
+
+def find_time_period_key(value, default=DEFAULT_TIME_PERIOD):
+    """Time period key for a key or for a tbs saved by an older version
+
+    Older settings stored the computed tbs, so 'Last 3 days' came back as
+    the range from the day it was saved; the length of the range still
+    tells which period it was.
+    """
+    for key, _label, factory in TIME_PERIODS:
+        if value == key or value == factory():
+            return key
+    if value.startswith('cdr:1,'):
+        try:
+            start, end = (datetime.strptime(part.split(':')[1], "%Y%m%d")
+                          for part in value.split(',')[1:3])
+        except (IndexError, ValueError):
+            return default
+        days = (end - start).days
+        for key, _label, factory in TIME_PERIODS:
+            if factory() == get_last_n_days_param(days):
+                return key
+    return default
+
+
+def describe_time_param(time_param):
+    """Label for a tbs parameter, e.g. 'Last week', falling back to the raw value"""
+    for _key, label, factory in TIME_PERIODS:
+        if factory() == time_param:
+            return label
+    return time_param
+
+
+def format_duration(seconds):
+    """Human readable duration such as '1h 05m' or '42s'"""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
+
+
+def iter_clients(lines):
+    """Yield client names from an iterable of lines, skipping blanks"""
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def parse_clients(text):
+    """Extract clients from a block of text (one name per line)"""
+    return list(iter_clients(text.split('\n')))
+
+
+def create_search_query(client_name, search_term=""):
+    """Create a Google search query for client + custom search terms"""
+    search_term = search_term.strip()
+    if search_term:
+        return f'"{client_name}" {search_term}'
+    else:
+        return f'"{client_name}"'
+
+
+def create_search_url(query, time_param="", base_url=GOOGLE_SEARCH_URL):
+    """Create complete Google search URL"""
+    encoded_query = urllib.parse.quote_plus(query)
+    google_url = f"{base_url}?q={encoded_query}"
+    if time_param:
+        google_url += f"&tbs={time_param}"
+    return google_url
+
+
+class _QuotedChars(dict):
+    """quote_plus of single characters, filled in on first use"""
+
+    def __missing__(self, char):
+        quoted = self[char] = urllib.parse.quote_plus(char)
+        return quoted
+
+
+_QUOTED_CHARS = _QuotedChars()
+
+
+def iter_search_urls(clients, search_term="", time_param="", base_url=GOOGLE_SEARCH_URL):
+    """Lazily build each client's search URL
+
+    Gives exactly create_search_url(create_search_query(client, search_term),
+    time_param, base_url), but the base URL, search term and tbs fragment are
+    encoded once for the whole batch. quote_plus works character by
+    character, so each name can be encoded on its own from a per-character
+    table.
+    """
+    prefix, suffix = _url_affixes(search_term.strip(), time_param, base_url)
+    quoted = _QUOTED_CHARS.__getitem__
+    join = ''.join
+    for client in clients:
+        yield prefix + join(map(quoted, client)) + suffix
+
+
+def iter_search_queries_urls(clients, search_term="", time_param="", base_url=GOOGLE_SEARCH_URL):
+    """Lazily build each client's (query, URL) pair, as iter_search_urls does the URL
+
+    The query is exactly create_search_query(client, search_term).
+    """
+    search_term = search_term.strip()
+    prefix, suffix = _url_affixes(search_term, time_param, base_url)
+    query_suffix = f'" {search_term}' if search_term else '"'
+    quoted = _QUOTED_CHARS.__getitem__
+    join = ''.join
+    for client in clients:
+        yield '"' + client + query_suffix, prefix + join(map(quoted, client)) + suffix
+
+
+def _url_affixes(search_term, time_param, base_url):
+    """The parts of a search URL before and after the encoded client name"""
+    prefix = f"{base_url}?q=%22"
+    suffix = "%22"
+    if search_term:
+        suffix += "+" + urllib.parse.quote_plus(search_term)
+    if time_param:
+        suffix += f"&tbs={time_param}"
+    return prefix, suffix
+
+
+class Search:
+    """One search to run: the query, its time period and the finished URL
+
+    A packed search covers several clients at once; members holds the
+    single-client Searches it replaces.
+    """
+
+    __slots__ = ('query', 'time_param', 'url', 'client', 'label', 'term', 'members')
+
+    def __init__(self, query, time_param, url, client=None, label=None, term=None,
+                 members=None):
+        self.query = query
+        self.time_param = time_param
+        self.url = url
+        self.client = client
+        self.label = label
+        self.term = term
+        self.members = members
+
+    def covered(self):
+        """The single-client Searches this search stands for"""
+        return self.members if self.members is not None else [self]
+
+    def __str__(self):
+        return f"{self.query} [{self.label}]" if self.label else self.query
+
+
+class RunResult:
+    """Outcome of a search run"""
+
+    def __init__(self):
+        self.attempted = 0
+        self.opened = 0
+        self.cancelled = False
+        # Launch rate actually achieved, in URLs per second
+        self.effective_rate = None
+
+    @property
+    def failed(self):
+        return self.attempted - self.opened
+
+
+class SearchEngine:
+    """Opens Google searches for a stream of clients, pacing the browser"""
+
+    def __init__(self, search_term="", time_param="", delay=DEFAULT_DELAY,
+                 batch_size=DEFAULT_BATCH_SIZE, batch_pause=BATCH_PAUSE,
+                 launcher=None, pacer=None, log=None, progress=None, sleep=time.sleep,
+                 base_url=GOOGLE_SEARCH_URL):
+        self.search_term = search_term
+        self.time_param = time_param
+        self.base_url = base_url
+        self.batch_size = batch_size if batch_size >= 1 else DEFAULT_BATCH_SIZE
+        self.launcher = launcher or WebbrowserLauncher()
+        # Without a pacer: the fixed delay after each launch and batch pause
+        self.pacer = pacer or FixedPacer(delay, batch_pause, sleep=sleep)
+        self.log = log or (lambda message: None)
+        self.progress = progress or (lambda done, total: None)
+        self.sleep = sleep
+
+    @classmethod
+    def from_params(cls, params, **kwargs):
+        """Build an engine from a run parameter dict (as journaled for resume)
+
+        params holds search_term, time_param, delay and batch_size, plus
+        max_rate when the adaptive pacer should be used.
+        """
+        delay = params.get('delay', DEFAULT_DELAY)
+        max_rate = params.get('max_rate')
+        if max_rate and 'pacer' not in kwargs:
+            min_rate = min(max_rate, 1 / delay if delay > 0 else DEFAULT_MIN_RATE)
+            kwargs['pacer'] = AdaptivePacer(min_rate=min_rate, max_rate=max_rate,
+                                            sleep=kwargs.get('sleep', time.sleep))
+        return cls(search_term=params.get('search_term', ''),
+                   time_param=params.get('time_param', ''),
+                   delay=delay,
+                   batch_size=params.get('batch_size', DEFAULT_BATCH_SIZE),
+                   **kwargs)
+
+    def create_search_query(self, client_name):
+        """Create the query for one client using this engine's search term"""
+        return create_search_query(client_name, self.search_term)
+
+    def create_search_url(self, query):
+        """Create the URL for one query using this engine's time period"""
+        return create_search_url(query, self.time_param, self.base_url)
+
+    def url_for(self, search):
+        """URL for a Search, or for a plain query string in this engine's period"""
+        if isinstance(search, str):
+            return self.create_search_url(search)
+        return search.url
+
+    def estimate_seconds(self, count, max_urls=None):
+        """Rough run time for count searches with this engine's pacing"""
+        if count <= 0:
+            return 0.0
+        group_size = max(1, min(max_urls or self.launcher.max_urls, self.batch_size))
+        full, rest = divmod(count, self.batch_size)
+        launches = full * -(-self.batch_size // group_size) + -(-rest // group_size)
+        pauses = (count - 1) // self.batch_size * self.pacer.batch_pause
+        if isinstance(self.pacer, AdaptivePacer):
+            # Starts at its slowest rate, so this is an upper bound
+            return count / self.pacer.rate + pauses
+        return launches * getattr(self.pacer, 'delay', 0) + pauses
+
+    def open_searches(self, queries, should_continue=None):
+        """Open a group of searches with one launcher call; return how many opened
+
+        queries may be query strings or Searches. Returns None, opening
+        nothing, if should_continue() turns False while waiting for the pacer.
+        """
+        urls = [self.url_for(query) for query in queries]
+        with span('pace.wait'):
+            self.pacer.wait(len(urls))
+        if should_continue is not None and not should_continue():
+            return None
+        started = time.perf_counter()
+        try:
+            with span('launch', urls=len(urls)):
+                self.launcher.open_many(urls)
+        except Exception as e:
+            self.pacer.record(len(urls), time.perf_counter() - started, False)
+            for query in queries:
+                self.log(f"❌ Error opening search for '{query}': {e}")
+            return 0
+        # The fixed pacer sleeps its delay in here
+        with span('pace.record'):
+            self.pacer.record(len(urls), time.perf_counter() - started, True)
+        for query in queries:
+            self.log(f"🔍 Opened: {query}")
+        return len(queries)
+
+    def open_search(self, query):
+        """Open a Google search in the browser"""
+        return self.open_searches([query]) == 1
+
+    def run(self, queries, total=None, should_continue=None, on_group=None):
+        """Open every query, pausing after each batch
+
+        queries may be any iterable, so huge lists can be streamed; pass total
+        when it is known so progress can be reported against it. Launchers
+        that accept several URLs get a whole batch per call and the delay is
+        waited once per call rather than once per tab.
+
+        on_group(offset, group, ok) is called after every launch with the
+        position of the group in the stream, e.g. to checkpoint the run.
+        should_continue() is asked before every launch; it may block, e.g.
+        while the run is paused, and ends the run when it returns False.
+        """
+        result = RunResult()
+        queries = iter(queries)
+        group_size = max(1, min(self.launcher.max_urls, self.batch_size))
+        while True:
+            if should_continue is not None and not should_continue():
+                result.cancelled = True
+                break
+
+            # Never let a group cross a batch boundary
+            done = result.attempted
+            room = self.batch_size - done % self.batch_size
+            group = list(itertools.islice(queries, min(group_size, room)))
+            if not group:
+                break
+
+            # Batch pause
+            if done > 0 and done % self.batch_size == 0 and self.pacer.batch_pause:
+                self.log(f"⏸️ Batch complete ({done}/{total or '?'}). "
+                         f"Pausing {self.pacer.batch_pause:g} seconds...")
+                with span('pace.batch_pause'):
+                    self.sleep(self.pacer.batch_pause)
+
+            opened = self.open_searches(group, should_continue)
+            if opened is None:
+                result.cancelled = True
+                break
+            if on_group is not None:
+                on_group(result.attempted, group, opened == len(group))
+            result.attempted += len(group)
+            result.opened += opened
+            self.progress(result.attempted, total)
+        result.effective_rate = self.pacer.effective_rate()
+        return result
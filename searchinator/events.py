@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Thread-safe event channel between background workers and the UI thread
+Workers only enqueue; the UI drains the queue in batches on its own timer,
+so a worker never waits on rendering.
+"""
+
+import queue
+
+LOG = 'log'
+PROGRESS = 'progress'
+CALL = 'call'
+
+
+class EventChannel:
+    """Queue of log, progress and callback events posted from any thread"""
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+
+    def post(self, kind, payload=None):
+        """Enqueue a raw event"""
+        self._queue.put((kind, payload))
+
+    def log(self, message):
+        """Enqueue a status log line"""
+        self.post(LOG, message)
+
+    def progress(self, done, total=None):
+        """Enqueue a progress update"""
+        self.post(PROGRESS, (done, total))
+
+    def call(self, func, *args):
+        """Run func(*args) on the draining thread"""
+        self.post(CALL, (func, args))
+
+    def ask(self, func, *args):
+        """Run func(*args) on the draining thread and wait for its result
+
+        For dialogs a worker needs answered; never call it from the
+        draining thread itself, which would wait on itself.
+        """
+        answer = queue.SimpleQueue()
+
+        def run():
+            result = None
+            try:
+                result = func(*args)
+            finally:
+                answer.put(result)
+
+        self.call(run)
+        return answer.get()
+
+    def drain(self, limit=None):
+        """Return pending events without blocking, at most limit of them"""
+        events = []
+        while limit is None or len(events) < limit:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+
+class EventBatch:
+    """A drained batch folded down to as few UI operations as possible
+
+    Consecutive log lines are joined and only the latest progress value is
+    kept, but callbacks still run in the order they were posted relative to
+    the lines and progress before them.
+    """
+
+    def __init__(self, events):
+        self.steps = []
+        pending_progress = None
+        for kind, payload in events:
+            if kind == LOG:
+                if self.steps and self.steps[-1][0] == LOG:
+                    self.steps[-1][1].append(payload)
+                else:
+                    self.steps.append((LOG, [payload]))
+            elif kind == PROGRESS:
+                pending_progress = payload
+            elif kind == CALL:
+                if pending_progress is not None:
+                    self.steps.append((PROGRESS, pending_progress))
+                    pending_progress = None
+                self.steps.append((CALL, payload))
+        if pending_progress is not None:
+            self.steps.append((PROGRESS, pending_progress))
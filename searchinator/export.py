@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Export a run as one static file instead of opening a tab per query
+The HTML page groups the searches by client and time period and remembers
+which links were opened, separately for each export; the URL list is one URL
+per line. Both are written
+row by row, so memory stays flat however many clients there are.
+"""
+
+import html
+import json
+from datetime import datetime
+
+FORMAT_HTML = 'html'
+FORMAT_URLS = 'urls'
+
+
+def format_for_path(path):
+    """Pick the export format from a file name"""
+    return FORMAT_HTML if path.lower().endswith(('.html', '.htm')) else FORMAT_URLS
+
+
+class ExportRow:
+    """One search to export"""
+
+    __slots__ = ('client', 'period', 'query', 'url')
+
+    def __init__(self, client, period, query, url):
+        self.client = client
+        self.period = period
+        self.query = query
+        self.url = url
+
+
+def write_url_list(out, rows):
+    """Write one URL per line; return the number written"""
+    count = 0
+    for row in rows:
+        out.write(row.url + '\n')
+        count += 1
+    return count
+
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: "Nirmala UI", "Noto Sans Devanagari", Arial, sans-serif; margin: 2em; background: #f4f8fb; }}
+h1 {{ font-size: 1.4em; }}
+.meta {{ color: #7f8c8d; font-size: 0.9em; }}
+.client {{ background: white; border-radius: 6px; padding: 0.5em 1em; margin: 0.5em 0; }}
+.client h2 {{ font-size: 1.05em; margin: 0.2em 0; }}
+.client a {{ display: inline-block; margin: 0.2em 1em 0.2em 0; }}
+.client a.seen {{ color: #95a5a6; text-decoration: line-through; }}
+#bar {{ position: sticky; top: 0; background: #7bceff; padding: 0.5em 1em; border-radius: 6px; }}
+</style>
+</head>
+<body>
+<div id="bar"><button onclick="openNext()">Open next unseen</button>
+<span id="progress"></span></div>
+<h1>{title}</h1>
+<p class="meta">Generated {generated}</p>
+"""
+
+_HTML_TAIL = """<script>
+var KEY = "websearchinator-seen:" + {export_id};
+var seen = JSON.parse(localStorage.getItem(KEY) || "{{}}");
+var links = document.querySelectorAll(".client a");
+function update() {{
+  var count = 0;
+  links.forEach(function (a) {{ if (seen[a.href]) {{ a.classList.add("seen"); count++; }} }});
+  document.getElementById("progress").textContent = count + " of " + links.length + " opened";
+}}
+function mark(a) {{ seen[a.href] = 1; localStorage.setItem(KEY, JSON.stringify(seen)); update(); }}
+function openNext() {{
+  for (var i = 0; i < links.length; i++) {{
+    if (!seen[links[i].href]) {{ window.open(links[i].href, "_blank"); mark(links[i]); links[i].scrollIntoView(); return; }}
+  }}
+}}
+links.forEach(function (a) {{ a.addEventListener("click", function () {{ mark(a); }}); }});
+update();
+</script>
+<p class="meta">{count} searches for {clients} clients</p>
+</body>
+</html>
+"""
+
+
+def write_html(out, rows, title="Web Search-inator results"):
+    """Write a self-contained results page; return the number of searches
+
+    Rows for the same client must arrive together, e.g. from a client-major
+    QueryMatrix; each run of rows for a client becomes one section. Opened
+    links are remembered under a key unique to this export, so pages from
+    other runs start unseen.
+    """
+    generated = datetime.now()
+    out.write(_HTML_HEAD.format(title=html.escape(title),
+                                generated=generated.strftime("%Y-%m-%d %H:%M")))
+    count = clients = 0
+    current = None
+    for row in rows:
+        if row.client != current:
+            if current is not None:
+                out.write('</div>\n')
+            current = row.client
+            clients += 1
+            out.write(f'<div class="client"><h2>{html.escape(row.client)}</h2>\n')
+        label = html.escape(row.period or row.query)
+        out.write(f'<a href="{html.escape(row.url)}" target="_blank" rel="noopener" '
+                  f'title="{html.escape(row.query)}">{label}</a>\n')
+        count += 1
+    if current is not None:
+        out.write('</div>\n')
+    export_id = json.dumps(generated.isoformat(timespec='microseconds'))
+    out.write(_HTML_TAIL.format(count=count, clients=clients, export_id=export_id))
+    return count
+
+
+def export_rows(path, rows, export_format=None, title="Web Search-inator results"):
+    """Stream rows to path as HTML or a URL list; return the number written"""
+    export_format = export_format or format_for_path(path)
+    with open(path, 'w', encoding='utf-8', newline='\n') as out:
+        if export_format == FORMAT_HTML:
+            return write_html(out, rows, title)
+        return write_url_list(out, rows)
@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+"""
+Concurrent fetching of search result pages
+Instead of opening tabs for a person to read, fetch each search URL and pull
+the result titles and links out of the page. Requests share a pool of
+keep-alive connections, run a bounded number at a time, time out, and are
+retried with exponential backoff on connection errors and busy responses.
+Results are streamed to CSV or JSON as they arrive.
+"""
+
+import collections
+import csv
+import http.client
+import json
+import threading
+import time
+import urllib.parse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from html.parser import HTMLParser
+
+from .trace import span
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+MAX_BACKOFF = 30.0
+
+# Responses worth asking again for
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+USER_AGENT = ("Mozilla/5.0 (compatible; WebSearchinator/1.0)")
+
+FORMAT_CSV = 'csv'
+FORMAT_JSON = 'json'
+
+
+class ConnectionPool:
+    """Idle keep-alive connections, shared between worker threads"""
+
+    def __init__(self, max_idle_per_host=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT):
+        self.max_idle_per_host = max_idle_per_host
+        self.timeout = timeout
+        self.created = 0
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, scheme, netloc):
+        """An idle connection to scheme://netloc, or a new one"""
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop()
+            self.created += 1
+        if scheme == 'https':
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def release(self, scheme, netloc, conn, reusable=True):
+        """Hand a connection back, closing it if it cannot be reused"""
+        if reusable:
+            with self._lock:
+                idle = self._idle.setdefault((scheme, netloc), [])
+                if len(idle) < self.max_idle_per_host:
+                    idle.append(conn)
+                    return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+def unwrap_link(href, base_url):
+    """Resolve a result link, following Google's /url?q= redirects"""
+    link = urllib.parse.urljoin(base_url, href)
+    parts = urllib.parse.urlsplit(link)
+    if parts.path == '/url':
+        params = urllib.parse.parse_qs(parts.query)
+        target = params.get('q') or params.get('url')
+        if target:
+            return target[0]
+    return link
+
+
+class ResultParser(HTMLParser):
+    """Collects (title, link) for every link that wraps an <h3> heading"""
+
+    def __init__(self, base_url):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.results = []
+        self._href = None
+        self._in_title = False
+        self._title = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            self._href = dict(attrs).get('href')
+            self._title = []
+        elif tag == 'h3' and self._href:
+            self._in_title = True
+
+    def handle_endtag(self, tag):
+        if tag == 'h3':
+            self._in_title = False
+        elif tag == 'a':
+            title = ' '.join(''.join(self._title).split())
+            if self._href and title:
+                self.results.append((title, unwrap_link(self._href, self.base_url)))
+            self._href = None
+            self._title = []
+
+    def handle_data(self, data):
+        if self._in_title:
+            self._title.append(data)
+
+
+def parse_results(page, base_url):
+    """Return [(title, link)] for the results on a page"""
+    parser = ResultParser(base_url)
+    parser.feed(page)
+    parser.close()
+    return parser.results
+
+
+class FetchResult:
+    """Outcome of fetching one search"""
+
+    def __init__(self, index, query, url, time_param=''):
+        self.index = index
+        self.query = query
+        self.url = url
+        self.time_param = time_param
+        self.status = None
+        self.error = None
+        self.attempts = 0
+        self.elapsed = 0.0
+        self.results = []
+
+    @property
+    def ok(self):
+        return self.error is None and self.status == 200
+
+    @classmethod
+    def from_dict(cls, data, index=None):
+        """Rebuild a result saved with to_dict(), e.g. from the cache"""
+        result = cls(data['index'] if index is None else index, data['query'], data['url'],
+                     data.get('time_param', ''))
+        result.status = data.get('status')
+        result.error = data.get('error')
+        result.attempts = data.get('attempts', 0)
+        result.elapsed = data.get('elapsed', 0.0)
+        result.results = [(hit['title'], hit['link']) for hit in data.get('results', [])]
+        return result
+
+    def to_dict(self):
+        return {'index': self.index, 'query': self.query, 'url': self.url,
+                'time_param': self.time_param, 'status': self.status, 'error': self.error,
+                'attempts': self.attempts,
+                'elapsed': round(self.elapsed, 4),
+                'results': [{'title': title, 'link': link} for title, link in self.results]}
+
+
+class Fetcher:
+    """Fetches search URLs concurrently over pooled connections"""
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT,
+                 retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, pool=None,
+                 sleep=time.sleep):
+        self.concurrency = max(1, concurrency)
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.pool = pool or ConnectionPool(self.concurrency, timeout)
+        self.sleep = sleep
+
+    def _retry_delay(self, attempt, retry_after=None):
+        if retry_after is not None:
+            try:
+                return min(MAX_BACKOFF, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        return min(MAX_BACKOFF, self.backoff * 2 ** attempt)
+
+    def get(self, url):
+        """GET url with retries; return (status, text, attempts)"""
+        parts = urllib.parse.urlsplit(url)
+        target = parts.path or '/'
+        if parts.query:
+            target += '?' + parts.query
+        headers = {'User-Agent': USER_AGENT, 'Accept': 'text/html',
+                   'Accept-Encoding': 'identity', 'Connection': 'keep-alive'}
+
+        attempt = 0
+        while True:
+            conn = self.pool.acquire(parts.scheme, parts.netloc)
+            try:
+                conn.request('GET', target, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                if attempt >= self.retries:
+                    raise
+                self.sleep(self._retry_delay(attempt))
+                attempt += 1
+                continue
+            self.pool.release(parts.scheme, parts.netloc, conn, not response.will_close)
+
+            if response.status in RETRY_STATUSES and attempt < self.retries:
+                self.sleep(self._retry_delay(attempt, response.getheader('Retry-After')))
+                attempt += 1
+                continue
+            charset = response.headers.get_content_charset() or 'utf-8'
+            return response.status, body.decode(charset, errors='replace'), attempt + 1
+
+    def fetch(self, index, query, url, time_param=''):
+        """Fetch and parse one search; errors end up on the result"""
+        result = FetchResult(index, query, url, time_param)
+        started = time.perf_counter()
+        try:
+            with span('fetch.get'):
+                result.status, page, result.attempts = self.get(url)
+            if result.status == 200:
+                with span('fetch.parse'):
+                    result.results = parse_results(page, url)
+            else:
+                result.error = f"HTTP {result.status}"
+        except Exception as e:
+            result.attempts = self.retries + 1
+            result.error = str(e) or e.__class__.__name__
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    def fetch_searches(self, searches, cache=None, should_continue=None):
+        """Yield a FetchResult per Search as each completes
+
+        searches may be a stream: only a couple of requests per worker are
+        queued at a time, so memory stays flat for huge lists. Fresh results
+        are served from a SearchCache when given, and successful fetches
+        are added to it. Entries are keyed on the URL, so results from one
+        base URL are never served for another.
+        """
+        served = collections.deque()
+
+        def uncached():
+            for index, search in enumerate(searches):
+                if cache is not None:
+                    hit, value = cache.lookup(search.url, search.time_param)
+                    if hit and value is not None:
+                        served.append(FetchResult.from_dict(value, index))
+                        continue
+                yield index, search.query, search.url, search.time_param
+
+        for result in self.fetch_indexed(uncached(), should_continue):
+            while served:
+                yield served.popleft()
+            if result.ok and cache is not None:
+                cache.put(result.url, result.time_param, result.to_dict())
+            yield result
+        while served:
+            yield served.popleft()
+
+    def fetch_indexed(self, items, should_continue=None):
+        """Fetch (index, query, url, time_param) items as they complete"""
+        queries = iter(items)
+        pending = set()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            try:
+                while True:
+                    while len(pending) < self.concurrency * 2:
+                        if should_continue is not None and not should_continue():
+                            break
+                        item = next(queries, None)
+                        if item is None:
+                            break
+                        pending.add(executor.submit(self.fetch, *item))
+                    if not pending:
+                        break
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        yield future.result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def close(self):
+        self.pool.close()
+
+
+def format_for_path(path):
+    """Pick the results format from a file name"""
+    return FORMAT_JSON if path.lower().endswith('.json') else FORMAT_CSV
+
+
+def write_results(path, results, results_format=None):
+    """Stream FetchResults to CSV (one row per hit) or a JSON array
+
+    Returns (searches written, searches that failed).
+    """
+    results_format = results_format or format_for_path(path)
+    count = failed = 0
+    with open(path, 'w', encoding='utf-8', newline='') as out:
+        if results_format == FORMAT_JSON:
+            out.write('[')
+            for result in results:
+                out.write(',\n' if count else '\n')
+                out.write(json.dumps(result.to_dict(), ensure_ascii=False))
+                count += 1
+                failed += not result.ok
+            out.write('\n]\n')
+        else:
+            writer = csv.writer(out)
+            writer.writerow(['index', 'query', 'tbs', 'status', 'rank', 'title', 'link', 'error'])
+            for result in results:
+                if result.results:
+                    for rank, (title, link) in enumerate(result.results, 1):
+                        writer.writerow([result.index, result.query, result.time_param,
+                                         result.status, rank, title, link, ''])
+                else:
+                    writer.writerow([result.index, result.query, result.time_param,
+                                     result.status, '', '', '', result.error or ''])
+                count += 1
+                failed += not result.ok
+    return count, failed
@@ -0,0 +1,1547 @@
+# -*- coding: utf-8 -*-
+"""
+Tk front end for The Web Search-inator
+Supports English and Devanagari script - paste your client list and go!
+All query logic lives in searchinator.engine; this module only collects
+settings from the widgets and shows progress.
+"""
+
+import tkinter as tk
+import tkinter.font as tkfont
+from tkinter import messagebox, scrolledtext, ttk, filedialog
+import threading
+from datetime import datetime
+from itertools import islice
+import os
+
+from . import engine, events, export, importer, launcher, pacing
+from .client_index import ClientIndex
+from .checkpoint import RunJournal
+from .client_store import ClientListStore
+from .coverage import (DEFAULT_FIRST_RUN_DAYS, SINCE_LAST_RUN, SINCE_LAST_RUN_LABEL,
+                       CoverageStore, SinceLastRun)
+from .events import EventBatch, EventChannel
+from .matrix import (ORDER_CLIENT_MAJOR, ORDER_TERM_MAJOR, QueryMatrix, iter_export_rows,
+                     split_terms)
+from .normalize import dedupe_clients
+from .packing import QueryPacker
+from .persistence import CoalescingWriter, SettingsStore
+from .priority import SearchHistory, prioritize
+from .registry import ClientRegistry, client_terms, parse_tags
+from .scheduler import RunControl, RunScheduler
+from .search_cache import DEFAULT_TTL, SearchCache
+from .startup_cache import StartupCache
+from .status_log import StatusLog
+from .trace import span
+from .paths import get_appdata_path, get_resource_path
+from .widgets import TextLineTracker, VirtualListView, ask_import_column
+
+
+# How often the Tk thread drains worker events, and how many per pass
+EVENT_DRAIN_INTERVAL_MS = 100
+EVENT_DRAIN_LIMIT = 1000
+
+# Lists longer than this are shown in the virtualized list view, never a Text
+LIST_VIEW_THRESHOLD = 20000
+TEXT_UNDO_LIMIT = 200
+
+
+class GoaNewsSearchGUI:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("The Web Search-inator")
+        self.root.geometry("700x700")
+        self.root.resizable(True, True)
+        
+        # Settings file path, written in the background
+        self.settings_file = os.path.join(get_appdata_path(), 'settings.json')
+        self.settings_store = SettingsStore(self.settings_file)
+        self.settings_writer = CoalescingWriter(self.settings_store.save)
+        
+        # The client list has its own incremental store next to it
+        self.client_store = ClientListStore(get_appdata_path())
+        
+        # Progress of the latest run, for Resume
+        self.run_journal = RunJournal(get_appdata_path())
+        
+        # Searches opened recently, so re-runs can skip them
+        self.search_cache = SearchCache(os.path.join(get_appdata_path(), 'search_cache.json'))
+        
+        # Last day searched per client, for "since last run" windows
+        self.coverage_store = CoverageStore(os.path.join(get_appdata_path(), 'coverage.json'))
+        
+        # Master client list with groups and tags, for filtered runs
+        self.registry = ClientRegistry.in_folder(get_appdata_path())
+        
+        # When each client was last searched, for priority order
+        self.search_history = SearchHistory.in_folder(get_appdata_path())
+        
+        # Icon and font lookups are cached here; both run after the window shows
+        self.startup_cache = StartupCache(get_appdata_path())
+        
+        # Configure style
+        with span('startup.styles'):
+            self.setup_styles()
+        
+        # Variables
+        self.clients = []
+        self.active_import = None
+        self.launcher = None
+        
+        # Workers talk to the widgets only through this channel
+        self.events = EventChannel()
+        
+        # Runs are queued and carried out one at a time off the Tk thread
+        self.scheduler = RunScheduler(on_idle=lambda: self.events.call(self.on_runs_finished))
+        
+        # The status pane keeps recent lines only; the full log can go to a file
+        self.status_log = StatusLog()
+        
+        # Create GUI
+        with span('startup.create_widgets'):
+            self.create_widgets()
+        
+        # Load saved settings now, the (possibly huge) client list once shown
+        with span('startup.load_settings'):
+            self.load_settings()
+        self.root.after_idle(self.load_client_list)
+        self.root.after_idle(self.refresh_resume_button)
+        
+        # Optional work waits until the first idle pass has drawn the window
+        self.root.after(0, self.root.after_idle, self.finish_startup)
+        
+        # Bind window close event to save settings
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        
+        # Start rendering queued log and progress events
+        self.drain_events()
+    
+    def finish_startup(self):
+        """Work that can wait until the window is up"""
+        with span('startup.icon'):
+            self.set_window_icon()
+        if self.needs_font_lookup:
+            with span('startup.font_lookup'):
+                self.apply_devanagari_font(self.get_devanagari_font()[0])
+        self.log_message(f"🔤 Font used: {self.client_font.actual('family')}")
+    
+    def set_window_icon(self):
+        """Set the window icon from icon.png, resized once and cached"""
+        try:
+            icon_path = get_resource_path('icon.png')
+            
+            if os.path.exists(icon_path):
+                # Tk reads the cached PNG itself; PIL is only needed to make it
+                cached_path = (self.startup_cache.cached_icon(icon_path)
+                               or self.startup_cache.store_icon(icon_path))
+                self.icon_photo = tk.PhotoImage(file=cached_path)
+                self.root.iconphoto(True, self.icon_photo)
+                
+        except ImportError:
+            try:
+                icon_path = get_resource_path('icon.png')
+                if os.path.exists(icon_path):
+                    self.root.iconphoto(True, tk.PhotoImage(file=icon_path))
+            except Exception:
+                pass
+        except Exception:
+            pass
+        
+    def setup_styles(self):
+        """Setup GUI styling"""
+        self.root.configure(bg="#8f8ce8")
+        
+        # Configure ttk styles
+        style = ttk.Style()
+        style.theme_use('clam')
+    
+    def get_devanagari_font(self):
+        """Find an appropriate font that supports Devanagari script"""
+        # List of fonts known to support Devanagari (prioritized)
+        devanagari_fonts = [
+            'Nirmala UI',
+            'Mangal',
+            'Aparajita',
+            'Kokila',
+            'Utsaah',
+            'Sanskrit Text',
+            'Devanagari MT',
+            'Kohinoor Devanagari',
+            'Noto Sans Devanagari',
+            'Arial Unicode MS',
+            'Segoe UI',
+            'Microsoft Sans Serif'
+        ]
+        
+        available_fonts = tkfont.families()
+        
+        # Try to find a Devanagari-supporting font
+        for font in devanagari_fonts:
+            if font in available_fonts:
+                return (font, 11)
+        
+        # Fallback
+        return ('TkDefaultFont', 11)
+    
+    def get_cached_devanagari_font(self):
+        """The font chosen on an earlier launch if fonts have not changed, else None"""
+        family = self.startup_cache.cached_font()
+        if family is None:
+            return None
+        if family == 'TkDefaultFont':
+            return family
+        # Far cheaper than listing every family: Tk substitutes missing fonts
+        if tkfont.Font(family=family, size=11).actual('family') == family:
+            return family
+        return None
+    
+    def apply_devanagari_font(self, family):
+        """Switch the client widgets to family and remember it for next launch"""
+        if family == 'TkDefaultFont':
+            self.client_font.configure(**tkfont.nametofont('TkDefaultFont').actual())
+            self.client_font.configure(size=11)
+        else:
+            self.client_font.configure(family=family)
+        self.client_list_view.update_font_metrics()
+        self.needs_font_lookup = False
+        try:
+            self.startup_cache.store_font(family)
+        except OSError:
+            pass
+    
+    def load_settings(self):
+        """Load settings from AppData"""
+        try:
+            settings = self.settings_store.load()
+            if settings:
+                # Older versions kept the client list inside settings.json
+                if 'client_list' in settings and not self.client_store.exists():
+                    self.client_store.replace_all(settings['client_list'])
+                    self.client_store.flush()
+                
+                # Load search term
+                if 'search_term' in settings:
+                    self.search_term_var.set(settings['search_term'])
+                if 'order' in settings:
+                    self.order_var.set(settings['order'])
+                
+                # Load time periods; older versions kept a single one
+                periods = settings.get('time_periods')
+                if periods is None and 'time_period' in settings:
+                    periods = [settings['time_period']]
+                if periods:
+                    periods = {period if period == SINCE_LAST_RUN
+                               else engine.find_time_period_key(period) for period in periods}
+                    for key, var in self.period_vars.items():
+                        var.set(key in periods)
+                
+                # Load delay
+                if 'delay' in settings:
+                    self.delay_var.set(settings['delay'])
+                
+                # Load batch size
+                if 'batch_size' in settings:
+                    self.batch_var.set(settings['batch_size'])
+                
+                # Load duplicate handling
+                if 'dedupe' in settings:
+                    self.dedupe_var.set(settings['dedupe'])
+                
+                # Load query packing
+                if 'pack' in settings:
+                    self.pack_var.set(settings['pack'])
+                
+                # Load priority order
+                if 'prioritize' in settings:
+                    self.prioritize_var.set(settings['prioritize'])
+                
+                # Load adaptive pacing
+                if 'adaptive' in settings:
+                    self.adaptive_var.set(settings['adaptive'])
+                if 'max_rate' in settings:
+                    self.max_rate_var.set(settings['max_rate'])
+                
+                # Load registry filter
+                if 'use_registry' in settings:
+                    self.use_registry_var.set(settings['use_registry'])
+                if 'registry_group' in settings:
+                    self.registry_group_var.set(settings['registry_group'])
+                if 'registry_tags' in settings:
+                    self.registry_tags_var.set(settings['registry_tags'])
+                
+                # Load search cache lifetime
+                if 'cache_hours' in settings:
+                    self.cache_hours_var.set(settings['cache_hours'])
+                
+                # Load log file setting
+                if 'log_file' in settings:
+                    self.log_file_var.set(settings['log_file'])
+                
+                self.log_message("✅ Settings loaded from AppData")
+        except Exception as e:
+            self.log_message(f"⚠️ Could not load settings: {e}")
+    
+    def save_settings(self):
+        """Queue the current settings to be saved to AppData"""
+        try:
+            settings = {
+                'search_term': self.search_term_var.get(),
+                'order': self.order_var.get(),
+                'time_periods': self.selected_periods(),
+                'delay': self.delay_var.get(),
+                'batch_size': self.batch_var.get(),
+                'dedupe': self.dedupe_var.get(),
+                'pack': self.pack_var.get(),
+                'prioritize': self.prioritize_var.get(),
+                'adaptive': self.adaptive_var.get(),
+                'max_rate': self.max_rate_var.get(),
+                'cache_hours': self.cache_hours_var.get(),
+                'log_file': self.log_file_var.get(),
+                'use_registry': self.use_registry_var.get(),
+                'registry_group': self.registry_group_var.get(),
+                'registry_tags': self.registry_tags_var.get()
+            }
+            self.settings_writer.submit(settings)
+            return True
+        except Exception as e:
+            print(f"Save error: {e}")
+            return False
+    
+    def load_client_list(self):
+        """Read the stored client list in the background"""
+        self.client_text.config(state='disabled')
+        self.count_label.config(text="Clients: loading...")
+        
+        def worker():
+            try:
+                text = self.client_store.load()
+            except Exception as e:
+                self.log_message(f"⚠️ Could not load client list: {e}")
+                text = ''
+            self.events.call(self.on_client_list_loaded, text)
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def on_client_list_loaded(self, text):
+        """Show the loaded client list and start journaling edits"""
+        self.client_text.config(state='normal')
+        if text.count('\n') >= LIST_VIEW_THRESHOLD:
+            self.show_list_view()
+            self.client_index.reset(text)
+            self.client_list_view.refresh()
+        else:
+            self.client_text.delete('1.0', 'end')
+            self.client_text.insert('1.0', text)
+            self.client_text.edit_reset()
+        self.client_index.listener = self.client_store.record
+        self.update_client_count()
+    
+    def toggle_list_view(self):
+        """Switch between the text editor and the list view"""
+        if self.list_view_active:
+            self.show_text_editor()
+        else:
+            self.show_list_view()
+    
+    def show_list_view(self):
+        """Show the client list in the virtualized view and empty the Text"""
+        if self.list_view_active:
+            return
+        # The index keeps the list; the Text no longer mirrors it
+        self.client_tracker.paused = True
+        self.client_text.delete('1.0', 'end')
+        self.client_text.edit_reset()
+        self.text_container.pack_forget()
+        self.client_list_view.pack(fill='both', expand=True, pady=5, before=self.count_label)
+        self.client_list_view.clear_history()
+        self.client_list_view.refresh()
+        self.view_button.config(text="📝 Text View")
+        self.list_view_active = True
+    
+    def show_text_editor(self):
+        """Move the client list back into the Text editor if it is small enough"""
+        if not self.list_view_active:
+            return
+        if self.client_index.line_count > LIST_VIEW_THRESHOLD:
+            messagebox.showinfo("List View",
+                f"Lists over {LIST_VIEW_THRESHOLD} lines can only be edited in the list view.")
+            return
+        self.client_list_view.pack_forget()
+        self.client_text.insert('1.0', self.client_index.text())
+        self.client_text.edit_reset()
+        self.client_tracker.paused = False
+        self.text_container.pack(fill='both', expand=True, pady=5, before=self.count_label)
+        self.view_button.config(text="☰ List View")
+        self.list_view_active = False
+    
+    def on_closing(self):
+        """Handle window closing event"""
+        self.scheduler.cancel()
+        self.save_settings()
+        self.settings_writer.close(timeout=5)
+        self.client_store.close(timeout=5)
+        self.search_cache.save()
+        self.coverage_store.save()
+        self.search_history.save()
+        self.registry.close()
+        self.status_log.close()
+        self.root.destroy()
+        
+    def create_widgets(self):
+        """Create all GUI widgets"""
+        
+        # Create main container with scrollbar
+        main_container = tk.Frame(self.root, bg="#7bceff")
+        main_container.pack(fill='both', expand=True)
+        
+        # Create canvas and scrollbar
+        canvas = tk.Canvas(main_container, bg='#7bceff', highlightthickness=0)
+        scrollbar = ttk.Scrollbar(main_container, orient='vertical', command=canvas.yview)
+        scrollable_frame = tk.Frame(canvas, bg='#7bceff')
+        
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+        
+        canvas.create_window((0, 0), window=scrollable_frame, anchor='nw')
+        canvas.configure(yscrollcommand=scrollbar.set)
+        
+        # Pack scrollbar and canvas
+        scrollbar.pack(side='right', fill='y')
+        canvas.pack(side='left', fill='both', expand=True)
+        
+        # Enable mousewheel scrolling
+        def _on_mousewheel(event):
+            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        
+        # Title
+        title_frame = tk.Frame(scrollable_frame, bg='#7bceff')
+        title_frame.pack(fill='x', padx=10, pady=10)
+        
+        title_label = tk.Label(title_frame, 
+                              text="🚀 The Web Search-inator", 
+                              font=('Arial', 16, 'bold'),
+                              bg='#7bceff',
+                              fg="#000000")
+        title_label.pack()
+        
+        subtitle_label = tk.Label(title_frame,
+                                 text="Supports English script",
+                                 font=('Nirmala UI', 10),
+                                 bg='#7bceff',
+                                 fg="#182122")
+        subtitle_label.pack()
+        
+        # Client input section
+        input_frame = tk.LabelFrame(scrollable_frame, text="📝 Client List", 
+                                   font=('Arial', 12, 'bold'),
+                                   padx=10, pady=10)
+        input_frame.pack(fill='both', expand=True, padx=10, pady=5)
+        
+        # Instructions with file import button
+        instructions_frame = tk.Frame(input_frame)
+        instructions_frame.pack(fill='x', pady=(0, 5))
+        
+        instructions = tk.Label(instructions_frame,
+                               text="Type or paste your client list below (one name per line):",
+                               font=('Arial', 10),
+                               justify='left')
+        instructions.pack(side='left')
+        
+        self.import_button = tk.Button(instructions_frame,
+                              text="📁 Import from File",
+                              command=self.import_from_file,
+                              font=('Arial', 9),
+                              bg='#7bceff',
+                              fg='white',
+                              padx=10,
+                              pady=2)
+        self.import_button.pack(side='right')
+        
+        self.view_button = tk.Button(instructions_frame,
+                                     text="☰ List View",
+                                     command=self.toggle_list_view,
+                                     font=('Arial', 9),
+                                     padx=10,
+                                     pady=2)
+        self.view_button.pack(side='right', padx=5)
+        
+        # Text area for clients - FIXED for Devanagari input
+        self.text_container = text_container = tk.Frame(input_frame)
+        text_container.pack(fill='both', expand=True, pady=5)
+        
+        # Devanagari font: last launch's choice, or the default until the
+        # (slow) lookup over every installed font runs after startup
+        cached_family = self.get_cached_devanagari_font()
+        self.needs_font_lookup = cached_family is None
+        if cached_family in (None, 'TkDefaultFont'):
+            self.client_font = tkfont.nametofont('TkDefaultFont').copy()
+            self.client_font.configure(size=11)
+        else:
+            self.client_font = tkfont.Font(family=cached_family, size=11)
+        devanagari_font = self.client_font
+        
+        # Create Text widget with scrollbar
+        text_scroll = tk.Scrollbar(text_container)
+        text_scroll.pack(side='right', fill='y')
+        
+        # FIXED: Added insertunfocussed='solid' to prevent IME issues
+        self.client_text = tk.Text(text_container,
+                                   height=8,
+                                   width=70,
+                                   font=devanagari_font,
+                                   wrap='word',
+                                   yscrollcommand=text_scroll.set,
+                                   insertunfocussed='solid',  # This helps with IME
+                                   undo=True,  # Enable undo
+                                   maxundo=TEXT_UNDO_LIMIT)  # Bounded so big pastes don't pile up
+        self.client_text.pack(side='left', fill='both', expand=True)
+        text_scroll.config(command=self.client_text.yview)
+        
+        # Edits (typed, pasted or IME-composed) are picked up by the line
+        # tracker below - no <<Modified>> binding as it can interfere with IME
+        
+        # Counter label
+        self.count_label = tk.Label(input_frame,
+                                    text="Clients: 0",
+                                    font=('Arial', 9),
+                                    fg='#7bceff')
+        self.count_label.pack(anchor='e', pady=(2, 0))
+        
+        # Mirror the client list line by line so edits never re-parse it
+        self.client_index = ClientIndex()
+        self.list_view_active = False
+        self.client_tracker = TextLineTracker(self.client_text, self.client_index,
+                                              on_change=self.on_client_text_changed)
+        
+        # Virtualized view over the same index for lists too big for a Text
+        self.client_list_view = VirtualListView(input_frame, self.client_index,
+                                                font=devanagari_font,
+                                                on_change=self.update_client_count)
+        
+        # Client registry: run a filtered subset of one master list
+        registry_frame = tk.LabelFrame(scrollable_frame, text="🗂️ Client Registry",
+                                      font=('Arial', 12, 'bold'),
+                                      padx=10, pady=10)
+        registry_frame.pack(fill='x', padx=10, pady=5)
+        
+        filter_frame = tk.Frame(registry_frame)
+        filter_frame.pack(fill='x', pady=2)
+        
+        tk.Label(filter_frame, text="Group:", font=('Arial', 10)).pack(side='left')
+        self.registry_group_var = tk.StringVar()
+        self.registry_group_var.trace('w', self.on_setting_changed)
+        tk.Entry(filter_frame, textvariable=self.registry_group_var,
+                width=18).pack(side='left', padx=(2, 10))
+        
+        tk.Label(filter_frame, text="Tags:", font=('Arial', 10)).pack(side='left')
+        self.registry_tags_var = tk.StringVar()
+        self.registry_tags_var.trace('w', self.on_setting_changed)
+        tk.Entry(filter_frame, textvariable=self.registry_tags_var,
+                width=24).pack(side='left', padx=2)
+        
+        self.use_registry_var = tk.BooleanVar(value=False)
+        self.use_registry_var.trace('w', self.on_setting_changed)
+        tk.Checkbutton(registry_frame,
+                      text="Search the registry clients matching this filter instead of the list",
+                      variable=self.use_registry_var,
+                      font=('Arial', 10)).pack(anchor='w', pady=2)
+        
+        registry_buttons = tk.Frame(registry_frame)
+        registry_buttons.pack(fill='x', pady=2)
+        
+        tk.Button(registry_buttons,
+                 text="➕ Add List to Registry",
+                 command=self.add_list_to_registry,
+                 font=('Arial', 9),
+                 padx=10,
+                 pady=2).pack(side='left')
+        
+        tk.Button(registry_buttons,
+                 text="🔢 Count Matches",
+                 command=self.count_registry_matches,
+                 font=('Arial', 9),
+                 padx=10,
+                 pady=2).pack(side='left', padx=5)
+        
+        tk.Label(registry_frame,
+                text="(Empty group matches every group; all comma separated tags must match. "
+                     "Own search terms and on/off: python -m searchinator.registry)",
+                font=('Arial', 8),
+                fg='#7f8c8d').pack(anchor='w')
+        
+        # Search term customization
+        search_term_frame = tk.LabelFrame(scrollable_frame, text="🔍 Search Terms",
+                                         font=('Arial', 12, 'bold'),
+                                         padx=10, pady=10)
+        search_term_frame.pack(fill='x', padx=10, pady=5)
+        
+        tk.Label(search_term_frame, 
+                text="Add custom search terms after client name:",
+                font=('Arial', 10)).pack(anchor='w', pady=(0, 5))
+        
+        self.search_term_var = tk.StringVar(value=engine.DEFAULT_SEARCH_TERM)
+        self.search_term_var.trace('w', self.on_setting_changed)
+        
+        # FIXED: Use Entry with better IME support
+        search_term_entry = tk.Entry(search_term_frame, 
+                                     textvariable=self.search_term_var,
+                                     font=devanagari_font,
+                                     width=40)
+        search_term_entry.pack(anchor='w')
+        
+        tk.Label(search_term_frame,
+                text='Example: "news" will search for "Client Name news"; '
+                     'separate several terms with ; to search each',
+                font=('Arial', 8),
+                fg='#7f8c8d').pack(anchor='w', pady=(2, 0))
+        
+        # Order of the searches when there are several terms
+        order_frame = tk.Frame(search_term_frame)
+        order_frame.pack(anchor='w', pady=(2, 0))
+        
+        tk.Label(order_frame, text="With several terms, open:",
+                font=('Arial', 9)).pack(side='left')
+        
+        self.order_var = tk.StringVar(value=ORDER_CLIENT_MAJOR)
+        self.order_var.trace('w', self.on_setting_changed)
+        tk.Radiobutton(order_frame, text="all terms per client",
+                      variable=self.order_var, value=ORDER_CLIENT_MAJOR,
+                      font=('Arial', 9)).pack(side='left')
+        tk.Radiobutton(order_frame, text="whole list per term",
+                      variable=self.order_var, value=ORDER_TERM_MAJOR,
+                      font=('Arial', 9)).pack(side='left')
+        
+        # Time period section
+        time_frame = tk.LabelFrame(scrollable_frame, text="⏰ Time Period", 
+                                  font=('Arial', 12, 'bold'),
+                                  padx=10, pady=10)
+        time_frame.pack(fill='x', padx=10, pady=5)
+        
+        # One flag per period key; date ranges are worked out when a run starts
+        time_options = [(label, key) for key, label, _factory in engine.TIME_PERIODS]
+        time_options.append((SINCE_LAST_RUN_LABEL, SINCE_LAST_RUN))
+        self.period_vars = {}
+        
+        # Create grid layout for check buttons
+        time_grid = tk.Frame(time_frame)
+        time_grid.pack(fill='x')
+        
+        for i, (text, value) in enumerate(time_options):
+            var = tk.BooleanVar(value=value == engine.DEFAULT_TIME_PERIOD)
+            var.trace('w', self.on_setting_changed)
+            self.period_vars[value] = var
+            cb = tk.Checkbutton(time_grid,
+                               text=text,
+                               variable=var,
+                               font=('Arial', 10))
+            cb.grid(row=i//2, column=i%2, sticky='w', padx=5, pady=2)
+        
+        tk.Label(time_frame,
+                text=f"(Tick several to search each client in each period. "
+                     f"{SINCE_LAST_RUN_LABEL}: each client from the day it was last searched; "
+                     f"new clients get the last {DEFAULT_FIRST_RUN_DAYS} days)",
+                font=('Arial', 8),
+                fg='#7f8c8d').pack(anchor='w', pady=(2, 0))
+        
+        # Settings section
+        settings_frame = tk.LabelFrame(scrollable_frame, text="⚙️ Settings",
+                                      font=('Arial', 12, 'bold'),
+                                      padx=10, pady=10)
+        settings_frame.pack(fill='x', padx=10, pady=5)
+        
+        # Delay setting
+        delay_frame = tk.Frame(settings_frame)
+        delay_frame.pack(fill='x', pady=2)
+        
+        tk.Label(delay_frame, text="Delay after each browser launch (seconds):", 
+                font=('Arial', 10)).pack(side='left')
+        
+        self.delay_var = tk.StringVar(value="2")
+        self.delay_var.trace('w', self.on_setting_changed)
+        delay_entry = tk.Entry(delay_frame, textvariable=self.delay_var, width=10)
+        delay_entry.pack(side='right')
+        
+        # Batch size setting
+        batch_frame = tk.Frame(settings_frame)
+        batch_frame.pack(fill='x', pady=2)
+        
+        tk.Label(batch_frame, text="Open tabs in batches of:", 
+                font=('Arial', 10)).pack(side='left')
+        
+        self.batch_var = tk.StringVar(value="10")
+        self.batch_var.trace('w', self.on_setting_changed)
+        batch_entry = tk.Entry(batch_frame, textvariable=self.batch_var, width=10)
+        batch_entry.pack(side='right')
+        
+        tk.Label(settings_frame,
+                text="(Pause after each batch to avoid browser overload)",
+                font=('Arial', 8),
+                fg='#7f8c8d').pack(anchor='w')
+        
+        # Duplicate handling setting
+        self.dedupe_var = tk.BooleanVar(value=True)
+        self.dedupe_var.trace('w', self.on_setting_changed)
+        tk.Checkbutton(settings_frame,
+                      text="Skip duplicate clients (ignoring case, spacing and Unicode form)",
+                      variable=self.dedupe_var,
+                      font=('Arial', 10)).pack(anchor='w', pady=2)
+        
+        # Query packing setting
+        self.pack_var = tk.BooleanVar(value=False)
+        self.pack_var.trace('w', self.on_setting_changed)
+        tk.Checkbutton(settings_frame,
+                      text='Combine clients into OR searches ("A" OR "B" news - fewer tabs)',
+                      variable=self.pack_var,
+                      font=('Arial', 10)).pack(anchor='w', pady=2)
+        
+        # Priority order setting
+        self.prioritize_var = tk.BooleanVar(value=False)
+        self.prioritize_var.trace('w', self.on_setting_changed)
+        tk.Checkbutton(settings_frame,
+                      text="Most important first (urgent, then weight x days since last searched)",
+                      variable=self.prioritize_var,
+                      font=('Arial', 10)).pack(anchor='w', pady=2)
+        
+        # Adaptive pacing setting
+        adaptive_frame = tk.Frame(settings_frame)
+        adaptive_frame.pack(fill='x', pady=2)
+        
+        self.adaptive_var = tk.BooleanVar(value=False)
+        self.adaptive_var.trace('w', self.on_setting_changed)
+        tk.Checkbutton(adaptive_frame,
+                      text="Adapt speed to this machine, up to (tabs/second):",
+                      variable=self.adaptive_var,
+                      font=('Arial', 10)).pack(side='left')
+        
+        self.max_rate_var = tk.StringVar(value=f"{pacing.DEFAULT_MAX_RATE:g}")
+        self.max_rate_var.trace('w', self.on_setting_changed)
+        max_rate_entry = tk.Entry(adaptive_frame, textvariable=self.max_rate_var, width=10)
+        max_rate_entry.pack(side='right')
+        
+        tk.Label(settings_frame,
+                text="(Speeds up while the browser keeps up, slows down when it lags; "
+                     "the delay above becomes the slowest pace)",
+                font=('Arial', 8),
+                fg='#7f8c8d').pack(anchor='w')
+        
+        # Search cache setting
+        cache_frame = tk.Frame(settings_frame)
+        cache_frame.pack(fill='x', pady=2)
+        
+        tk.Label(cache_frame, text="Skip searches already opened in the last (hours):", 
+                font=('Arial', 10)).pack(side='left')
+        
+        self.cache_hours_var = tk.StringVar(value=f"{DEFAULT_TTL / 3600:g}")
+        self.cache_hours_var.trace('w', self.on_setting_changed)
+        cache_entry = tk.Entry(cache_frame, textvariable=self.cache_hours_var, width=10)
+        cache_entry.pack(side='right')
+        
+        tk.Label(settings_frame,
+                text="(Same client, term and time period; 0 always opens everything)",
+                font=('Arial', 8),
+                fg='#7f8c8d').pack(anchor='w')
+        
+        # Log file setting
+        self.log_file_var = tk.BooleanVar(value=False)
+        self.log_file_var.trace('w', self.on_log_file_changed)
+        tk.Checkbutton(settings_frame,
+                      text="Keep the full status log in a file (the pane shows recent lines only)",
+                      variable=self.log_file_var,
+                      font=('Arial', 10)).pack(anchor='w', pady=2)
+        
+        # Buttons section
+        button_frame = tk.Frame(scrollable_frame, bg="#ed9393")
+        button_frame.pack(fill='x', padx=10, pady=10)
+        
+        self.search_button = tk.Button(button_frame,
+                                      text="🔍 Start Search",
+                                      command=self.start_search,
+                                      font=('Arial', 12, 'bold'),
+                                      bg='#3498db',
+                                      fg='white',
+                                      padx=20,
+                                      pady=10)
+        self.search_button.pack(side='left', padx=5)
+        
+        self.pause_button = tk.Button(button_frame,
+                                     text="⏸️ Pause",
+                                     command=self.toggle_pause,
+                                     font=('Arial', 12),
+                                     bg='#2980b9',
+                                     fg='white',
+                                     padx=20,
+                                     pady=10,
+                                     state='disabled')
+        self.pause_button.pack(side='left', padx=5)
+        
+        self.queue_button = tk.Button(button_frame,
+                                     text="➕ Queue",
+                                     command=self.queue_search,
+                                     font=('Arial', 12),
+                                     bg='#27ae60',
+                                     fg='white',
+                                     padx=20,
+                                     pady=10,
+                                     state='disabled')
+        self.queue_button.pack(side='left', padx=5)
+        
+        self.clear_button = tk.Button(button_frame,
+                                     text="🗑️ Clear",
+                                     command=self.clear_clients,
+                                     font=('Arial', 12),
+                                     bg='#e74c3c',
+                                     fg='white',
+                                     padx=20,
+                                     pady=10)
+        self.clear_button.pack(side='left', padx=5)
+        
+        save_btn = tk.Button(button_frame,
+                            text="💾 Save List",
+                            command=self.save_to_file,
+                            font=('Arial', 12),
+                            bg='#16a085',
+                            fg='white',
+                            padx=20,
+                            pady=10)
+        save_btn.pack(side='left', padx=5)
+        
+        export_btn = tk.Button(button_frame,
+                              text="📄 Export",
+                              command=self.export_searches,
+                              font=('Arial', 12),
+                              bg='#8e44ad',
+                              fg='white',
+                              padx=20,
+                              pady=10)
+        export_btn.pack(side='left', padx=5)
+        
+        self.resume_button = tk.Button(button_frame,
+                                      text="↩️ Resume",
+                                      command=self.resume_search,
+                                      font=('Arial', 12),
+                                      bg='#f39c12',
+                                      fg='white',
+                                      padx=20,
+                                      pady=10,
+                                      state='disabled')
+        self.resume_button.pack(side='left', padx=5)
+        
+        # Status section
+        status_frame = tk.LabelFrame(scrollable_frame, text="📊 Status",
+                                    font=('Arial', 12, 'bold'),
+                                    padx=10, pady=5)
+        status_frame.pack(fill='both', expand=True, padx=10, pady=5)
+        
+        self.status_text = scrolledtext.ScrolledText(status_frame,
+                                                    height=8,
+                                                    width=70,
+                                                    font=('Consolas', 9),
+                                                    bg='#2c3e50',
+                                                    fg='#7bceff',
+                                                    wrap='word')
+        self.status_text.pack(fill='both', expand=True, pady=5)
+        
+        # Progress bar
+        self.progress = ttk.Progressbar(scrollable_frame, mode='determinate')
+        self.progress.pack(fill='x', padx=10, pady=5)
+        
+        # Initial status message
+        self.log_message("Ready! Enter your clients and click 'Start Search'")
+        self.log_message(f"💾 Settings saved to: {get_appdata_path()}")
+        self.log_message("✅ Devanagari input enabled - you can type in Hindi!")
+    
+    def on_setting_changed(self, *args):
+        """Auto-save when any setting changes"""
+        self.save_settings()
+    
+    def on_log_file_changed(self, *args):
+        """Start or stop writing the status log to its file"""
+        if self.log_file_var.get():
+            self.status_log.set_log_path(os.path.join(get_appdata_path(), 'logs', 'status.log'))
+            self.log_message(f"📝 Full log kept in: {self.status_log.log_path}")
+        else:
+            self.status_log.set_log_path(None)
+        self.save_settings()
+        
+    def update_client_count(self, event=None):
+        """Update the client counter"""
+        self.count_label.config(text=f"Clients: {self.client_index.count}")
+    
+    def on_client_text_changed(self):
+        """Count the clients, and move a list grown too big for the Text to the list view"""
+        self.update_client_count()
+        if self.client_index.line_count > LIST_VIEW_THRESHOLD and not self.list_view_active:
+            # Not from inside the edit itself; emptying the Text also drops its undo
+            self.root.after_idle(self.show_large_list)
+    
+    def show_large_list(self):
+        """Switch a pasted or typed list over LIST_VIEW_THRESHOLD lines to the list view"""
+        if self.list_view_active or self.client_index.line_count <= LIST_VIEW_THRESHOLD:
+            return
+        self.show_list_view()
+        self.log_message(f"☰ Lists over {LIST_VIEW_THRESHOLD} lines are shown in the list view")
+    
+    def import_from_file(self):
+        """Import client list from a text, CSV or TSV file"""
+        if self.active_import is not None:
+            self.active_import.cancel()
+            self.log_message("⚠️ Cancelling import...")
+            return
+        
+        filename = filedialog.askopenfilename(
+            title="Select Client List File",
+            filetypes=[("Client lists", "*.txt *.csv *.tsv"),
+                       ("Text files", "*.txt"),
+                       ("CSV/TSV files", "*.csv *.tsv"),
+                       ("All files", "*.*")]
+        )
+        
+        if filename:
+            try:
+                import_format, first_row = importer.sniff_format(filename)
+            except Exception as e:
+                messagebox.showerror("Import Error", f"Failed to import file: {e}")
+                return
+            
+            if import_format.delimiter:
+                choice = ask_import_column(self.root, first_row)
+                if choice is None:
+                    return
+                import_format.column, import_format.skip_header = choice
+            
+            self.start_import(filename, import_format)
+    
+    def start_import(self, filename, import_format):
+        """Replace the client list with a file, streamed in the background"""
+        self.active_import = importer.StreamingImport(filename, import_format)
+        self._import_name = os.path.basename(filename)
+        self._import_started = False
+        # Put back if the import is cancelled or fails part way
+        self._pre_import_text = self.client_index.text()
+        
+        # One snapshot at the end instead of journaling every batch
+        self.client_index.listener = None
+        if self.list_view_active:
+            self.client_index.reset('')
+        else:
+            self.client_text.delete('1.0', 'end')
+        self.import_button.config(text="⏹️ Cancel Import")
+        self.progress['maximum'] = 100
+        self.log_message(f"📁 Importing {self._import_name} ({import_format.encoding})...")
+        
+        self.active_import.start()
+        self.poll_import()
+    
+    def poll_import(self):
+        """Insert imported batches as they arrive and update progress"""
+        active = self.active_import
+        for item in active.poll(limit=4):
+            if isinstance(item, importer.ImportDone):
+                self.finish_import(item)
+                return
+            self.append_clients(item)
+        
+        if self.list_view_active:
+            self.client_list_view.refresh()
+        if active.total_bytes:
+            self.progress['value'] = 100 * active.bytes_read / active.total_bytes
+        self.root.after(50, self.poll_import)
+    
+    def append_clients(self, names):
+        """Add imported names to the end of whichever editor is showing"""
+        if self.list_view_active:
+            # The first batch replaces the single empty line of a cleared list
+            end = self.client_index.line_count
+            start = end if self._import_started else 0
+            self.client_index.replace_lines(start, end, names)
+        else:
+            text = '\n'.join(names)
+            if self._import_started:
+                text = '\n' + text
+            self.client_text.insert('end-1c', text)
+            if self.client_index.line_count > LIST_VIEW_THRESHOLD:
+                self.show_list_view()
+        self._import_started = True
+    
+    def finish_import(self, done):
+        """Wrap up an import: store the new list, or put the old one back"""
+        self.active_import = None
+        self.progress['value'] = 0
+        self.import_button.config(text="📁 Import from File")
+        if done.error is not None or done.cancelled:
+            self.restore_client_list(self._pre_import_text)
+        else:
+            self.client_store.replace_all(self.client_index.text())
+        self._pre_import_text = None
+        self.client_text.edit_reset()
+        self.client_list_view.clear_history()
+        self.client_index.listener = self.client_store.record
+        self.update_client_count()
+        
+        if done.error is not None:
+            self.log_message(f"❌ Import stopped after {done.count} clients: {done.error} "
+                             f"- previous list kept")
+            messagebox.showerror("Import Error", f"Failed to import file: {done.error}")
+        elif done.cancelled:
+            self.log_message(f"⚠️ Import cancelled after {done.count} clients - previous list kept")
+        else:
+            self.log_message(f"Imported {done.count} clients from: {self._import_name}")
+    
+    def restore_client_list(self, text):
+        """Show text again as the client list in whichever editor is showing"""
+        if self.list_view_active:
+            self.client_index.reset(text)
+            self.client_list_view.refresh()
+        else:
+            self.client_text.delete('1.0', 'end')
+            self.client_text.insert('1.0', text)
+    
+    def save_to_file(self):
+        """Save client list to a text file"""
+        filename = filedialog.asksaveasfilename(
+            title="Save Client List",
+            defaultextension=".txt",
+            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        
+        if filename:
+            try:
+                content = self.client_index.text()
+                with open(filename, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                self.log_message(f"Saved to: {os.path.basename(filename)}")
+                messagebox.showinfo("Success", "Client list saved successfully!")
+            except Exception as e:
+                messagebox.showerror("Save Error", f"Failed to save file: {e}")
+        
+    def export_searches(self):
+        """Write every search to one results page or URL list instead of opening tabs"""
+        clients, overrides = self.get_run_clients()
+        if not clients:
+            return
+        
+        filename = filedialog.asksaveasfilename(
+            title="Export Searches",
+            defaultextension=".html",
+            filetypes=[("Results page", "*.html"), ("URL list", "*.txt"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
+        
+        dedupe = self.dedupe_var.get() and overrides is None
+        pack = self.pack_var.get()
+        params = self.read_run_params()
+        if export.format_for_path(filename) == export.FORMAT_HTML:
+            # The results page has one section per client
+            params['order'] = ORDER_CLIENT_MAJOR
+        
+        def export_worker():
+            try:
+                rows = dedupe_clients(clients)[0] if dedupe else clients
+                searches = self.build_query_matrix(rows, params, overrides)
+                if pack:
+                    searches = QueryPacker().pack(searches)
+                count = export.export_rows(filename, iter_export_rows(searches))
+                self.log_message(f"📄 Exported {count} searches to: {os.path.basename(filename)}")
+            except Exception as e:
+                self.log_message(f"❌ Export failed: {e}")
+                self.events.call(messagebox.showerror, "Export Error", f"Failed to export: {e}")
+        
+        thread = threading.Thread(target=export_worker)
+        thread.daemon = True
+        thread.start()
+    
+    def log_message(self, message):
+        """Queue a message for the status log (safe from any thread)"""
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        self.events.log(f"[{timestamp}] {message}")
+    
+    def drain_events(self):
+        """Render queued worker events in one batch, then reschedule"""
+        batch = EventBatch(self.events.drain(EVENT_DRAIN_LIMIT))
+        if batch.steps:
+            with span('ui.drain_events', steps=len(batch.steps)):
+                self.render_events(batch)
+        self._drain_job = self.root.after(EVENT_DRAIN_INTERVAL_MS, self.drain_events)
+    
+    def render_events(self, batch):
+        """Apply one batch of worker events to the widgets"""
+        for kind, payload in batch.steps:
+            if kind == events.LOG:
+                self.status_text.insert('end', '\n'.join(payload) + '\n')
+                excess = self.status_log.extend(payload)
+                if excess:
+                    self.status_text.delete('1.0', f'{excess + 1}.0')
+                self.status_text.see('end')
+            elif kind == events.PROGRESS:
+                done, total = payload
+                if total:
+                    self.progress['maximum'] = total
+                self.progress['value'] = done
+            elif kind == events.CALL:
+                func, args = payload
+                func(*args)
+    
+    def clear_status(self):
+        """Clear the status log"""
+        self.status_text.delete('1.0', 'end')
+        self.status_log.clear()
+        
+    def clear_clients(self):
+        """Clear the client text area"""
+        if self.list_view_active:
+            self.client_index.reset('')
+            self.client_list_view.clear_history()
+            self.client_list_view.refresh()
+        else:
+            self.client_text.delete('1.0', 'end')
+        self.log_message("Client list cleared")
+        self.update_client_count()
+        self.save_settings()
+        
+    def get_clients_from_text(self):
+        """Clients from the text area, kept current by the line index
+
+        The returned list is replaced, never mutated, on the next edit, so a
+        worker thread can keep using it.
+        """
+        return self.client_index.clients()
+    
+    def get_run_clients(self):
+        """(clients, per-client terms or None) for a run, warning when there are none
+
+        With the registry switched on, the clients come from an indexed
+        query on the filter and are unique already.
+        """
+        if not self.use_registry_var.get():
+            clients = self.get_clients_from_text()
+            if not clients:
+                messagebox.showwarning("No Clients", "Please enter some client names first!")
+            return clients, None
+        
+        group, tags = self.read_registry_filter()
+        with span('registry.select'):
+            registered = self.registry.select(group, tags)
+        if not registered:
+            messagebox.showwarning("No Clients", "No enabled registry clients match the filter!")
+        return [client.name for client in registered], client_terms(registered)
+    
+    def read_registry_filter(self):
+        """(group or None for every group, tags) from the registry filter fields"""
+        group = self.registry_group_var.get().strip()
+        return group or None, parse_tags(self.registry_tags_var.get())
+    
+    def add_list_to_registry(self):
+        """Add the clients in the list to the registry under the filter's group and tags"""
+        clients = self.get_clients_from_text()
+        if not clients:
+            messagebox.showwarning("No Clients", "Please enter some client names first!")
+            return
+        group, tags = self.read_registry_filter()
+        
+        def worker():
+            try:
+                added, updated = self.registry.import_clients(clients, group or '', tags)
+                self.log_message(f"🗂️ Registry: {added} clients added, {updated} updated")
+            except Exception as e:
+                self.log_message(f"❌ Could not update the registry: {e}")
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def count_registry_matches(self):
+        """Log how many enabled registry clients the filter selects"""
+        group, tags = self.read_registry_filter()
+        try:
+            count = self.registry.count(group, tags)
+        except Exception as e:
+            self.log_message(f"❌ Could not read the registry: {e}")
+            return
+        self.log_message(f"🗂️ {count} registry clients match the filter")
+    
+    def prepare_search(self, control, search_engine, clients, overrides, params):
+        """(clients, queries, cache view) for a run, or None if it should not start
+
+        Runs on the scheduler's worker: only the confirmation goes to the Tk thread.
+        """
+        # Merge spellings of the same client before they become tabs
+        if overrides is None and params['dedupe']:
+            clients, stats = dedupe_clients(clients)
+            if stats.duplicates:
+                self.log_message(f"🧹 Skipped {stats.duplicates} duplicate clients "
+                                 f"({stats.duplicates} tabs saved)")
+        
+        batch_size = params['batch_size']
+        
+        # The matrix knows its size without being built, so the run is
+        # confirmed before the searches are generated
+        matrix = self.build_query_matrix(clients, params, overrides)
+        total = len(matrix)
+        cache = self.search_cache.view()
+        self.log_message(f"✅ Found {len(clients)} clients")
+        if matrix.combinations > 1:
+            self.log_message(f"🔀 {len(matrix.terms)} search terms x {len(matrix.periods)} "
+                             f"time periods: {total} searches")
+        # Fresh searches are left out and packing merges searches, so those
+        # can only open fewer tabs than the matrix holds
+        up_to = "up to " if cache.ttl > 0 or params['pack'] else ""
+        self.log_message(f"⚠️ Will open {up_to}{total} browser tabs in batches of {batch_size}")
+        max_urls = self.launcher.max_urls if self.launcher is not None else None
+        estimate = engine.format_duration(search_engine.estimate_seconds(total, max_urls))
+        self.log_message(f"⏱️ Estimated time: {up_to}{estimate}")
+        
+        # Show preview
+        self.log_message("🔍 Preview of searches:")
+        for i, query in enumerate(islice(matrix, 3), 1):
+            self.log_message(f"  {i}. {query}")
+        if total > 3:
+            self.log_message(f"  ... and {total - 3} more")
+        
+        # Ask for confirmation
+        if control.cancelled:
+            return None
+        if total > 10:
+            response = self.events.ask(messagebox.askyesno, "Confirm",
+                f"This will open {up_to}{total} browser tabs "
+                f"(about {estimate}).\n\nContinue?")
+            if not response:
+                self.log_message("❌ Search cancelled by user")
+                return None
+        
+        # Generate queries, leaving out searches still fresh from an earlier run.
+        # The list is kept whole: the run journal needs it up front for Resume,
+        # and most-important-first sorts all of it.
+        with span('queries.build', clients=len(clients)):
+            queries = [search for search in matrix
+                       if not cache.is_fresh(search.query, search.time_param)]
+        if cache.hits:
+            self.log_message(f"🗃️ Skipping {cache.hits} searches opened "
+                             f"in the last {cache.ttl / 3600:g} hours")
+        if not queries:
+            self.log_message("✅ Every search is still fresh - nothing to open")
+            return None
+        
+        # Most important first; weights and urgent flags come from the registry
+        if params['prioritize']:
+            with span('queries.prioritize', queries=len(queries)):
+                priorities = self.registry.priorities(clients)
+                queries = prioritize(queries, self.search_history, priorities)
+            urgent = sum(1 for _weight, is_urgent in priorities.values() if is_urgent)
+            self.log_message(f"🎯 Most important first ({urgent} urgent clients)")
+        
+        # Pack what is left, so a packed search only holds clients still due
+        if params['pack']:
+            packer = QueryPacker()
+            queries = list(packer.pack(queries))
+            self.log_message(f"📦 Packed {packer.searches_in} searches into "
+                             f"{packer.searches_out}")
+        if len(queries) != total:
+            self.log_message(f"⚠️ Opening {len(queries)} browser tabs")
+        
+        return clients, queries, cache
+    
+    def build_query_matrix(self, clients, params, overrides=None):
+        """Every search for clients: each ;-separated term in each chosen period
+
+        overrides maps clients with terms of their own to those terms.
+        """
+        periods = []
+        for key, time_param in params['time_periods']:
+            if key == SINCE_LAST_RUN:
+                periods.append((SINCE_LAST_RUN_LABEL, SinceLastRun(self.coverage_store)))
+            else:
+                periods.append((engine.describe_time_param(time_param), time_param))
+        return QueryMatrix(clients, split_terms(params['search_term']), periods,
+                           params['order'], client_terms=overrides)
+    
+    def selected_periods(self):
+        """Keys of the ticked time periods, the default one if none is"""
+        keys = [key for key, var in self.period_vars.items() if var.get()]
+        return keys or [engine.DEFAULT_TIME_PERIOD]
+    
+    def read_run_params(self):
+        """Collect and validate the run settings from the widgets"""
+        # Get settings; date ranges are computed now, not when the window opened
+        time_periods = []
+        for key in self.selected_periods():
+            time_param = ''
+            if key != SINCE_LAST_RUN:
+                try:
+                    time_param = engine.resolve_time_period(key)
+                except ValueError:
+                    time_param = engine.DEFAULT_TIME_PARAM
+            time_periods.append((key, time_param))
+        time_period, time_param = time_periods[0]
+        try:
+            delay = float(self.delay_var.get())
+        except ValueError:
+            delay = 1.5
+            self.log_message("Invalid delay, using 1.5 seconds")
+        
+        try:
+            batch_size = int(self.batch_var.get())
+            if batch_size < 1:
+                batch_size = 10
+        except ValueError:
+            batch_size = 10
+            self.log_message("Invalid batch size, using 10")
+        
+        max_rate = None
+        if self.adaptive_var.get():
+            try:
+                max_rate = float(self.max_rate_var.get())
+                if max_rate <= 0:
+                    raise ValueError
+            except ValueError:
+                max_rate = pacing.DEFAULT_MAX_RATE
+                self.log_message(f"Invalid max rate, using {max_rate:g} tabs/second")
+        
+        return {'search_term': self.search_term_var.get(),
+                'time_period': time_period,
+                'time_param': time_param,
+                'time_periods': time_periods,
+                'delay': delay,
+                'batch_size': batch_size,
+                'max_rate': max_rate,
+                'order': self.order_var.get(),
+                'dedupe': self.dedupe_var.get(),
+                'pack': self.pack_var.get(),
+                'prioritize': self.prioritize_var.get()}
+    
+    def read_cache_ttl(self):
+        """Search cache lifetime in seconds from the widget; 0 disables it"""
+        try:
+            hours = float(self.cache_hours_var.get())
+            if hours < 0:
+                raise ValueError
+        except ValueError:
+            hours = DEFAULT_TTL / 3600
+            self.log_message(f"Invalid cache lifetime, using {hours:g} hours")
+        return hours * 3600
+    
+    def build_search_engine(self, params, control):
+        """Create the engine for a run from read_run_params() values
+
+        Its delays sleep on control, so cancel and pause cut them short.
+        """
+        return engine.SearchEngine.from_params(params,
+                                               log=self.log_message,
+                                               progress=self.events.progress,
+                                               sleep=control.sleep)
+    
+    def search_worker(self, control, search_engine, clients, queries, params, cache,
+                      indices=None):
+        """Worker function for search operations (run by the scheduler)
+
+        cache is the run's CacheView of the search cache. indices maps each
+        query to its position in the journaled run when resuming; a fresh
+        run starts a new journal.
+        """
+        try:
+            if indices is None:
+                self.run_journal.start(params, queries)
+            else:
+                self.run_journal.reopen()
+            
+            def checkpoint(offset, group, ok):
+                positions = range(offset, offset + len(group))
+                if indices is not None:
+                    positions = [indices[position] for position in positions]
+                self.run_journal.record(positions, ok)
+                if ok:
+                    for search in group:
+                        for member in search.covered():
+                            cache.put(member.query, member.time_param)
+                        self.coverage_store.record_search(search)
+                        self.search_history.record_search(search)
+            
+            # Finding the default browser may shell out, so do it off the Tk thread
+            if self.launcher is None:
+                self.launcher = launcher.get_launcher('auto')
+                self.log_message(f"🌐 Browser launcher: {self.launcher.name}")
+            search_engine.launcher = self.launcher
+            
+            # Configure progress bar
+            self.events.progress(0, len(queries))
+            
+            # Perform searches
+            self.log_message("🔄 Starting searches...")
+            with span('run', queries=len(queries)):
+                result = search_engine.run(queries, total=len(queries),
+                                           should_continue=control.checkpoint,
+                                           on_group=checkpoint)
+            
+            # Summary
+            self.log_message("=" * 50)
+            self.log_message("📊 SEARCH SUMMARY")
+            self.log_message("=" * 50)
+            self.log_message(f"Total clients: {len(clients)}")
+            self.log_message(f"Browser tabs opened: {result.opened}/{len(queries)}")
+            if result.effective_rate:
+                self.log_message(f"⚡ Effective rate: {result.effective_rate:.2f} tabs/second")
+            if cache.hits or cache.misses:
+                self.log_message(f"🗃️ Cache: {cache.hits} hits, {cache.misses} misses")
+            
+            if result.cancelled:
+                self.log_message(f"⏹️ Cancelled with {len(queries) - result.attempted} "
+                                 f"searches left - Resume continues from there")
+            elif result.opened < len(queries):
+                self.log_message(f"⚠️ {len(queries) - result.opened} searches failed")
+            else:
+                self.log_message("✅ All searches opened successfully!")
+                
+            self.log_message("🎉 Done! Check your browser tabs.")
+            
+        except Exception as e:
+            self.log_message(f"❌ Unexpected error: {e}")
+            self.events.call(messagebox.showerror, "Error", f"An error occurred: {e}")
+        
+        finally:
+            self.run_journal.close()
+            self.search_cache.save()
+            self.coverage_store.save()
+            self.search_history.save()
+            self.events.call(self.on_search_finished)
+    
+    def on_search_finished(self):
+        """Reset the progress once a run has stopped; the next queued one may follow"""
+        self.progress['value'] = 0
+        self.pause_button.config(text="⏸️ Pause")
+    
+    def on_runs_started(self):
+        """Switch the controls to a running search"""
+        self.search_button.config(text="⏹️ Cancel", state='normal')
+        self.pause_button.config(text="⏸️ Pause", state='normal')
+        self.queue_button.config(state='normal')
+        self.resume_button.config(state='disabled')
+    
+    def on_runs_finished(self):
+        """Reset the controls once the queue has run dry"""
+        if self.scheduler.busy:
+            return
+        self.progress['value'] = 0
+        self.search_button.config(text="🔍 Start Search", state='normal')
+        self.pause_button.config(text="⏸️ Pause", state='disabled')
+        self.queue_button.config(state='disabled')
+        self.refresh_resume_button()
+    
+    def toggle_pause(self):
+        """Hold the running search where it is, or carry on from the same search"""
+        control = self.scheduler.current
+        if control is None:
+            return
+        if control.paused:
+            control.resume()
+            self.pause_button.config(text="⏸️ Pause")
+            self.log_message("▶️ Continuing search")
+        else:
+            control.pause()
+            self.pause_button.config(text="▶️ Continue")
+            self.log_message("⏸️ Search paused")
+    
+    def refresh_resume_button(self):
+        """Enable Resume only when the last run has queries left"""
+        state = self.run_journal.load()
+        if state is not None and not state.finished and not self.scheduler.busy:
+            left = len(state.pending_indices())
+            self.resume_button.config(text=f"↩️ Resume ({left} left)", state='normal')
+        else:
+            self.resume_button.config(text="↩️ Resume", state='disabled')
+    
+    def resume_search(self):
+        """Continue the last run: unfinished queries plus the ones that failed"""
+        if self.scheduler.busy:
+            return
+        state = self.run_journal.load()
+        if state is None or state.finished:
+            self.refresh_resume_button()
+            return
+        
+        indices = state.pending_indices()
+        queries = [state.search(i) for i in indices]
+        retries = sum(1 for i in indices if i in state.failed)
+        # Journals from before searches kept their client hold one query per client
+        clients = {member.client for search in queries for member in search.covered()
+                   if member.client is not None} or queries
+        
+        self.events.call(self.clear_status)
+        self.log_message(f"↩️ Resuming run from {state.header.get('started', '?')}")
+        first = state.first_unfinished()
+        if first is not None:
+            self.log_message(f"Continuing at query {first + 1} of {len(state.queries)}")
+        self.log_message(f"{len(queries)} searches left, {retries} of them retries of failures")
+        
+        self.search_cache.ttl = self.read_cache_ttl()
+        cache = self.search_cache.view()
+        control = RunControl()
+        search_engine = self.build_search_engine(state.params, control)
+        self.scheduler.submit(lambda control: self.search_worker(control, search_engine, clients,
+                                                                 queries, state.params, cache,
+                                                                 indices),
+                              control)
+        self.on_runs_started()
+    
+    def start_search(self):
+        """Start the search process, or cancel the running and queued searches"""
+        if self.scheduler.busy:
+            dropped = self.scheduler.cancel()
+            self.log_message("⚠️ Cancelling search..." if not dropped else
+                             f"⚠️ Cancelling search and {dropped} queued")
+            return
+        
+        self.events.call(self.clear_status)
+        self.log_message("🚀 The Web Search-inator")
+        self.submit_search()
+    
+    def queue_search(self):
+        """Queue a run of the current list and settings behind the running one"""
+        self.log_message(f"➕ Queueing a search run ({self.scheduler.pending} already waiting)")
+        self.submit_search()
+    
+    def submit_search(self):
+        """Read the clients and settings for a run and hand it to the scheduler"""
+        clients, overrides = self.get_run_clients()
+        if not clients:
+            return
+        params = self.read_run_params()
+        self.search_cache.ttl = self.read_cache_ttl()
+        control = RunControl()
+        search_engine = self.build_search_engine(params, control)
+        self.scheduler.submit(lambda control: self.run_search(control, search_engine, clients,
+                                                              overrides, params),
+                              control)
+        self.on_runs_started()
+    
+    def run_search(self, control, search_engine, clients, overrides, params):
+        """Build a run's queries and open them (run by the scheduler)
+
+        Expanding, filtering, ordering and packing a large list takes
+        seconds, so it happens here rather than on the Tk thread.
+        """
+        try:
+            prepared = self.prepare_search(control, search_engine, clients, overrides, params)
+        except Exception as e:
+            self.log_message(f"❌ Unexpected error: {e}")
+            self.events.call(messagebox.showerror, "Error", f"An error occurred: {e}")
+            return
+        if prepared is None:
+            return
+        clients, queries, cache = prepared
+        self.search_worker(control, search_engine, clients, queries, params, cache)
+
+def main():
+    """Main function to run the GUI application"""
+    root = tk.Tk()
+    app = GoaNewsSearchGUI(root)
+
+    # Center window on screen
+    root.update_idletasks()
+    width = root.winfo_width()
+    height = root.winfo_height()
+    x = (root.winfo_screenwidth() // 2) - (width // 2)
+    y = (root.winfo_screenheight() // 2) - (height // 2)
+    root.geometry(f"{width}x{height}+{x}+{y}")
+
+    root.mainloop()
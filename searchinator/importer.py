@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming import of client lists from text, CSV and TSV files
+Files are read in chunks on a background thread and handed over in small
+batches through a bounded queue, so memory stays flat however big the file
+is and the UI can show progress and cancel at any point.
+"""
+
+import codecs
+import csv
+import io
+import os
+import queue
+import threading
+
+AUTO = 'auto'
+CHUNK_SIZE = 64 * 1024
+BATCH_SIZE = 2000
+MAX_PENDING_BATCHES = 8
+
+# Fallback for files that are not valid UTF-8 (Excel "CSV" on Windows)
+FALLBACK_ENCODING = 'cp1252'
+
+_BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+DELIMITERS_BY_EXTENSION = {
+    '.csv': ',',
+    '.tsv': '\t',
+    '.tab': '\t',
+}
+
+
+def detect_encoding(head):
+    """Guess the encoding of a file from its first bytes"""
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+
+    # UTF-16 without a BOM: every other byte of ASCII text is zero
+    sample = head[:4096]
+    if len(sample) >= 2:
+        even_zeros = sample[0::2].count(0)
+        odd_zeros = sample[1::2].count(0)
+        half = len(sample) // 2
+        if odd_zeros > half * 0.3 and even_zeros < half * 0.05:
+            return 'utf-16-le'
+        if even_zeros > half * 0.3 and odd_zeros < half * 0.05:
+            return 'utf-16-be'
+
+    try:
+        # The head may end in the middle of a multi-byte character
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODING
+
+
+def detect_delimiter(path, first_line):
+    """Pick the column delimiter, or None for one name per line"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in DELIMITERS_BY_EXTENSION:
+        return DELIMITERS_BY_EXTENSION[extension]
+    # Excel's "Unicode Text" export is tab separated with a .txt extension
+    if '\t' in first_line:
+        return '\t'
+    return None
+
+
+class ImportFormat:
+    """How to read a client file: encoding, delimiter and which column"""
+
+    def __init__(self, encoding, delimiter=None, column=0, skip_header=False):
+        self.encoding = encoding
+        self.delimiter = delimiter
+        self.column = column
+        self.skip_header = skip_header
+
+
+def sniff_format(path):
+    """Detect encoding and delimiter, returning (format, first row)"""
+    with open(path, 'rb') as f:
+        head = f.read(CHUNK_SIZE)
+    encoding = detect_encoding(head)
+    text = codecs.getincrementaldecoder(encoding)(errors='replace').decode(head)
+    first_line = text.splitlines()[0] if text else ''
+    delimiter = detect_delimiter(path, first_line)
+    if delimiter:
+        first_row = next(csv.reader([first_line], delimiter=delimiter), [])
+    else:
+        first_row = [first_line.strip()]
+    return ImportFormat(encoding, delimiter), first_row
+
+
+def iter_file_rows(raw, import_format):
+    """Yield client names from a binary file object, reading it in chunks"""
+    newline = '' if import_format.delimiter else None
+    reader = io.TextIOWrapper(io.BufferedReader(raw, CHUNK_SIZE),
+                              encoding=import_format.encoding,
+                              errors='replace', newline=newline)
+    if import_format.delimiter:
+        rows = csv.reader(reader, delimiter=import_format.delimiter)
+        names = (row[import_format.column] if len(row) > import_format.column else ''
+                 for row in rows)
+    else:
+        names = reader
+
+    if import_format.skip_header:
+        next(names, None)
+    for name in names:
+        name = name.strip()
+        if name:
+            yield name
+
+
+class ImportDone:
+    """Final item on an import queue"""
+
+    def __init__(self, count, cancelled=False, error=None):
+        self.count = count
+        self.cancelled = cancelled
+        self.error = error
+
+
+class StreamingImport:
+    """Reads a client file on a background thread into a bounded batch queue
+
+    The consumer calls poll() from its own thread; each item is either a list
+    of client names or an ImportDone.
+    """
+
+    def __init__(self, path, import_format, batch_size=BATCH_SIZE,
+                 max_pending=MAX_PENDING_BATCHES):
+        self.path = path
+        self.format = import_format
+        self.batch_size = batch_size
+        self.total_bytes = os.path.getsize(path)
+        self.bytes_read = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._cancel = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Begin reading in the background"""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Stop reading as soon as possible"""
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def poll(self, limit=None):
+        """Return the batches ready so far without blocking"""
+        items = []
+        while limit is None or len(items) < limit:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return items
+
+    def _put(self, item):
+        # Block while the consumer is behind, but wake up to notice cancel
+        while not self._cancel.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        count = 0
+        try:
+            with open(self.path, 'rb', buffering=0) as raw:
+                batch = []
+                for name in iter_file_rows(raw, self.format):
+                    batch.append(name)
+                    if len(batch) >= self.batch_size:
+                        self.bytes_read = raw.tell()
+                        if not self._put(batch):
+                            break
+                        count += len(batch)
+                        batch = []
+                else:
+                    if batch and self._put(batch):
+                        count += len(batch)
+                    self.bytes_read = self.total_bytes
+        except Exception as e:
+            self._queue.put(ImportDone(count, error=e))
+            return
+        self._queue.put(ImportDone(count, cancelled=self._cancel.is_set()))
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+Browser launchers
+webbrowser.open starts a browser (or helper) process per URL, which is what
+makes big runs slow. Launchers that know the browser's command line hand it
+a whole batch of URLs in one process instead. A recording launcher opens
+nothing and is used to measure and test runs.
+"""
+
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import time
+import webbrowser
+
+# Keep well under the Windows command line limit of 32767 characters
+MAX_COMMAND_CHARS = 30000
+MAX_URLS_PER_COMMAND = 50
+
+# Browsers that accept several URLs as arguments and open each in a tab
+MULTI_URL_BROWSERS = ('google-chrome', 'google-chrome-stable', 'chromium',
+                      'chromium-browser', 'microsoft-edge', 'brave-browser',
+                      'firefox', 'vivaldi')
+
+
+class Launcher:
+    """Opens URLs in a browser, one per call unless max_urls says otherwise"""
+
+    name = 'launcher'
+    max_urls = 1
+
+    def open(self, url):
+        raise NotImplementedError
+
+    def open_many(self, urls):
+        """Open every URL in urls"""
+        for url in urls:
+            self.open(url)
+
+
+class WebbrowserLauncher(Launcher):
+    """The standard library webbrowser module, one call per URL"""
+
+    name = 'webbrowser'
+
+    def open(self, url):
+        if not webbrowser.open(url):
+            raise RuntimeError("no browser could be started")
+
+
+class CommandLauncher(Launcher):
+    """Runs a browser command with a batch of URLs as its arguments"""
+
+    name = 'command'
+    max_urls = MAX_URLS_PER_COMMAND
+
+    def __init__(self, command, fallback=None):
+        self.command = list(command)
+        self.fallback = fallback or WebbrowserLauncher()
+
+    def open(self, url):
+        self.open_many([url])
+
+    def open_many(self, urls):
+        for chunk in self._chunks(urls):
+            try:
+                subprocess.Popen(self.command + chunk,
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            except OSError:
+                # Browser moved or uninstalled - fall back to the old path
+                self.fallback.open_many(chunk)
+
+    def _chunks(self, urls):
+        chunk = []
+        length = sum(len(part) + 1 for part in self.command)
+        for url in urls:
+            if chunk and (len(chunk) >= self.max_urls or
+                          length + len(url) + 1 > MAX_COMMAND_CHARS):
+                yield chunk
+                chunk = []
+                length = sum(len(part) + 1 for part in self.command)
+            chunk.append(url)
+            length += len(url) + 1
+        if chunk:
+            yield chunk
+
+
+class RecordingLauncher(Launcher):
+    """Opens nothing; records every call for tests and throughput measurements"""
+
+    name = 'record'
+
+    def __init__(self, max_urls=MAX_URLS_PER_COMMAND, latency=0.0, fail_every=0):
+        self.max_urls = max_urls
+        self.latency = latency
+        self.fail_every = fail_every
+        self.calls = []
+
+    def open(self, url):
+        self.open_many([url])
+
+    def open_many(self, urls):
+        urls = list(urls)
+        if self.latency:
+            time.sleep(self.latency)
+        self.calls.append((time.perf_counter(), urls))
+        if self.fail_every and len(self.calls) % self.fail_every == 0:
+            raise RuntimeError("simulated launch failure")
+
+    @property
+    def urls(self):
+        """Every URL handed to the launcher, in order"""
+        return [url for _timestamp, urls in self.calls for url in urls]
+
+    def throughput(self):
+        """URLs per second between the first and last call"""
+        if len(self.calls) < 2:
+            return None
+        elapsed = self.calls[-1][0] - self.calls[0][0]
+        return len(self.urls) / elapsed if elapsed > 0 else None
+
+
+def _default_browser_command():
+    """Command line of the default browser if it takes several URLs, else None"""
+    if sys.platform == 'darwin':
+        # open(1) passes every URL to the default browser in one go
+        return ['open']
+
+    if sys.platform == 'win32':
+        try:
+            import winreg
+            key_path = (r'Software\Microsoft\Windows\Shell\Associations'
+                        r'\UrlAssociations\https\UserChoice')
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path) as key:
+                prog_id = winreg.QueryValueEx(key, 'ProgId')[0]
+            with winreg.OpenKey(winreg.HKEY_CLASSES_ROOT,
+                                prog_id + r'\shell\open\command') as key:
+                command = winreg.QueryValueEx(key, '')[0]
+        except (ImportError, OSError):
+            return None
+        executable = shlex.split(command, posix=False)[0].strip('"')
+        name = os.path.splitext(os.path.basename(executable))[0].lower()
+        if name in ('chrome', 'msedge', 'firefox', 'brave', 'vivaldi'):
+            return [executable]
+        return None
+
+    try:
+        desktop = subprocess.run(['xdg-settings', 'get', 'default-web-browser'],
+                                 capture_output=True, text=True, timeout=2).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        desktop = ''
+    name = desktop[:-len('.desktop')] if desktop.endswith('.desktop') else desktop
+    candidates = [name] if name in MULTI_URL_BROWSERS else []
+    if not desktop:
+        candidates = list(MULTI_URL_BROWSERS)
+    for candidate in candidates:
+        executable = shutil.which(candidate)
+        if executable:
+            return [executable]
+    return None
+
+
+LAUNCHER_NAMES = ('auto', 'webbrowser', 'record')
+
+
+def get_launcher(name='auto'):
+    """Build a launcher by name: auto, webbrowser, record, or a browser path"""
+    if name == 'webbrowser':
+        return WebbrowserLauncher()
+    if name == 'record':
+        return RecordingLauncher()
+    if name == 'auto':
+        command = _default_browser_command()
+        if command:
+            return CommandLauncher(command)
+        return WebbrowserLauncher()
+    return CommandLauncher([name])
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Query matrix: several search terms x clients x time periods
+Users who want "news", "court case" and "tender" over more than one window
+used to run the list once per combination. The matrix streams the whole
+cross product as Searches, in client-major order (every search for one
+client, then the next) or term-major order (the whole list for one term and
+period, then the next). Its size is known up front without building it.
+"""
+
+from itertools import islice
+
+from .engine import (
+    GOOGLE_SEARCH_URL,
+    Search,
+    create_search_query,
+    create_search_url,
+    describe_time_param,
+    iter_search_queries_urls,
+)
+from .export import ExportRow
+
+ORDER_CLIENT_MAJOR = 'client'
+ORDER_TERM_MAJOR = 'term'
+ORDERS = (ORDER_CLIENT_MAJOR, ORDER_TERM_MAJOR)
+
+# Separates several terms typed into the single search term box
+TERM_SEPARATOR = ';'
+
+# Client-major order builds URLs for this many clients at a time
+CLIENT_CHUNK = 1024
+
+
+def split_terms(text):
+    """Split 'news; court case' into ['news', 'court case'] (never empty)"""
+    terms = [term.strip() for term in text.split(TERM_SEPARATOR)]
+    return [term for term in terms if term] or ['']
+
+
+class QueryMatrix:
+    """Lazily generated Searches for every client, term and time period
+
+    periods are (label, tbs) pairs; instead of a tbs string a period may
+    hold an object whose for_client(client, term) returns one per client,
+    such as coverage.SinceLastRun. client_terms maps the clients that have
+    terms of their own to those, used instead of terms. clients may be a
+    one-pass stream in client-major order; term-major order walks the list
+    once per combination, so a stream is read into a list first.
+    """
+
+    def __init__(self, clients, terms, periods, order=ORDER_CLIENT_MAJOR,
+                 base_url=GOOGLE_SEARCH_URL, client_terms=None):
+        if order not in ORDERS:
+            raise ValueError(f"Unknown order: {order}")
+        if order == ORDER_TERM_MAJOR and not hasattr(clients, '__len__'):
+            clients = list(clients)
+        self.clients = clients
+        self.terms = list(terms) or ['']
+        self.periods = list(periods)
+        if not self.periods:
+            raise ValueError("need at least one time period")
+        self.order = order
+        self.base_url = base_url
+        self.client_terms = client_terms or {}
+        # Every term in use, in first-seen order
+        self.all_terms = list(dict.fromkeys(
+            self.terms + [term for terms in self.client_terms.values() for term in terms]))
+
+    @property
+    def combinations(self):
+        """Searches per client"""
+        return len(self.terms) * len(self.periods)
+
+    @property
+    def client_count(self):
+        """Number of clients, or None while they are an unread stream"""
+        return len(self.clients) if hasattr(self.clients, '__len__') else None
+
+    def __len__(self):
+        count = self.client_count
+        if count is None:
+            raise TypeError("the client stream has no length yet")
+        # client_terms only ever names clients in the list
+        extra = sum(len(terms) - len(self.terms) for terms in self.client_terms.values())
+        return (count * len(self.terms) + extra) * len(self.periods)
+
+    def _label(self, term, period_label):
+        # Only name what varies, so a plain run logs exactly as before
+        parts = []
+        if len(self.all_terms) > 1:
+            parts.append(term or '-')
+        if len(self.periods) > 1:
+            parts.append(period_label)
+        return ' · '.join(parts) or None
+
+    def __iter__(self):
+        if self.order == ORDER_CLIENT_MAJOR:
+            clients = iter(self.clients)
+            while True:
+                chunk = list(islice(clients, CLIENT_CHUNK))
+                if not chunk:
+                    break
+                yield from self._iter_client_major(chunk)
+        else:
+            for term in self.all_terms:
+                clients = self.clients
+                if self.client_terms:
+                    clients = [client for client in clients
+                               if term in self.client_terms.get(client, self.terms)]
+                for period_label, period in self.periods:
+                    label = self._label(term, period_label)
+                    if not isinstance(period, str):
+                        for client in clients:
+                            query = create_search_query(client, term)
+                            time_param = period.for_client(client, term)
+                            yield Search(query, time_param,
+                                         create_search_url(query, time_param, self.base_url),
+                                         client, label, term)
+                        continue
+                    pairs = iter_search_queries_urls(clients, term, period, self.base_url)
+                    for client, (query, url) in zip(clients, pairs):
+                        yield Search(query, period, url, client, label, term)
+
+    def _iter_client_major(self, chunk):
+        """Every search for a chunk of clients, in client-major order
+
+        Each term and fixed period is built for the whole chunk in one
+        batch, then the searches are handed out client by client.
+        """
+        columns = []
+        for term in self.terms:
+            for period_label, period in self.periods:
+                pairs = None
+                if isinstance(period, str):
+                    pairs = list(iter_search_queries_urls(chunk, term, period, self.base_url))
+                columns.append((term, period, self._label(term, period_label), pairs))
+        client_terms = self.client_terms
+        for position, client in enumerate(chunk):
+            own_terms = client_terms.get(client)
+            if own_terms is not None:
+                yield from self._iter_client(client, own_terms)
+                continue
+            for term, period, label, pairs in columns:
+                if pairs is not None:
+                    query, url = pairs[position]
+                    yield Search(query, period, url, client, label, term)
+                else:
+                    query = create_search_query(client, term)
+                    time_param = period.for_client(client, term)
+                    yield Search(query, time_param,
+                                 create_search_url(query, time_param, self.base_url),
+                                 client, label, term)
+
+    def _iter_client(self, client, terms):
+        """Every search for one client, one at a time"""
+        for term in terms:
+            query = create_search_query(client, term)
+            for period_label, period in self.periods:
+                time_param = _time_param_for(period, client, term)
+                yield Search(query, time_param,
+                             create_search_url(query, time_param, self.base_url),
+                             client, self._label(term, period_label), term)
+
+
+def _time_param_for(period, client, term):
+    return period if isinstance(period, str) else period.for_client(client, term)
+
+
+def iter_export_rows(searches):
+    """Lazily turn Searches into ExportRows for a static results page"""
+    for search in searches:
+        client = search.client
+        if client is None:
+            client = ', '.join(member.client or member.query for member in search.covered())
+        yield ExportRow(client, search.label or describe_time_param(search.time_param),
+                        search.query, search.url)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Normalization and de-duplication of client names
+Merged lists often contain the same client typed differently: other case or
+spacing, Devanagari in NFD instead of NFC, or with stray zero-width
+characters. Each variant used to become its own browser tab.
+"""
+
+import re
+import unicodedata
+
+# Zero width space, word joiner, BOM and soft hyphen: invisible and meaningless
+_INVISIBLE = dict.fromkeys(map(ord, '\u200b\u2060\ufeff\u00ad'))
+
+# Joiners change how Indic conjuncts (and emoji) render, so they are only
+# dropped when they do not sit between two letters or marks
+ZWNJ = '\u200c'
+ZWJ = '\u200d'
+_JOINERS = re.compile('[\u200c\u200d]')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _is_letter_or_mark(char):
+    return unicodedata.category(char)[0] in 'LM'
+
+
+def _strip_stray_joiners(text):
+    if ZWNJ not in text and ZWJ not in text:
+        return text
+    kept = []
+    for i, char in enumerate(text):
+        if char in (ZWNJ, ZWJ):
+            before = text[i - 1] if i > 0 else ''
+            after = text[i + 1] if i + 1 < len(text) else ''
+            if not (before and after and before not in (ZWNJ, ZWJ)
+                    and _is_letter_or_mark(before) and _is_letter_or_mark(after)):
+                continue
+        kept.append(char)
+    return ''.join(kept)
+
+
+def clean_client(name):
+    """Tidy a client name for searching: NFC, no stray invisibles, single spaces"""
+    name = unicodedata.normalize('NFC', name).translate(_INVISIBLE)
+    name = _strip_stray_joiners(name)
+    return _WHITESPACE.sub(' ', name).strip()
+
+
+def client_key(name):
+    """Key under which two spellings of the same client compare equal"""
+    key = unicodedata.normalize('NFC', name).translate(_INVISIBLE)
+    key = _JOINERS.sub('', key)
+    return _WHITESPACE.sub(' ', key).strip().casefold()
+
+
+class DedupeStats:
+    """Counts from a de-duplication pass"""
+
+    def __init__(self):
+        self.seen = 0
+        self.unique = 0
+
+    @property
+    def duplicates(self):
+        """Clients dropped - i.e. browser tabs saved"""
+        return self.seen - self.unique
+
+
+def iter_unique_clients(clients, stats=None):
+    """Yield cleaned clients, skipping any whose key was already seen"""
+    seen_keys = set()
+    for name in clients:
+        if stats is not None:
+            stats.seen += 1
+        key = client_key(name)
+        if not key or key in seen_keys:
+            continue
+        seen_keys.add(key)
+        if stats is not None:
+            stats.unique += 1
+        yield clean_client(name)
+
+
+def dedupe_clients(clients):
+    """Return (unique cleaned clients, DedupeStats) in one pass"""
+    stats = DedupeStats()
+    return list(iter_unique_clients(clients, stats)), stats
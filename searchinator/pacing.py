@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Pacing of browser launches
+FixedPacer keeps the classic behaviour: a fixed delay after every launch and
+a pause after every batch. AdaptivePacer replaces both with a token bucket
+whose rate is raised while launches are quick and cut back (AIMD style) when
+they slow down or fail, within user-set bounds.
+"""
+
+import time
+
+BATCH_PAUSE = 3.0
+
+DEFAULT_MIN_RATE = 0.5
+DEFAULT_MAX_RATE = 5.0
+# Per-URL launch time above which the machine is treated as struggling
+TARGET_LATENCY = 0.5
+RATE_INCREASE = 0.25
+RATE_DECREASE = 0.5
+
+
+class Pacer:
+    """Base pacer: measures the rate actually achieved"""
+
+    # Pause after every batch of tabs; 0 disables it
+    batch_pause = 0
+
+    def __init__(self, sleep=time.sleep, clock=time.monotonic):
+        self.sleep = sleep
+        self.clock = clock
+        self.launched = 0
+        self.failures = 0
+        self._started = None
+
+    def wait(self, count):
+        """Block until count more URLs may be launched"""
+        if self._started is None:
+            self._started = self.clock()
+
+    def record(self, count, latency, ok):
+        """Report how a launch of count URLs went"""
+        if ok:
+            self.launched += count
+        else:
+            self.failures += 1
+
+    def effective_rate(self):
+        """URLs opened per second since the first launch, or None"""
+        if self._started is None:
+            return None
+        elapsed = self.clock() - self._started
+        return self.launched / elapsed if elapsed > 0 else None
+
+
+class FixedPacer(Pacer):
+    """Sleep a fixed delay after each successful launch"""
+
+    def __init__(self, delay, batch_pause=BATCH_PAUSE, sleep=time.sleep, clock=time.monotonic):
+        super().__init__(sleep, clock)
+        self.delay = delay
+        self.batch_pause = batch_pause
+
+    def record(self, count, latency, ok):
+        super().record(count, latency, ok)
+        if ok:
+            self.sleep(self.delay)
+
+
+class AdaptivePacer(Pacer):
+    """Token bucket whose rate follows launch latency and failures (AIMD)"""
+
+    def __init__(self, min_rate=DEFAULT_MIN_RATE, max_rate=DEFAULT_MAX_RATE,
+                 initial_rate=None, target_latency=TARGET_LATENCY,
+                 increase=RATE_INCREASE, decrease=RATE_DECREASE, burst=1,
+                 sleep=time.sleep, clock=time.monotonic):
+        super().__init__(sleep, clock)
+        if min_rate <= 0 or max_rate < min_rate:
+            raise ValueError("need 0 < min_rate <= max_rate")
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate = min(max_rate, max(min_rate, initial_rate or min_rate))
+        self.target_latency = target_latency
+        self.increase = increase
+        self.decrease = decrease
+        self.capacity = burst
+        self._tokens = burst
+        self._last = None
+
+    def _refill(self, capacity):
+        now = self.clock()
+        if self._last is not None:
+            self._tokens = min(capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def wait(self, count):
+        super().wait(count)
+        # A launch bigger than the bucket may save up for itself
+        capacity = max(self.capacity, count)
+        self._refill(capacity)
+        shortfall = count - self._tokens
+        if shortfall > 0:
+            self.sleep(shortfall / self.rate)
+            self._refill(capacity)
+        self._tokens = max(0, self._tokens - count)
+
+    def record(self, count, latency, ok):
+        super().record(count, latency, ok)
+        if ok and latency / max(1, count) <= self.target_latency:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+        else:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
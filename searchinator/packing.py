@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Query packing: several clients in one OR search
+One quoted name per search means 500 clients open 500 tabs. Packing turns
+"A" term, "B" term, "C" term into "A" OR "B" OR "C" term, filling each
+query as far as the query length, URL length and word limits allow. Names
+are bin-packed (first fit decreasing) within a window of the stream, so a
+long list is packed tightly without being read up front.
+"""
+
+import urllib.parse
+
+from .engine import GOOGLE_SEARCH_URL, Search, create_search_url
+
+# Google ignores words past the 32nd and long URLs get rejected
+DEFAULT_MAX_QUERY_LENGTH = 512
+DEFAULT_MAX_URL_LENGTH = 2000
+DEFAULT_MAX_WORDS = 32
+DEFAULT_WINDOW = 500
+
+OR_SEPARATOR = ' OR '
+
+
+class _Bin:
+    __slots__ = ('chars', 'url', 'words', 'items')
+
+    def __init__(self, chars, url, words):
+        self.chars = chars
+        self.url = url
+        self.words = words
+        self.items = []
+
+
+class QueryPacker:
+    """Packs single-client Searches that share a term and period into OR searches"""
+
+    def __init__(self, max_query_length=DEFAULT_MAX_QUERY_LENGTH,
+                 max_url_length=DEFAULT_MAX_URL_LENGTH, max_words=DEFAULT_MAX_WORDS,
+                 window=DEFAULT_WINDOW, base_url=GOOGLE_SEARCH_URL):
+        self.max_query_length = max_query_length
+        self.max_url_length = max_url_length
+        self.max_words = max_words
+        self.window = max(1, window)
+        self.base_url = base_url
+        self.searches_in = 0
+        self.searches_out = 0
+
+    def _fixed_cost(self, term, time_param):
+        """(chars, URL chars, words) of everything but the names"""
+        chars = url = words = 0
+        url += len(self.base_url) + len('?q=')
+        if term:
+            chars += 1 + len(term)
+            url += 1 + len(urllib.parse.quote_plus(term))
+            words += len(term.split())
+        if time_param:
+            url += len('&tbs=') + len(time_param)
+        return chars, url, words
+
+    @staticmethod
+    def _name_cost(client):
+        quoted = f'"{client}"'
+        return len(quoted), len(urllib.parse.quote_plus(quoted)), max(1, len(client.split()))
+
+    def _fits(self, packed, cost, joined):
+        join_chars = join_words = 0
+        if joined:
+            join_chars, join_words = len(OR_SEPARATOR), 1
+        return (packed.chars + cost[0] + join_chars <= self.max_query_length
+                and packed.url + cost[1] + join_chars <= self.max_url_length
+                and packed.words + cost[2] + join_words <= self.max_words)
+
+    def _pack_bucket(self, term, time_param, items):
+        """First fit decreasing over (position, search) items; return bins"""
+        fixed = self._fixed_cost(term, time_param)
+        costed = sorted(((self._name_cost(search.client), position, search)
+                         for position, search in items),
+                        key=lambda item: item[0][1], reverse=True)
+        bins = []
+        for cost, position, search in costed:
+            for packed in bins:
+                if self._fits(packed, cost, True):
+                    break
+            else:
+                # A name too long for any query still gets a search of its own
+                packed = _Bin(*fixed)
+                bins.append(packed)
+            joined = bool(packed.items)
+            packed.chars += cost[0] + (len(OR_SEPARATOR) if joined else 0)
+            packed.url += cost[1] + (len(OR_SEPARATOR) if joined else 0)
+            packed.words += cost[2] + (1 if joined else 0)
+            packed.items.append((position, search))
+        return bins
+
+    def _build(self, term, time_param, items):
+        items.sort(key=lambda item: item[0])
+        members = [search for _position, search in items]
+        if len(members) == 1:
+            return members[0]
+        query = OR_SEPARATOR.join(f'"{search.client}"' for search in members)
+        if term:
+            query += f" {term}"
+        first = members[0]
+        return Search(query, time_param, create_search_url(query, time_param, self.base_url),
+                      label=first.label, term=term, members=members)
+
+    def _flush(self, buckets):
+        packed = []
+        for (term, time_param), items in buckets.items():
+            for found in self._pack_bucket(term, time_param, items):
+                first = min(position for position, _search in found.items)
+                packed.append((first, self._build(term, time_param, found.items)))
+        packed.sort(key=lambda item: item[0])
+        self.searches_out += len(packed)
+        return [search for _position, search in packed]
+
+    def pack(self, searches):
+        """Lazily yield packed Searches, roughly in the order of the input
+
+        Searches without a client (e.g. replayed from a journal) pass
+        through unchanged.
+        """
+        buckets = {}
+        pending = 0
+        for position, search in enumerate(searches):
+            self.searches_in += 1
+            if search.client is None:
+                self.searches_out += 1
+                yield search
+                continue
+            key = ((search.term or '').strip(), search.time_param)
+            buckets.setdefault(key, []).append((position, search))
+            pending += 1
+            if pending >= self.window:
+                yield from self._flush(buckets)
+                buckets, pending = {}, 0
+        if pending:
+            yield from self._flush(buckets)
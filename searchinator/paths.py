@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Filesystem locations shared by the GUI and the command line
+"""
+
+import os
+import sys
+
+
+def get_resource_path(relative_path):
+    """Get absolute path to resource, works for dev and for PyInstaller"""
+    try:
+        base_path = sys._MEIPASS
+    except Exception:
+        base_path = os.path.abspath(".")
+
+    return os.path.join(base_path, relative_path)
+
+
+def get_appdata_path():
+    """Get the AppData path for storing settings"""
+    if sys.platform == 'win32':
+        appdata = os.getenv('APPDATA')
+    elif sys.platform == 'darwin':
+        appdata = os.path.expanduser('~/Library/Application Support')
+    else:
+        appdata = os.path.expanduser('~/.config')
+
+    app_folder = os.path.join(appdata, 'WebSearchinator')
+    os.makedirs(app_folder, exist_ok=True)
+    return app_folder
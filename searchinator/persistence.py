@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Settings persistence for The Web Search-inator
+Writes happen on a background thread, are coalesced so a burst of changes
+costs one write, are skipped when the content has not changed, and go
+through a temp file and rename so a crash never leaves a half-written file.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+
+def atomic_write_bytes(path, data):
+    """Write data to path via a temp file in the same folder and a rename"""
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.',
+                                    suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_text(path, text, encoding='utf-8'):
+    """Atomically write text to path"""
+    atomic_write_bytes(path, text.encode(encoding))
+
+
+class SettingsStore:
+    """settings.json on disk, remembering the hash of what it last saw"""
+
+    def __init__(self, path):
+        self.path = path
+        self._last_hash = None
+
+    def load(self):
+        """Return the saved settings, or an empty dict if there are none"""
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        self._last_hash = hashlib.sha256(data).hexdigest()
+        return json.loads(data.decode('utf-8'))
+
+    def save(self, settings):
+        """Write settings if they differ from the file; return True if written"""
+        # Use ensure_ascii=False to properly save Devanagari and other Unicode characters
+        data = json.dumps(settings, ensure_ascii=False, indent=2).encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        if digest == self._last_hash:
+            return False
+        atomic_write_bytes(self.path, data)
+        self._last_hash = digest
+        return True
+
+
+class CoalescingWriter:
+    """Background thread that saves only the latest submitted snapshot
+
+    submit() never blocks on disk. The thread waits `delay` seconds after the
+    first change so a burst of keystrokes turns into a single save.
+    """
+
+    def __init__(self, save, delay=0.5, on_error=None):
+        self._save = save
+        self.delay = delay
+        self._on_error = on_error or (lambda e: print(f"Save error: {e}"))
+        self._cond = threading.Condition()
+        self._pending = None
+        self._has_pending = False
+        self._busy = False
+        self._hurry = False
+        self._closed = False
+        self._thread = None
+
+    def submit(self, snapshot):
+        """Queue snapshot to be saved, replacing any not yet written"""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("writer is closed")
+            self._pending = snapshot
+            self._has_pending = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """Write anything pending now and wait for it; False on timeout"""
+        with self._cond:
+            self._hurry = True
+            self._cond.notify_all()
+            done = self._cond.wait_for(lambda: not self._has_pending and not self._busy,
+                                       timeout)
+            self._hurry = False
+            return done
+
+    def close(self, timeout=None):
+        """Flush and stop the background thread"""
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._has_pending or self._closed)
+                if not self._has_pending:
+                    return
+                # Let a burst of changes settle before writing
+                if not self._hurry:
+                    self._cond.wait_for(lambda: self._hurry or self._closed, self.delay)
+                snapshot = self._pending
+                self._pending = None
+                self._has_pending = False
+                self._busy = True
+            try:
+                self._save(snapshot)
+            except Exception as e:
+                self._on_error(e)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
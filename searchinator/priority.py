@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Priority order for a run
+A run used to follow the list, so when it was cut short the clients that
+mattered most could be the ones never searched. Searches can instead be
+ordered most important first: urgent clients, then by weight times how long
+the client has gone unsearched. The last-searched times are kept in their
+own small store. Ordering is a single sort on precomputed keys, with the
+list position as the last key so equal clients keep their order.
+"""
+
+import json
+import os
+import threading
+import time
+
+from .normalize import client_key
+from .persistence import atomic_write_text
+
+HISTORY_NAME = 'search_history.json'
+
+DAY = 24 * 3600
+# Staleness stops growing after this, and clients never searched get it
+MAX_AGE_DAYS = 30
+
+DEFAULT_WEIGHT = 1.0
+
+
+class SearchHistory:
+    """Persistent map from client to when it was last searched"""
+
+    def __init__(self, path, clock=time.time):
+        self.path = path
+        self.clock = clock
+        # client_key -> epoch seconds
+        self._searched = None
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    @classmethod
+    def in_folder(cls, folder):
+        return cls(os.path.join(folder, HISTORY_NAME))
+
+    def _load(self):
+        if self._searched is not None:
+            return self._searched
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._searched = dict(json.load(f))
+        except (OSError, ValueError, TypeError):
+            self._searched = {}
+        return self._searched
+
+    def last_searched(self, client):
+        """Epoch seconds of the last search for client, or None"""
+        return self.last_searched_key(client_key(client))
+
+    def last_searched_key(self, key):
+        """last_searched() for a client_key already worked out"""
+        with self._lock:
+            return self._load().get(key)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._load())
+
+    def record_search(self, search, when=None):
+        """Note that every client a (possibly packed) Search covers was just searched"""
+        when = when if when is not None else self.clock()
+        with self._lock:
+            searched = self._load()
+            for member in search.covered():
+                if member.client is not None:
+                    searched[client_key(member.client)] = when
+            self._dirty = True
+
+    def save(self):
+        """Write the history if it changed; return True if written"""
+        with self._lock:
+            if not self._dirty or self._searched is None:
+                return False
+            stored = list(self._searched.items())
+            self._dirty = False
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        atomic_write_text(self.path, json.dumps(stored, ensure_ascii=False, separators=(',', ':')))
+        return True
+
+
+def priority_score(weight, last_searched, now):
+    """weight x (1 + days unsearched, capped); higher goes first"""
+    if last_searched is None:
+        age = MAX_AGE_DAYS
+    else:
+        age = min(MAX_AGE_DAYS, max(0.0, (now - last_searched) / DAY))
+    return weight * (1 + age)
+
+
+def prioritize(searches, history, priorities=None, now=None):
+    """Searches reordered urgent first, then by priority_score; ties keep their order
+
+    priorities maps client_key to (weight, urgent), e.g. from
+    ClientRegistry.priorities(); clients not in it get DEFAULT_WEIGHT.
+    Searches without a client keep weight and age defaults.
+    """
+    searches = list(searches)
+    priorities = priorities or {}
+    if not priorities and not len(history):
+        # Every client would score the same
+        return searches
+    now = now if now is not None else history.clock()
+    # Several searches per client share one key computation
+    by_client = {}
+    keys = []
+    for position, search in enumerate(searches):
+        client = search.client
+        key = by_client.get(client)
+        if key is None:
+            if client is None:
+                weight, urgent, last_searched = DEFAULT_WEIGHT, False, None
+            else:
+                name = client_key(client)
+                weight, urgent = priorities.get(name, (DEFAULT_WEIGHT, False))
+                last_searched = history.last_searched_key(name)
+            key = by_client[client] = (not urgent, -priority_score(weight, last_searched, now))
+        keys.append((key, position))
+    order = sorted(range(len(searches)), key=keys.__getitem__)
+    return [searches[position] for position in order]
@@ -0,0 +1,394 @@
+# -*- coding: utf-8 -*-
+"""
+Client registry: one indexed master list instead of a text file per team
+Clients live in an SQLite database under the app data folder, each with a
+group, tags, an optional search term of its own, an enabled flag and a
+priority (a weight and an urgent flag) for ordering runs. A run
+asks for a filtered subset (say group 'Legal', tag 'daily') through indexed
+queries, so a large master list can drive a small daily run without
+pasting anything.
+
+    python -m searchinator.registry import team_a.txt --group "Team A" --tag daily
+    python -m searchinator.registry list --group "Team A"
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from .engine import iter_clients
+from .matrix import split_terms
+from .normalize import client_key
+from .paths import get_appdata_path
+
+REGISTRY_NAME = 'registry.sqlite3'
+
+# Rows handed to executemany at a time on import
+IMPORT_CHUNK = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS clients (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    grp TEXT NOT NULL DEFAULT '',
+    term TEXT,
+    enabled INTEGER NOT NULL DEFAULT 1,
+    added REAL NOT NULL,
+    weight REAL NOT NULL DEFAULT 1,
+    urgent INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS clients_group ON clients (grp, enabled);
+CREATE INDEX IF NOT EXISTS clients_enabled ON clients (enabled);
+CREATE TABLE IF NOT EXISTS tags (
+    tag TEXT NOT NULL,
+    client_id INTEGER NOT NULL REFERENCES clients (id) ON DELETE CASCADE,
+    PRIMARY KEY (tag, client_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tags_client ON tags (client_id);
+"""
+
+# Columns added after the first release, with their definitions
+_ADDED_COLUMNS = [
+    ('weight', 'REAL NOT NULL DEFAULT 1'),
+    ('urgent', 'INTEGER NOT NULL DEFAULT 0'),
+]
+
+
+def parse_tags(text):
+    """'daily, Legal' -> ['daily', 'legal']"""
+    tags = (tag.strip().casefold() for tag in text.split(','))
+    return list(dict.fromkeys(tag for tag in tags if tag))
+
+
+class RegisteredClient:
+    """One registry row: the name plus its group, own search term and priority"""
+
+    __slots__ = ('name', 'group', 'term', 'enabled', 'weight', 'urgent')
+
+    def __init__(self, name, group='', term=None, enabled=True, weight=1.0, urgent=False):
+        self.name = name
+        self.group = group
+        self.term = term
+        self.enabled = enabled
+        self.weight = weight
+        self.urgent = urgent
+
+    def __str__(self):
+        return self.name
+
+
+class ClientRegistry:
+    """SQLite backed client registry
+
+    One connection is shared by the Tk thread and the workers, guarded by a
+    lock like the other stores.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def in_folder(cls, folder):
+        return cls(os.path.join(folder, REGISTRY_NAME))
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute('PRAGMA foreign_keys = ON')
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.executescript(_SCHEMA)
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(clients)')}
+            for column, definition in _ADDED_COLUMNS:
+                if column not in columns:
+                    conn.execute(f'ALTER TABLE clients ADD COLUMN {column} {definition}')
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def import_clients(self, names, group='', tags=(), term=None, enabled=True):
+        """Add or update clients from an iterable of names; return (added, updated)
+
+        A name already registered (in any spelling client_key treats as the
+        same) moves to group and gains tags; its term is only replaced when
+        one is given. Later spellings of a name already in this import are
+        skipped, so each client is counted once.
+        """
+        tags = list(tags)
+        now = time.time()
+        processed = 0
+        seen = set()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                before = conn.execute('SELECT COUNT(*) FROM clients').fetchone()[0]
+                chunk = []
+                for name in names:
+                    key = client_key(name)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    chunk.append((key, name, group, term, int(enabled), now))
+                    if len(chunk) >= IMPORT_CHUNK:
+                        processed += self._upsert(conn, chunk, tags)
+                        chunk = []
+                if chunk:
+                    processed += self._upsert(conn, chunk, tags)
+                added = conn.execute('SELECT COUNT(*) FROM clients').fetchone()[0] - before
+        return added, processed - added
+
+    @staticmethod
+    def _upsert(conn, rows, tags):
+        conn.executemany(
+            'INSERT INTO clients (key, name, grp, term, enabled, added) VALUES (?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT (key) DO UPDATE SET grp = excluded.grp, enabled = excluded.enabled, '
+            'term = COALESCE(excluded.term, clients.term)', rows)
+        for tag in tags:
+            conn.executemany('INSERT OR IGNORE INTO tags (tag, client_id) '
+                             'SELECT ?, id FROM clients WHERE key = ?',
+                             [(tag, row[0]) for row in rows])
+        return len(rows)
+
+    def _ids(self, conn, names):
+        keys = [client_key(name) for name in names]
+        ids = []
+        for start in range(0, len(keys), 500):
+            part = keys[start:start + 500]
+            ids.extend(row[0] for row in conn.execute(
+                f'SELECT id FROM clients WHERE key IN ({",".join("?" * len(part))})', part))
+        return ids
+
+    def update(self, names, group=None, term=None, enabled=None, weight=None, urgent=None):
+        """Change group, term ('' clears it), enabled flag, weight or urgent flag
+
+        Return how many of names are registered.
+        """
+        changes = []
+        if group is not None:
+            changes.append(('grp', group))
+        if term is not None:
+            changes.append(('term', term or None))
+        if enabled is not None:
+            changes.append(('enabled', int(enabled)))
+        if weight is not None:
+            changes.append(('weight', max(0.0, float(weight))))
+        if urgent is not None:
+            changes.append(('urgent', int(urgent)))
+        if not changes:
+            return 0
+        assignments = ', '.join(f'{column} = ?' for column, _value in changes)
+        values = [value for _column, value in changes]
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                ids = self._ids(conn, names)
+                conn.executemany(f'UPDATE clients SET {assignments} WHERE id = ?',
+                                 [values + [client_id] for client_id in ids])
+        return len(ids)
+
+    def tag(self, names, tags, remove=False):
+        """Add (or remove) tags on clients; return clients matched"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                ids = self._ids(conn, names)
+                rows = [(tag, client_id) for tag in tags for client_id in ids]
+                if remove:
+                    conn.executemany('DELETE FROM tags WHERE tag = ? AND client_id = ?', rows)
+                else:
+                    conn.executemany('INSERT OR IGNORE INTO tags (tag, client_id) VALUES (?, ?)',
+                                     rows)
+        return len(ids)
+
+    def remove(self, names):
+        """Delete clients; return how many were registered"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                ids = self._ids(conn, names)
+                conn.executemany('DELETE FROM clients WHERE id = ?',
+                                 [(client_id,) for client_id in ids])
+        return len(ids)
+
+    @staticmethod
+    def _where(group, tags, enabled_only):
+        clauses, values = [], []
+        if enabled_only:
+            clauses.append('c.enabled = 1')
+        if group is not None:
+            clauses.append('c.grp = ?')
+            values.append(group)
+        if tags:
+            # Every tag must be present; the (tag, client_id) key answers it
+            clauses.append('c.id IN (SELECT client_id FROM tags WHERE tag IN '
+                           f'({",".join("?" * len(tags))}) GROUP BY client_id '
+                           'HAVING COUNT(*) = ?)')
+            values.extend(tags)
+            values.append(len(tags))
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', values
+
+    def select(self, group=None, tags=(), enabled_only=True):
+        """RegisteredClients matching the filter, in the order they were added"""
+        where, values = self._where(group, list(tags), enabled_only)
+        with self._lock:
+            rows = self._connect().execute(
+                f'SELECT c.name, c.grp, c.term, c.enabled, c.weight, c.urgent '
+                f'FROM clients c{where} ORDER BY c.id', values).fetchall()
+        return [RegisteredClient(name, grp, term, bool(enabled), weight, bool(urgent))
+                for name, grp, term, enabled, weight, urgent in rows]
+
+    def priorities(self, names):
+        """{client_key: (weight, urgent)} for the names that are registered"""
+        keys = list({client_key(name) for name in names})
+        found = {}
+        with self._lock:
+            conn = self._connect()
+            for start in range(0, len(keys), 500):
+                part = keys[start:start + 500]
+                for key, weight, urgent in conn.execute(
+                        'SELECT key, weight, urgent FROM clients '
+                        f'WHERE key IN ({",".join("?" * len(part))})', part):
+                    found[key] = (weight, bool(urgent))
+        return found
+
+    def count(self, group=None, tags=(), enabled_only=True):
+        where, values = self._where(group, list(tags), enabled_only)
+        with self._lock:
+            return self._connect().execute(f'SELECT COUNT(*) FROM clients c{where}',
+                                           values).fetchone()[0]
+
+    def groups(self):
+        """[(group, clients)] for every group in use"""
+        with self._lock:
+            return self._connect().execute(
+                'SELECT grp, COUNT(*) FROM clients GROUP BY grp ORDER BY grp').fetchall()
+
+    def tags(self):
+        """[(tag, clients)] for every tag in use"""
+        with self._lock:
+            return self._connect().execute(
+                'SELECT tag, COUNT(*) FROM tags GROUP BY tag ORDER BY tag').fetchall()
+
+
+def client_terms(clients):
+    """{name: [terms]} for the RegisteredClients that have a term of their own"""
+    return {client.name: split_terms(client.term) for client in clients if client.term}
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(prog="python -m searchinator.registry",
+                                     description="Manage the client registry.")
+    parser.add_argument('--path', default=None,
+                        help="registry file (default: in the app data folder)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_filter(command):
+        command.add_argument('--group', default=None, help="only clients in this group")
+        command.add_argument('--tag', action='append', default=[],
+                             help="only clients with this tag; may be repeated")
+
+    add = commands.add_parser('import', help="add or update clients from a list file")
+    add.add_argument('input', help="client list file, one name per line ('-' reads stdin)")
+    add.add_argument('--group', default='', help="group for these clients")
+    add.add_argument('--tag', action='append', default=[], help="tag; may be repeated")
+    add.add_argument('--term', default=None,
+                     help="search term(s) for these clients instead of the run's, ;-separated")
+    add.add_argument('--disabled', action='store_true', help="add them switched off")
+
+    for name, help_text in (('enable', "switch clients on"), ('disable', "switch clients off"),
+                            ('remove', "delete clients")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('names', nargs='+')
+
+    for name, help_text in (('tag', "add a tag to clients"), ('untag', "remove a tag")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('tag')
+        command.add_argument('names', nargs='+')
+
+    term = commands.add_parser('term', help="set a client's own search term ('' clears it)")
+    term.add_argument('term')
+    term.add_argument('names', nargs='+')
+
+    weight = commands.add_parser('weight', help="set how much clients matter (default 1)")
+    weight.add_argument('weight', type=float)
+    weight.add_argument('names', nargs='+')
+
+    for name, help_text in (('urgent', "search clients before everyone else"),
+                            ('unurgent', "clear the urgent flag")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('names', nargs='+')
+
+    listing = commands.add_parser('list', help="print matching clients")
+    add_filter(listing)
+    listing.add_argument('--all', action='store_true', help="include disabled clients")
+
+    commands.add_parser('groups', help="print groups and tags with client counts")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    if args.path:
+        registry = ClientRegistry(args.path)
+    else:
+        registry = ClientRegistry.in_folder(get_appdata_path())
+    try:
+        if args.command == 'import':
+            if args.input == '-':
+                stream = sys.stdin
+            else:
+                stream = open(args.input, 'r', encoding='utf-8')
+            with stream:
+                added, updated = registry.import_clients(
+                    iter_clients(stream), args.group, parse_tags(','.join(args.tag)),
+                    args.term, enabled=not args.disabled)
+            print(f"{added} clients added, {updated} updated")
+        elif args.command in ('enable', 'disable'):
+            count = registry.update(args.names, enabled=args.command == 'enable')
+            print(f"{count} clients {args.command}d")
+        elif args.command == 'remove':
+            print(f"{registry.remove(args.names)} clients removed")
+        elif args.command in ('tag', 'untag'):
+            count = registry.tag(args.names, parse_tags(args.tag), remove=args.command == 'untag')
+            print(f"{count} clients {args.command}ged")
+        elif args.command == 'term':
+            print(f"{registry.update(args.names, term=args.term)} clients updated")
+        elif args.command == 'weight':
+            print(f"{registry.update(args.names, weight=args.weight)} clients updated")
+        elif args.command in ('urgent', 'unurgent'):
+            count = registry.update(args.names, urgent=args.command == 'urgent')
+            print(f"{count} clients updated")
+        elif args.command == 'list':
+            for client in registry.select(args.group, parse_tags(','.join(args.tag)),
+                                          enabled_only=not args.all):
+                flags = '' if client.enabled else '  (disabled)'
+                if client.urgent:
+                    flags += '  (urgent)'
+                if client.weight != 1:
+                    flags += f'  weight {client.weight:g}'
+                term = f"  [{client.term}]" if client.term else ''
+                print(f"{client.name}\t{client.group}{term}{flags}")
+        elif args.command == 'groups':
+            for group, count in registry.groups():
+                print(f"group {group or '(none)'}: {count}")
+            for tag, count in registry.tags():
+                print(f"tag {tag}: {count}")
+    finally:
+        registry.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
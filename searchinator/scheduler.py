@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Run scheduling: queued runs with instant cancel, pause and resume
+A run used to notice Cancel only after its current delay or batch pause had
+slept out, and could not be paused at all. RunControl replaces those sleeps
+with waits on a condition that cancel, pause and resume wake at once; a
+paused run holds its place and carries on from the same search. The
+RunScheduler runs queued jobs one after another on one worker thread, so
+the window never waits for a run.
+"""
+
+import threading
+import time
+import traceback
+from collections import deque
+
+
+class RunControl:
+    """Cancel/pause state of one run, plus sleeps that honour it
+
+    sleep() is handed to the engine and its pacer in place of time.sleep,
+    and checkpoint() is its should_continue hook.
+    """
+
+    def __init__(self, name='', clock=time.monotonic):
+        self.name = name
+        self.clock = clock
+        self._cond = threading.Condition()
+        self._cancelled = False
+        self._paused = False
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    @property
+    def paused(self):
+        return self._paused
+
+    def cancel(self):
+        with self._cond:
+            self._cancelled = True
+            self._cond.notify_all()
+
+    def pause(self):
+        with self._cond:
+            self._paused = True
+            self._cond.notify_all()
+
+    def resume(self):
+        with self._cond:
+            self._paused = False
+            self._cond.notify_all()
+
+    def checkpoint(self):
+        """Block while paused; return False once cancelled"""
+        with self._cond:
+            while self._paused and not self._cancelled:
+                self._cond.wait()
+            return not self._cancelled
+
+    def sleep(self, seconds):
+        """Sleep, not counting time spent paused; return early on cancel"""
+        with self._cond:
+            deadline = self.clock() + seconds
+            while not self._cancelled:
+                if self._paused:
+                    paused_at = self.clock()
+                    while self._paused and not self._cancelled:
+                        self._cond.wait()
+                    deadline += self.clock() - paused_at
+                    continue
+                remaining = deadline - self.clock()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return not self._cancelled
+
+
+class RunScheduler:
+    """Runs submitted jobs one at a time, in order, off the calling thread
+
+    A job is called with its RunControl. on_idle() is called from the
+    worker thread once the queue has run dry.
+    """
+
+    def __init__(self, on_idle=None):
+        self.on_idle = on_idle or (lambda: None)
+        self.current = None
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def busy(self):
+        return self._thread is not None
+
+    @property
+    def pending(self):
+        """Jobs waiting behind the current one"""
+        return len(self._queue)
+
+    def submit(self, job, control=None):
+        """Queue job(control); return its RunControl"""
+        control = control or RunControl()
+        with self._lock:
+            self._queue.append((job, control))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._work, daemon=True)
+                self._thread.start()
+        return control
+
+    def cancel(self, queued=True):
+        """Cancel the current job and, unless queued is False, every queued one
+
+        Return how many queued jobs were dropped.
+        """
+        with self._lock:
+            dropped = 0
+            if queued:
+                dropped = len(self._queue)
+                for _job, control in self._queue:
+                    control.cancel()
+                self._queue.clear()
+            control = self.current
+        if control is not None:
+            control.cancel()
+        return dropped
+
+    def _work(self):
+        while True:
+            with self._lock:
+                if not self._queue:
+                    self.current = None
+                    self._thread = None
+                    break
+                job, control = self._queue.popleft()
+                self.current = control
+            if not control.cancelled:
+                # Jobs report their own errors; a stray one must not stop the queue
+                try:
+                    job(control)
+                except Exception:
+                    traceback.print_exc()
+        self.on_idle()
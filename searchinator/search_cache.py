@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Cache of recent searches
+Lists are often re-run several times a day, and each run used to reopen (or
+refetch) every search even though its time window had barely moved. Entries
+are keyed on the normalized query plus the tbs parameter, expire after a TTL
+and are evicted least recently used first once the cache is full.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from .normalize import client_key
+from .persistence import atomic_write_text
+
+DEFAULT_TTL = 6 * 3600
+DEFAULT_MAX_ENTRIES = 50000
+
+
+def cache_key(query, time_param):
+    """Key under which equivalent searches share an entry"""
+    return f"{client_key(query)}\x1f{time_param}"
+
+
+class SearchCache:
+    """Persistent TTL + LRU map from (query, tbs) to an optional value"""
+
+    def __init__(self, path, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, clock=time.time):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        # key -> [stored at, value], least recently used first
+        self._entries = None
+        self._dirty = False
+        # The GUI looks entries up on the Tk thread and records them on the worker
+        self._lock = threading.RLock()
+
+    @property
+    def enabled(self):
+        return self.ttl > 0
+
+    def _load(self):
+        if self._entries is not None:
+            return self._entries
+        self._entries = OrderedDict()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            stored = []
+        oldest = self.clock() - self.ttl
+        for key, stored_at, value in stored:
+            if stored_at >= oldest:
+                self._entries[key] = [stored_at, value]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return self._entries
+
+    def lookup(self, query, time_param):
+        """Return (True, value) for a fresh entry, else (False, None)"""
+        hit, value = self._find(query, time_param)
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return hit, value
+
+    def _find(self, query, time_param):
+        """lookup() without counting the hit or miss"""
+        if not self.enabled:
+            return False, None
+        with self._lock:
+            entries = self._load()
+            key = cache_key(query, time_param)
+            entry = entries.get(key)
+            if entry is not None and entry[0] >= self.clock() - self.ttl:
+                entries.move_to_end(key)
+                return True, entry[1]
+            if entry is not None:
+                del entries[key]
+                self._dirty = True
+            return False, None
+
+    def is_fresh(self, query, time_param):
+        return self.lookup(query, time_param)[0]
+
+    def put(self, query, time_param, value=None):
+        """Remember that a search was done just now"""
+        if not self.enabled:
+            return
+        with self._lock:
+            entries = self._load()
+            key = cache_key(query, time_param)
+            entries[key] = [self.clock(), value]
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+            self._dirty = True
+
+    def view(self):
+        """A CacheView counting hits and misses apart from other users"""
+        return CacheView(self)
+
+    def clear(self):
+        with self._lock:
+            self._entries = OrderedDict()
+            self._dirty = True
+            self.save()
+
+    def save(self):
+        """Write the cache if it changed; return True if written"""
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return False
+            stored = [[key, stored_at, value] for key, (stored_at, value) in self._entries.items()]
+            self._dirty = False
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        atomic_write_text(self.path, json.dumps(stored, ensure_ascii=False, separators=(',', ':')))
+        return True
+
+
+class CacheView:
+    """One run's use of a shared SearchCache, with hit and miss counts of its own
+
+    Runs queued in the GUI share one cache; each counts its own lookups here
+    rather than resetting the cache's counters under another run.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def ttl(self):
+        return self.cache.ttl
+
+    def lookup(self, query, time_param):
+        hit, value = self.cache._find(query, time_param)
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return hit, value
+
+    def is_fresh(self, query, time_param):
+        return self.lookup(query, time_param)[0]
+
+    def put(self, query, time_param, value=None):
+        self.cache.put(query, time_param, value)
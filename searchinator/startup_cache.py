@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Startup cache for the window icon and the Devanagari font
+Resizing icon.png with PIL and listing every installed font through Tk took
+most of the time before the window appeared. The pre-sized icon and the font
+that was chosen are kept under the appdata folder; the font choice is dropped
+whenever the installed fonts change, judged by the font folders' timestamps.
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+from .persistence import atomic_write_text
+
+CACHE_FOLDER = 'cache'
+STATE_NAME = 'startup.json'
+ICON_SIZE = 64
+
+
+def font_dirs():
+    """Folders fonts are installed into on this platform"""
+    if sys.platform == 'win32':
+        windir = os.getenv('WINDIR', r'C:\Windows')
+        local = os.getenv('LOCALAPPDATA', '')
+        return [os.path.join(windir, 'Fonts'),
+                os.path.join(local, 'Microsoft', 'Windows', 'Fonts')]
+    if sys.platform == 'darwin':
+        return ['/System/Library/Fonts', '/Library/Fonts',
+                os.path.expanduser('~/Library/Fonts')]
+    return ['/usr/share/fonts', '/usr/local/share/fonts',
+            os.path.expanduser('~/.local/share/fonts'), os.path.expanduser('~/.fonts')]
+
+
+def font_fingerprint():
+    """Cheap hash of the font folders (and their subfolders) modification times"""
+    digest = hashlib.sha1(sys.platform.encode())
+    for folder in font_dirs():
+        try:
+            entries = [folder] + [entry.path for entry in os.scandir(folder) if entry.is_dir()]
+        except OSError:
+            continue
+        for path in entries:
+            try:
+                digest.update(f"{path}\0{os.stat(path).st_mtime_ns}\0".encode('utf-8', 'replace'))
+            except OSError:
+                pass
+    return digest.hexdigest()
+
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class StartupCache:
+    """Remembers the resized icon and chosen font between launches"""
+
+    def __init__(self, folder):
+        self.folder = os.path.join(folder, CACHE_FOLDER)
+        self.state_path = os.path.join(self.folder, STATE_NAME)
+        self._state = None
+
+    def _load(self):
+        if self._state is None:
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    self._state = json.load(f)
+            except (OSError, ValueError):
+                self._state = {}
+        return self._state
+
+    def _save(self):
+        os.makedirs(self.folder, exist_ok=True)
+        atomic_write_text(self.state_path, json.dumps(self._load(), ensure_ascii=False))
+
+    def cached_font(self):
+        """The font chosen last time, or None if fonts changed since"""
+        entry = self._load().get('font')
+        if entry and entry.get('fingerprint') == font_fingerprint():
+            return entry.get('family')
+        return None
+
+    def store_font(self, family):
+        self._load()['font'] = {'family': family, 'fingerprint': font_fingerprint()}
+        self._save()
+
+    def cached_icon(self, source, size=ICON_SIZE):
+        """Path of the resized icon if it is still up to date, else None"""
+        entry = self._load().get('icon')
+        try:
+            if (entry and entry.get('size') == size
+                    and entry.get('source') == _file_signature(source)
+                    and os.path.exists(entry.get('path', ''))):
+                return entry['path']
+        except OSError:
+            pass
+        return None
+
+    def store_icon(self, source, size=ICON_SIZE):
+        """Resize source to a PNG in the cache and return its path (needs PIL)"""
+        from PIL import Image
+
+        os.makedirs(self.folder, exist_ok=True)
+        path = os.path.join(self.folder, f'icon_{size}.png')
+        with Image.open(source) as image:
+            image.resize((size, size), Image.Resampling.LANCZOS).save(path, 'PNG')
+        self._load()['icon'] = {'path': path, 'size': size, 'source': _file_signature(source)}
+        self._save()
+        return path
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Bounded status log
+Counts the lines the view is showing and tells it when to drop old ones, in
+bulk rather than one at a time, so it holds at most about capacity lines. The
+full history can optionally be streamed to a rotating log file instead.
+"""
+
+import logging
+import logging.handlers
+import os
+
+DEFAULT_CAPACITY = 2000
+LOG_FILE_MAX_BYTES = 1024 * 1024
+LOG_FILE_BACKUPS = 5
+
+
+class StatusLog:
+    """Line budget for the status view with optional spill to a rotating file"""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, trim_chunk=None, log_path=None,
+                 max_bytes=LOG_FILE_MAX_BYTES, backup_count=LOG_FILE_BACKUPS):
+        self.capacity = capacity
+        # Let the view run this far over capacity before trimming it
+        self.trim_chunk = trim_chunk if trim_chunk is not None else max(1, capacity // 10)
+        self.view_lines = 0
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.log_path = None
+        self._handler = None
+        self.set_log_path(log_path)
+
+    def set_log_path(self, log_path):
+        """Spill lines to a rotating file at log_path from now on; None stops it"""
+        if log_path == self.log_path:
+            return
+        self.close()
+        self.log_path = log_path
+        self._handler = None
+        if log_path:
+            os.makedirs(os.path.dirname(log_path), exist_ok=True)
+            self._handler = logging.handlers.RotatingFileHandler(
+                log_path, maxBytes=self.max_bytes, backupCount=self.backup_count,
+                encoding='utf-8', delay=True)
+            self._handler.setFormatter(logging.Formatter('%(message)s'))
+
+    def extend(self, lines):
+        """Record new lines; return how many of the oldest the view should drop"""
+        # A message may itself span several lines in the view
+        self.view_lines += sum(line.count('\n') + 1 for line in lines)
+        if self._handler is not None:
+            self._spill(lines)
+        if self.view_lines > self.capacity + self.trim_chunk:
+            excess = self.view_lines - self.capacity
+            self.view_lines = self.capacity
+            return excess
+        return 0
+
+    def clear(self):
+        """Start counting again once the view was cleared (the log file keeps the lines)"""
+        self.view_lines = 0
+
+    def close(self):
+        """Close the log file"""
+        if self._handler is not None:
+            self._handler.close()
+
+    def _spill(self, lines):
+        # One record per batch: one write and one rollover check
+        record = logging.LogRecord('searchinator.status', logging.INFO, __file__, 0,
+                                   '\n'.join(lines), None, None)
+        self._handler.handle(record)
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Local stub of a search results server
+Serves Google-like result pages for any query over keep-alive HTTP/1.1, so
+the fetch engine can be tested and benchmarked offline. Latency and failures
+can be injected to exercise timeouts and retries.
+
+    python -m searchinator.stub_server --port 8080
+"""
+
+import argparse
+import html
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def render_results(query, count):
+    """A results page with count fake hits for query"""
+    slug = urllib.parse.quote_plus(query)
+    hits = []
+    for rank in range(1, count + 1):
+        target = urllib.parse.quote(f"https://example.com/{slug}/{rank}", safe='')
+        hits.append(f'<div class="g"><a href="/url?q={target}&amp;sa=U">'
+                    f'<h3>{html.escape(query)} - result {rank}</h3></a>'
+                    f'<span>Snippet {rank}</span></div>')
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8">'
+            f'<title>{html.escape(query)} - Search</title></head><body>'
+            f'<a href="/preferences">Settings</a>{"".join(hits)}</body></html>')
+
+
+class StubSearchHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; don't let Nagle hold the body
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        number = server.count_request()
+        if server.latency:
+            time.sleep(server.latency)
+
+        if server.fail_every and number % server.fail_every == 0:
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.send_header('Retry-After', '0')
+            self.end_headers()
+            return
+
+        params = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        query = params.get('q', [''])[0]
+        body = render_results(query, server.results_per_page).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, results_per_page, latency, fail_every):
+        super().__init__(address, StubSearchHandler)
+        self.results_per_page = results_per_page
+        self.latency = latency
+        self.fail_every = fail_every
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+            return self.requests
+
+    def handle_error(self, request, client_address):
+        # Clients that time out hang up mid-response; that is expected here
+        pass
+
+
+class StubSearchServer:
+    """Runs the stub on a background thread; use as a context manager"""
+
+    def __init__(self, host='127.0.0.1', port=0, results_per_page=10, latency=0.0, fail_every=0):
+        self.host = host
+        self.port = port
+        self.results_per_page = results_per_page
+        self.latency = latency
+        self.fail_every = fail_every
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """Search URL to pass to the engine as base_url"""
+        return f"http://{self.host}:{self.port}/search"
+
+    @property
+    def requests(self):
+        return self._server.requests if self._server else 0
+
+    def start(self):
+        self._server = _StubHTTPServer((self.host, self.port), self.results_per_page,
+                                       self.latency, self.fail_every)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve fake search results for offline runs.")
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--results', type=int, default=10, help="results per page")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to each response")
+    parser.add_argument('--fail-every', type=int, default=0,
+                        help="answer every Nth request with 503")
+    args = parser.parse_args(argv)
+    server = StubSearchServer(port=args.port, results_per_page=args.results,
+                              latency=args.latency, fail_every=args.fail_every).start()
+    print(f"Serving on {server.base_url} - Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Timing instrumentation
+Spans mark the stages of startup and of a run (query generation, launches,
+pacing sleeps, UI updates). Tracing is off unless SEARCHINATOR_TRACE names an
+output file or the command line passes --trace; while off, span() hands back
+a shared do-nothing object. When on, a Chrome trace (open it in
+chrome://tracing or Perfetto) and a per-stage summary are written at exit.
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+
+ENV_VAR = 'SEARCHINATOR_TRACE'
+
+# Individual events kept for the trace file; the summary counts every span
+MAX_EVENTS = 500000
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'args', 'started')
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer.add(self.name, self.started, time.perf_counter_ns() - self.started, self.args)
+        return False
+
+
+class StageStats:
+    """Running totals for one span name"""
+
+    __slots__ = ('count', 'total_ns', 'max_ns')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+
+class Tracer:
+    """Collects spans from any thread"""
+
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self.events = []
+        self.dropped = 0
+        self.stages = {}
+        self._origin = time.perf_counter_ns()
+        self._threads = {}
+        self._lock = threading.Lock()
+
+    def enable(self, path):
+        """Start collecting; the trace is written to path at exit"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self.path = path
+        atexit.register(self.finish)
+
+    def span(self, name, **args):
+        """Context manager timing one stage"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def add(self, name, started_ns, duration_ns, args=None):
+        """Record a finished span"""
+        thread = threading.current_thread()
+        with self._lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StageStats()
+            stats.count += 1
+            stats.total_ns += duration_ns
+            stats.max_ns = max(stats.max_ns, duration_ns)
+
+            if len(self.events) >= MAX_EVENTS:
+                self.dropped += 1
+                return
+            self._threads.setdefault(thread.ident, thread.name)
+            event = {'name': name, 'ph': 'X', 'pid': os.getpid(), 'tid': thread.ident,
+                     'ts': (started_ns - self._origin) / 1000, 'dur': duration_ns / 1000}
+            if args:
+                event['args'] = args
+            self.events.append(event)
+
+    def summary_rows(self):
+        """(name, count, total ms, mean ms, max ms), slowest stage first"""
+        with self._lock:
+            rows = [(name, stats.count, stats.total_ns / 1e6,
+                     stats.total_ns / 1e6 / stats.count, stats.max_ns / 1e6)
+                    for name, stats in self.stages.items()]
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+    def format_summary(self):
+        lines = [f"{'stage':<28}{'count':>8}{'total ms':>12}{'mean ms':>10}{'max ms':>10}"]
+        for name, count, total, mean, longest in self.summary_rows():
+            lines.append(f"{name:<28}{count:>8}{total:>12.1f}{mean:>10.3f}{longest:>10.1f}")
+        if self.dropped:
+            lines.append(f"({self.dropped} spans summarized but left out of the trace file)")
+        return '\n'.join(lines)
+
+    def export_chrome(self, path):
+        """Write the collected spans as Chrome trace JSON"""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self._threads)
+        metadata = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                     'args': {'name': name}} for tid, name in threads.items()]
+        summary = {name: {'count': count, 'total_ms': round(total, 3),
+                          'mean_ms': round(mean, 4), 'max_ms': round(longest, 3)}
+                   for name, count, total, mean, longest in self.summary_rows()}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': metadata + events, 'displayTimeUnit': 'ms',
+                       'otherData': {'summary': summary, 'dropped': self.dropped}}, f)
+
+    def finish(self):
+        """Write the trace file and print the summary (runs at exit)"""
+        if not self.enabled or not self.stages:
+            return
+        try:
+            self.export_chrome(self.path)
+            outcome = f"Trace written to {self.path}"
+        except OSError as e:
+            outcome = f"Could not write trace to {self.path}: {e}"
+        # Windowed builds have no stderr; the summary is in the trace file too
+        if sys.stderr is not None:
+            print(self.format_summary(), file=sys.stderr)
+            print(outcome, file=sys.stderr)
+
+
+tracer = Tracer()
+span = tracer.span
+
+
+def enable(path=None):
+    """Turn tracing on, writing to path or the file named by SEARCHINATOR_TRACE"""
+    path = path or os.environ.get(ENV_VAR)
+    if path:
+        tracer.enable(path)
+    return tracer.enabled
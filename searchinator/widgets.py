@@ -0,0 +1,424 @@
+# -*- coding: utf-8 -*-
+"""
+Tk helpers used by the GUI
+"""
+
+import bisect
+import collections
+import sys
+import tkinter as tk
+import tkinter.font as tkfont
+from tkinter import ttk
+
+# Text widget subcommands that change the buffer
+_EDIT_COMMANDS = ('insert', 'delete', 'replace')
+
+
+class TextLineTracker:
+    """Keeps a ClientIndex in step with a tk.Text widget
+
+    The widget's Tcl command is wrapped so every insert, delete and replace -
+    typed, pasted, IME-composed or done from code - is seen with its indices.
+    Only the lines the edit touched are read back into the index.
+    """
+
+    def __init__(self, text_widget, index, on_change=None):
+        self.widget = text_widget
+        self.index = index
+        self.on_change = on_change
+        # While paused the widget is not the source of truth (e.g. the list
+        # is shown in a VirtualListView) and edits are not mirrored
+        self.paused = False
+        self._orig = text_widget._w + '_orig'
+        text_widget.tk.call('rename', text_widget._w, self._orig)
+        text_widget.tk.createcommand(text_widget._w, self._proxy)
+        self.resync()
+
+    def _call(self, *args):
+        return self.widget.tk.call((self._orig,) + args)
+
+    def _line_of(self, index):
+        return int(str(self._call('index', index)).split('.')[0])
+
+    def _last_line(self):
+        return self._line_of('end-1c')
+
+    def resync(self):
+        """Rebuild the index from the whole widget"""
+        self.index.reset(self._call('get', '1.0', 'end-1c'))
+        if self.on_change:
+            self.on_change()
+
+    def _proxy(self, command, *args):
+        if self.paused:
+            return self._call(command, *args)
+        if command not in _EDIT_COMMANDS:
+            result = self._call(command, *args)
+            # Undo and redo bypass the widget command, so re-read everything
+            if command == 'edit' and args and args[0] in ('undo', 'redo'):
+                self.resync()
+            return result
+
+        if command == 'delete' and len(args) > 2:
+            # Several ranges at once is rare enough to resync
+            result = self._call(command, *args)
+            self.resync()
+            return result
+
+        # Lines covered by the edit before it happens (1-based, inclusive)
+        lines_before = self._last_line()
+        first = min(self._line_of(args[0]), lines_before)
+        if command == 'insert':
+            last = first
+        elif len(args) > 1:
+            last = min(self._line_of(args[1]), lines_before)
+        else:
+            last = min(self._line_of(f'{args[0]}+1c'), lines_before)
+        last = max(last, first)
+
+        result = self._call(command, *args)
+
+        # The same region after the edit has grown or shrunk by the line delta
+        new_last = last + self._last_line() - lines_before
+        new_text = self._call('get', f'{first}.0', f'{new_last}.end')
+        self.index.replace_lines(first - 1, last, new_text.split('\n'))
+        if self.on_change:
+            self.on_change()
+        return result
+
+
+class VirtualListView(tk.Frame):
+    """Scrollable, editable view over a ClientIndex that draws only visible rows
+
+    Nothing but the rows on screen exists as Tk items, so the list can hold
+    hundreds of thousands of clients. Edits go straight to the index and undo
+    keeps only the last `undo_limit` edits.
+    """
+
+    def __init__(self, master, index, font, on_change=None, undo_limit=100, **kwargs):
+        super().__init__(master, **kwargs)
+        self.index = index
+        # A Font object is shared so later changes to it show up here
+        self.font = font if isinstance(font, tkfont.Font) else tkfont.Font(font=font)
+        self.row_height = self.font.metrics('linespace') + 4
+        self.on_change = on_change
+        self._undo = collections.deque(maxlen=undo_limit)
+        self._rows = None      # None shows every line, else positions matching the filter
+        self._top = 0          # first row drawn
+        self._selected = None  # selected line position in the index
+        self._editor = None
+        self._editor_entry = None
+        self._filter_job = None
+
+        # Find / filter bar
+        bar = tk.Frame(self)
+        bar.pack(fill='x', pady=(0, 3))
+        tk.Label(bar, text="Find:", font=('Arial', 9)).pack(side='left')
+        self.find_var = tk.StringVar()
+        self.find_var.trace('w', self._on_find_changed)
+        find_entry = tk.Entry(bar, textvariable=self.find_var, font=font, width=25)
+        find_entry.pack(side='left', padx=3)
+        find_entry.bind('<Return>', lambda e: self.find_next())
+        self.filter_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(bar, text="Filter", variable=self.filter_var,
+                       command=self.apply_filter).pack(side='left')
+        tk.Button(bar, text="Next", command=self.find_next,
+                  font=('Arial', 8)).pack(side='left', padx=2)
+        tk.Button(bar, text="➕ Add", command=self.add_row,
+                  font=('Arial', 8)).pack(side='right', padx=2)
+        tk.Button(bar, text="➖ Delete", command=self.delete_row,
+                  font=('Arial', 8)).pack(side='right', padx=2)
+        self.match_label = tk.Label(bar, text="", font=('Arial', 8), fg='#7f8c8d')
+        self.match_label.pack(side='right', padx=5)
+
+        # Rows
+        body = tk.Frame(self)
+        body.pack(fill='both', expand=True)
+        self.scrollbar = ttk.Scrollbar(body, orient='vertical', command=self.yview)
+        self.scrollbar.pack(side='right', fill='y')
+        self.canvas = tk.Canvas(body, bg='white', highlightthickness=1,
+                                height=8 * self.row_height, takefocus=True)
+        self.canvas.pack(side='left', fill='both', expand=True)
+
+        self.canvas.bind('<Configure>', lambda e: self.redraw())
+        self.canvas.bind('<MouseWheel>', self._on_mousewheel)
+        self.canvas.bind('<Button-4>', lambda e: self._scroll_rows(-3))
+        self.canvas.bind('<Button-5>', lambda e: self._scroll_rows(3))
+        self.canvas.bind('<Button-1>', self._on_click)
+        self.canvas.bind('<Double-Button-1>', lambda e: self.edit_selected())
+        self.canvas.bind('<Return>', lambda e: self.edit_selected())
+        self.canvas.bind('<F2>', lambda e: self.edit_selected())
+        self.canvas.bind('<Delete>', lambda e: self.delete_row())
+        self.canvas.bind('<Up>', lambda e: self._move_selection(-1))
+        self.canvas.bind('<Down>', lambda e: self._move_selection(1))
+        self.canvas.bind('<Prior>', lambda e: self._scroll_rows(-self._page_rows()))
+        self.canvas.bind('<Next>', lambda e: self._scroll_rows(self._page_rows()))
+        self.canvas.bind('<Control-z>', lambda e: self.undo())
+        if sys.platform == 'darwin':
+            self.canvas.bind('<Command-z>', lambda e: self.undo())
+
+    # -- rows ---------------------------------------------------------------
+
+    def row_count(self):
+        """Number of rows currently shown (after filtering)"""
+        if self._rows is None:
+            return self.index.line_count
+        return len(self._rows)
+
+    def _position(self, row):
+        return row if self._rows is None else self._rows[row]
+
+    def _row_of(self, position):
+        if self._rows is None:
+            return position
+        row = bisect.bisect_left(self._rows, position)
+        if row < len(self._rows) and self._rows[row] == position:
+            return row
+        return None
+
+    def _page_rows(self):
+        return max(1, self.canvas.winfo_height() // self.row_height)
+
+    def refresh(self):
+        """Re-read the index after it changed outside the view"""
+        self.apply_filter()
+
+    def update_font_metrics(self):
+        """Re-measure rows after the shared font was reconfigured"""
+        self.row_height = self.font.metrics('linespace') + 4
+        self.redraw()
+
+    def redraw(self):
+        """Draw the rows that fit in the canvas"""
+        self.canvas.delete('row')
+        count = self.row_count()
+        page = self._page_rows()
+        self._top = max(0, min(self._top, count - page))
+        lines = self.index.lines()
+        width = self.canvas.winfo_width()
+        for offset in range(min(page + 1, count - self._top)):
+            row = self._top + offset
+            position = self._position(row)
+            y = offset * self.row_height
+            if position == self._selected:
+                self.canvas.create_rectangle(0, y, width, y + self.row_height,
+                                             fill='#cde8ff', outline='', tags='row')
+            self.canvas.create_text(6, y + 2, anchor='nw', text=lines[position],
+                                    font=self.font, tags='row')
+        if count:
+            self.scrollbar.set(self._top / count, min(1.0, (self._top + page) / count))
+        else:
+            self.scrollbar.set(0, 1)
+
+    # -- scrolling ----------------------------------------------------------
+
+    def yview(self, *args):
+        """Scrollbar callback"""
+        if args[0] == 'moveto':
+            self._top = int(float(args[1]) * self.row_count())
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            self._top += step * (self._page_rows() if args[2] == 'pages' else 1)
+        self.redraw()
+
+    def _scroll_rows(self, rows):
+        self._top += rows
+        self.redraw()
+        return 'break'
+
+    def _on_mousewheel(self, event):
+        return self._scroll_rows(int(-1 * (event.delta / 120)) * 3)
+
+    def see(self, position):
+        """Scroll so the line at position is visible and select it"""
+        row = self._row_of(position)
+        if row is None:
+            return
+        self._selected = position
+        page = self._page_rows()
+        if row < self._top or row >= self._top + page:
+            self._top = max(0, row - page // 2)
+        self.redraw()
+
+    # -- selection and editing ----------------------------------------------
+
+    def _on_click(self, event):
+        self.canvas.focus_set()
+        row = self._top + int(event.y // self.row_height)
+        if row < self.row_count():
+            self._selected = self._position(row)
+        self.redraw()
+
+    def _move_selection(self, step):
+        if self._selected is None:
+            row = self._top
+        else:
+            row = self._row_of(self._selected)
+            row = self._top if row is None else row + step
+        if 0 <= row < self.row_count():
+            self.see(self._position(row))
+        return 'break'
+
+    def _replace(self, start, end, new_lines, record=True):
+        """Apply an edit to the index, remembering how to undo it"""
+        old_lines = self.index.lines()[start:end]
+        if record:
+            self._undo.append((start, start + len(new_lines), old_lines))
+        self.index.replace_lines(start, end, new_lines)
+        if self.index.line_count == 0:
+            # Keep the Text invariant of at least one (empty) line
+            self.index.replace_lines(0, 0, [''])
+        if self.on_change:
+            self.on_change()
+
+    def edit_selected(self):
+        """Edit the selected row in place"""
+        if self._selected is None:
+            return
+        self.see(self._selected)
+        row = self._row_of(self._selected)
+        y = (row - self._top) * self.row_height
+        position = self._selected
+        self._close_editor()
+        entry = tk.Entry(self.canvas, font=self.font)
+        entry.insert(0, self.index.lines()[position])
+        entry.select_range(0, 'end')
+        self._editor = self.canvas.create_window(0, y, anchor='nw', window=entry,
+                                                 width=self.canvas.winfo_width(),
+                                                 height=self.row_height)
+        self._editor_entry = entry
+        entry.focus_set()
+
+        def commit(event=None):
+            # Return and the FocusOut caused by closing the editor both land here
+            if self._editor_entry is not entry:
+                return
+            value = entry.get()
+            self._close_editor()
+            if value != self.index.lines()[position]:
+                self._replace(position, position + 1, [value])
+            self.refresh()
+            self.canvas.focus_set()
+
+        entry.bind('<Return>', commit)
+        entry.bind('<FocusOut>', commit)
+        entry.bind('<Escape>', lambda e: (self._close_editor(), self.canvas.focus_set()))
+
+    def _close_editor(self):
+        if self._editor is not None:
+            self.canvas.delete(self._editor)
+            self._editor = None
+            entry, self._editor_entry = self._editor_entry, None
+            entry.destroy()
+
+    def add_row(self):
+        """Insert an empty row below the selection and edit it"""
+        if self._selected is None:
+            position = self.index.line_count
+        else:
+            position = self._selected + 1
+        self._replace(position, position, [''])
+        # A blank row would be hidden by an active filter
+        self.filter_var.set(False)
+        self.apply_filter()
+        self.see(position)
+        self.edit_selected()
+
+    def delete_row(self):
+        """Remove the selected row"""
+        if self._selected is None:
+            return
+        position = self._selected
+        self._replace(position, position + 1, [])
+        self._selected = min(position, self.index.line_count - 1)
+        self.refresh()
+        return 'break'
+
+    def undo(self):
+        """Revert the most recent edit made in this view"""
+        if not self._undo:
+            return 'break'
+        start, end, old_lines = self._undo.pop()
+        self._replace(start, end, old_lines, record=False)
+        self._selected = start if old_lines else None
+        self.refresh()
+        return 'break'
+
+    def clear_history(self):
+        """Forget the undo history, e.g. after the list was replaced"""
+        self._undo.clear()
+
+    # -- find and filter ----------------------------------------------------
+
+    def _on_find_changed(self, *args):
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(200, self.apply_filter)
+
+    def _matches(self):
+        needle = self.find_var.get().strip().casefold()
+        lines = self.index.lines()
+        return [i for i, line in enumerate(lines) if needle in line.casefold()]
+
+    def apply_filter(self):
+        """Recompute which rows are shown from the find box"""
+        self._filter_job = None
+        needle = self.find_var.get().strip()
+        if needle and self.filter_var.get():
+            self._rows = self._matches()
+            self.match_label.config(text=f"{len(self._rows)} of {self.index.count}")
+        else:
+            self._rows = None
+            self.match_label.config(text=f"{self.index.count} clients")
+        if self._selected is not None and self._selected >= self.index.line_count:
+            self._selected = None
+        self.redraw()
+
+    def find_next(self):
+        """Select the next line containing the find text"""
+        needle = self.find_var.get().strip().casefold()
+        if not needle:
+            return
+        lines = self.index.lines()
+        start = -1 if self._selected is None else self._selected
+        count = len(lines)
+        for step in range(1, count + 1):
+            position = (start + step) % count
+            if needle in lines[position].casefold():
+                self.see(position)
+                return
+        self.match_label.config(text="No matches")
+
+
+def ask_import_column(parent, first_row):
+    """Ask which column holds the client names; returns (column, skip_header) or None"""
+    dialog = tk.Toplevel(parent)
+    dialog.title("Import Columns")
+    dialog.transient(parent)
+    dialog.resizable(False, False)
+
+    choices = [f"{i + 1}: {value}" for i, value in enumerate(first_row)] or ["1"]
+    header_var = tk.BooleanVar(value=True)
+    result = []
+
+    tk.Label(dialog, text="Which column holds the client names?",
+             font=('Arial', 10)).pack(anchor='w', padx=10, pady=(10, 5))
+    # The selected position, not the label: two columns may share a header
+    column_box = ttk.Combobox(dialog, values=choices, state='readonly', width=40)
+    column_box.current(0)
+    column_box.pack(anchor='w', padx=10)
+    tk.Checkbutton(dialog, text="First row is a header",
+                   variable=header_var).pack(anchor='w', padx=10, pady=5)
+
+    def on_ok():
+        result.append((max(0, column_box.current()), header_var.get()))
+        dialog.destroy()
+
+    buttons = tk.Frame(dialog)
+    buttons.pack(fill='x', padx=10, pady=(0, 10))
+    tk.Button(buttons, text="Import", command=on_ok).pack(side='right')
+    tk.Button(buttons, text="Cancel", command=dialog.destroy).pack(side='right', padx=5)
+
+    dialog.grab_set()
+    parent.wait_window(dialog)
+    return result[0] if result else None
@@ -16,8 +16,8 @@ OPTIONS = {
         'NSHumanReadableCopyright': "© 2025",
         'NSHighResolutionCapable': True,
     },
-    'packages': ['tkinter', 'PIL'],
-    'includes': ['PIL.Image', 'PIL.ImageTk'],
+    'packages': ['tkinter', 'PIL', 'searchinator'],
+    'includes': ['PIL.Image'],
 }
 
 setup(
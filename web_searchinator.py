@@ -5,696 +5,427 @@ Supports English and Devanagari script - paste your client list and go!
 Automatically opens Google searches for all clients
 Now with persistent settings saved to AppData!
 FIXED: Devanagari input now works properly!
+
+Run without arguments to open the window. Pass a client file (or '-' for
+stdin) to run headless, e.g. from cron:
+
+    python web_searchinator.py clients.txt --term "Goa news" --time week
+    cat clients.txt | python web_searchinator.py - --open --delay 1
+    python web_searchinator.py clients.txt --export results.html
+    python web_searchinator.py clients.txt --fetch results.csv --stub-server
+    python web_searchinator.py clients.txt --term news --term tender --time day --time week
+    python web_searchinator.py clients.txt --open --pack
+    python web_searchinator.py clients.txt --open --time since-last
+    python web_searchinator.py --registry --group "Team A" --tag daily --open
 """
 
-import tkinter as tk
-from tkinter import messagebox, scrolledtext, ttk, filedialog
-import webbrowser
-import time
-import urllib.parse
-import threading
-from datetime import datetime, timedelta
+import argparse
 import os
 import sys
-import json
+import time
+
+from searchinator import engine, export, fetch, launcher, normalize, pacing, trace
+from searchinator.checkpoint import RunJournal
+from searchinator.coverage import (
+    DEFAULT_FIRST_RUN_DAYS,
+    SINCE_LAST_RUN,
+    SINCE_LAST_RUN_LABEL,
+    CoverageStore,
+    SinceLastRun,
+)
+from searchinator.matrix import ORDER_CLIENT_MAJOR, ORDERS, QueryMatrix, iter_export_rows
+from searchinator.packing import (
+    DEFAULT_MAX_QUERY_LENGTH,
+    DEFAULT_MAX_URL_LENGTH,
+    DEFAULT_MAX_WORDS,
+    QueryPacker,
+)
+from searchinator.paths import get_appdata_path
+from searchinator.priority import SearchHistory, prioritize
+from searchinator.registry import ClientRegistry, client_terms, parse_tags
+from searchinator.search_cache import DEFAULT_TTL, SearchCache
+from searchinator.stub_server import StubSearchServer
+
+
+def build_arg_parser():
+    """Build the command line parser for headless runs"""
+    parser = argparse.ArgumentParser(
+        prog="web_searchinator",
+        description="Generate or open Google searches for a client list without the GUI.")
+    parser.add_argument('input', nargs='?', default='-',
+                        help="client list file, one name per line ('-' reads stdin)")
+    parser.add_argument('--registry', action='store_true',
+                        help="take the clients from the client registry (see python -m "
+                             "searchinator.registry) instead of input; clients with a term "
+                             "of their own are searched with it")
+    parser.add_argument('--group', default=None,
+                        help="only registry clients in this group (with --registry)")
+    parser.add_argument('--tag', action='append', default=[],
+                        help="only registry clients with this tag; may be repeated "
+                             "(with --registry)")
+    parser.add_argument('--term', action='append', default=None,
+                        help="search term added after each client name; repeat it to search "
+                             f"every client with each term (default: {engine.DEFAULT_SEARCH_TERM})")
+    period = parser.add_mutually_exclusive_group()
+    period.add_argument('--time', action='append', default=None,
+                        choices=[key for key, _label, _factory in engine.TIME_PERIODS]
+                        + [SINCE_LAST_RUN],
+                        help="time period to restrict results to (default: day); "
+                             f"'{SINCE_LAST_RUN}' searches each client from the day it was "
+                             "last opened with --open (or in the window) up to today; "
+                             "repeat it to search each period")
+    parser.add_argument('--first-run-days', type=int, default=DEFAULT_FIRST_RUN_DAYS,
+                        help=f"days searched for clients never searched before "
+                             f"(with --time {SINCE_LAST_RUN})")
+    period.add_argument('--tbs', action='append', default=None,
+                        help="raw Google tbs parameter, overrides --time; may be repeated")
+    parser.add_argument('--order', choices=ORDERS, default=ORDERS[0],
+                        help="with several terms or periods: 'client' runs every search for "
+                             "one client before the next, 'term' runs the whole list per term "
+                             "and period")
+    parser.add_argument('--pack', action='store_true',
+                        help="combine several clients into one OR search per term and period "
+                             "(\"A\" OR \"B\" term), so fewer tabs or fetches cover the list")
+    parser.add_argument('--max-query-length', type=int, default=DEFAULT_MAX_QUERY_LENGTH,
+                        help="longest packed query in characters (with --pack)")
+    parser.add_argument('--max-url-length', type=int, default=DEFAULT_MAX_URL_LENGTH,
+                        help="longest packed search URL in characters (with --pack)")
+    parser.add_argument('--max-words', type=int, default=DEFAULT_MAX_WORDS,
+                        help="most words in a packed query, counting each OR (with --pack)")
+    parser.add_argument('--prioritize', action='store_true',
+                        help="with --open, search the most important clients first: urgent "
+                             "ones, then by registry weight x days since last searched")
+    parser.add_argument('--open', action='store_true',
+                        help="open each search in the browser instead of printing URLs")
+    parser.add_argument('--export', metavar='PATH', default=None,
+                        help="write every search to one file instead of printing or opening them")
+    parser.add_argument('--format', choices=[export.FORMAT_HTML, export.FORMAT_URLS], default=None,
+                        help="export format; by default .html/.htm files get a results page "
+                             "grouped by client, anything else a plain URL list")
+    parser.add_argument('--fetch', metavar='PATH', default=None,
+                        help="download every search and write the result titles and links "
+                             "to PATH (.json for JSON, anything else CSV)")
+    parser.add_argument('--base-url', default=engine.GOOGLE_SEARCH_URL,
+                        help="search endpoint used to build URLs")
+    parser.add_argument('--concurrency', type=int, default=fetch.DEFAULT_CONCURRENCY,
+                        help="searches fetched at once (with --fetch)")
+    parser.add_argument('--timeout', type=float, default=fetch.DEFAULT_TIMEOUT,
+                        help="seconds before a fetch times out (with --fetch)")
+    parser.add_argument('--retries', type=int, default=fetch.DEFAULT_RETRIES,
+                        help="retries per search after errors or busy replies (with --fetch)")
+    parser.add_argument('--stub-server', action='store_true',
+                        help="fetch from a local stub server instead of --base-url, "
+                             "for offline testing and benchmarks")
+    parser.add_argument('--launcher', default='auto',
+                        help="how to open tabs with --open: auto (default browser, many URLs "
+                             "per launch where supported), webbrowser (one launch per URL), "
+                             "record (open nothing, report throughput) or a browser executable")
+    parser.add_argument('--delay', type=float, default=engine.DEFAULT_DELAY,
+                        help="seconds to wait after each browser launch (with --open)")
+    parser.add_argument('--batch-size', type=int, default=engine.DEFAULT_BATCH_SIZE,
+                        help="pause after this many tabs (with --open)")
+    parser.add_argument('--adaptive', action='store_true',
+                        help="adapt the launch rate to the machine instead of a fixed delay; "
+                             "--delay then sets the slowest pace")
+    parser.add_argument('--max-rate', type=float, default=pacing.DEFAULT_MAX_RATE,
+                        help="fastest launch rate in URLs per second (with --adaptive)")
+    parser.add_argument('--cache-hours', type=float, default=DEFAULT_TTL / 3600,
+                        help="with --open, skip searches opened this recently; with --fetch, "
+                             "reuse results fetched this recently (0 disables)")
+    parser.add_argument('--keep-duplicates', action='store_true',
+                        help="search every line even if the same client appears more than once")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue the last journaled run (from the GUI or --open): "
+                             "unfinished searches plus the ones that failed; input is ignored")
+    parser.add_argument('--encoding', default='utf-8',
+                        help="encoding of the client list")
+    parser.add_argument('--trace', metavar='PATH', default=None,
+                        help="time each stage and write a Chrome trace to PATH plus a summary "
+                             f"to stderr at exit (also enabled by {trace.ENV_VAR}=PATH)")
+    return parser
 
-# Helper function to compute last N days as Google tbs parameter
-def get_last_n_days_param(n: int) -> str:
-    end_date = datetime.today()
-    start_date = end_date - timedelta(days=n)
-    start_str = start_date.strftime("%Y%m%d")
-    end_str = end_date.strftime("%Y%m%d")
-    return f"cdr:1,cd_min:{start_str},cd_max:{end_str}"
 
+def open_client_stream(path, encoding):
+    """Open the client list for line-by-line reading"""
+    if path == '-':
+        sys.stdin.reconfigure(encoding=encoding)
+        return sys.stdin
+    return open(path, 'r', encoding=encoding)
+
+
+def run_journaled(search_engine, journal, searches, indices=None, cache=None, coverage=None,
+                  history=None):
+    """Open Searches while checkpointing each one in the run journal"""
+    def checkpoint(offset, group, ok):
+        positions = range(offset, offset + len(group))
+        if indices is not None:
+            positions = [indices[position] for position in positions]
+        journal.record(positions, ok)
+        if ok and cache is not None:
+            for search in group:
+                for member in search.covered():
+                    cache.put(member.query, member.time_param)
+        if ok and coverage is not None:
+            for search in group:
+                coverage.record_search(search)
+        if ok and history is not None:
+            for search in group:
+                history.record_search(search)
 
-def get_resource_path(relative_path):
-    """Get absolute path to resource, works for dev and for PyInstaller"""
     try:
-        base_path = sys._MEIPASS
-    except Exception:
-        base_path = os.path.abspath(".")
-    
-    return os.path.join(base_path, relative_path)
-
-
-def get_appdata_path():
-    """Get the AppData path for storing settings"""
-    if sys.platform == 'win32':
-        appdata = os.getenv('APPDATA')
-    elif sys.platform == 'darwin':
-        appdata = os.path.expanduser('~/Library/Application Support')
-    else:
-        appdata = os.path.expanduser('~/.config')
-    
-    app_folder = os.path.join(appdata, 'WebSearchinator')
-    os.makedirs(app_folder, exist_ok=True)
-    return app_folder
-
-
-class GoaNewsSearchGUI:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("The Web Search-inator")
-        self.root.geometry("700x700")
-        self.root.resizable(True, True)
-        
-        # Settings file path
-        self.settings_file = os.path.join(get_appdata_path(), 'settings.json')
-        
-        # Set window icon
-        self.set_window_icon()
-        
-        # Configure style
-        self.setup_styles()
-        
-        # Variables
-        self.clients = []
-        self.is_searching = False
-        
-        # Create GUI
-        self.create_widgets()
-        
-        # Load saved settings
-        self.load_settings()
-        
-        # Bind window close event to save settings
-        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
-    
-    def set_window_icon(self):
-        """Set the window icon from icon.png"""
-        try:
-            icon_path = get_resource_path('icon.png')
-            
-            if os.path.exists(icon_path):
-                from PIL import Image, ImageTk
-                icon_image = Image.open(icon_path)
-                icon_image = icon_image.resize((64, 64), Image.Resampling.LANCZOS)
-                self.icon_photo = ImageTk.PhotoImage(icon_image)
-                self.root.iconphoto(True, self.icon_photo)
-                
-        except ImportError:
-            try:
-                icon_path = get_resource_path('icon.png')
-                if os.path.exists(icon_path):
-                    self.root.iconphoto(True, tk.PhotoImage(file=icon_path))
-            except Exception:
-                pass
-        except Exception:
-            pass
-        
-    def setup_styles(self):
-        """Setup GUI styling"""
-        self.root.configure(bg="#8f8ce8")
-        
-        # Configure ttk styles
-        style = ttk.Style()
-        style.theme_use('clam')
-    
-    def get_devanagari_font(self):
-        """Find an appropriate font that supports Devanagari script"""
-        import tkinter.font as tkfont
-        
-        # List of fonts known to support Devanagari (prioritized)
-        devanagari_fonts = [
-            'Nirmala UI',
-            'Mangal',
-            'Aparajita',
-            'Kokila',
-            'Utsaah',
-            'Sanskrit Text',
-            'Devanagari MT',
-            'Kohinoor Devanagari',
-            'Noto Sans Devanagari',
-            'Arial Unicode MS',
-            'Segoe UI',
-            'Microsoft Sans Serif'
-        ]
-        
-        available_fonts = tkfont.families()
-        
-        # Try to find a Devanagari-supporting font
-        for font in devanagari_fonts:
-            if font in available_fonts:
-                return (font, 11)
-        
-        # Fallback
-        return ('TkDefaultFont', 11)
-    
-    def load_settings(self):
-        """Load settings from AppData"""
-        try:
-            if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
-                
-                # Load client list
-                if 'client_list' in settings:
-                    self.client_text.delete('1.0', 'end')
-                    self.client_text.insert('1.0', settings['client_list'])
-                
-                # Load search term
-                if 'search_term' in settings:
-                    self.search_term_var.set(settings['search_term'])
-                
-                # Load time period
-                if 'time_period' in settings:
-                    self.time_var.set(settings['time_period'])
-                
-                # Load delay
-                if 'delay' in settings:
-                    self.delay_var.set(settings['delay'])
-                
-                # Load batch size
-                if 'batch_size' in settings:
-                    self.batch_var.set(settings['batch_size'])
-                
-                self.update_client_count()
-                self.log_message("✅ Settings loaded from AppData")
-        except Exception as e:
-            self.log_message(f"⚠️ Could not load settings: {e}")
-    
-    def save_settings(self):
-        """Save settings to AppData"""
+        return search_engine.run(searches, total=len(searches), on_group=checkpoint)
+    finally:
+        journal.close()
+
+
+def report_run(result, search_launcher, log):
+    """Print a run summary to stderr"""
+    log(f"Browser tabs opened: {result.opened}/{result.attempted}")
+    if result.effective_rate:
+        log(f"Effective rate: {result.effective_rate:.2f} URLs/s")
+    if isinstance(search_launcher, launcher.RecordingLauncher):
+        rate = search_launcher.throughput()
+        log(f"Launch calls: {len(search_launcher.calls)}, "
+            f"throughput: {f'{rate:.1f} URLs/s' if rate else 'n/a'}")
+
+
+def report_cache(cache, log):
+    """Print cache hit and miss counts to stderr"""
+    if cache.hits or cache.misses:
+        log(f"Cache: {cache.hits} hits, {cache.misses} misses")
+
+
+def resolve_periods(args, coverage):
+    """(label, tbs) for every --time or --tbs given, computed now
+
+    Since last run has no single tbs; its period holds a SinceLastRun
+    that works one out per client.
+    """
+    if args.tbs:
+        return [(engine.describe_time_param(tbs), tbs) for tbs in args.tbs]
+    labels = {key: label for key, label, _factory in engine.TIME_PERIODS}
+    periods = []
+    for key in args.time or [engine.DEFAULT_TIME_PERIOD]:
+        if key == SINCE_LAST_RUN:
+            periods.append((SINCE_LAST_RUN_LABEL, SinceLastRun(coverage, args.first_run_days)))
+        else:
+            periods.append((labels[key], engine.resolve_time_period(key)))
+    return periods
+
+
+def run_fetch(args, searches, log):
+    """Fetch every search and write the parsed results
+
+    Stub server results are never cached, or served from the cache.
+    """
+    cache = None
+    if not args.stub_server:
+        cache = SearchCache(os.path.join(get_appdata_path(), 'fetch_cache.json'),
+                            ttl=args.cache_hours * 3600)
+    fetcher = fetch.Fetcher(concurrency=args.concurrency, timeout=args.timeout,
+                            retries=args.retries)
+    started = time.perf_counter()
+    try:
+        results = fetcher.fetch_searches(searches, cache)
+        with trace.span('fetch.run'):
+            count, failed = fetch.write_results(args.fetch, results)
+    finally:
+        fetcher.close()
+        if cache is not None:
+            cache.save()
+    elapsed = time.perf_counter() - started
+    log(f"Fetched {count - failed}/{count} searches to {args.fetch} in {elapsed:.2f}s "
+        f"({count / elapsed if elapsed > 0 else 0:.1f} searches/s, "
+        f"{fetcher.pool.created} connections)")
+    if cache is not None:
+        report_cache(cache, log)
+    return 0 if failed == 0 else 1
+
+
+def run_cli(argv):
+    """Run a headless search from command line arguments"""
+    args = build_arg_parser().parse_args(argv)
+    trace.enable(args.trace)
+    terms = args.term or [engine.DEFAULT_SEARCH_TERM]
+    coverage = CoverageStore(os.path.join(get_appdata_path(), 'coverage.json'))
+    periods = resolve_periods(args, coverage)
+
+    def log(message):
+        print(message, file=sys.stderr)
+
+    journal = RunJournal(get_appdata_path())
+    if args.resume:
+        state = journal.load()
+        if state is None or state.finished:
+            log("Nothing to resume")
+            return 0
+        indices = state.pending_indices()
+        log(f"Resuming run from {state.header.get('started', '?')}: "
+            f"{len(indices)} of {len(state.queries)} searches left")
+        search_launcher = launcher.get_launcher(args.launcher)
+        search_engine = engine.SearchEngine.from_params(state.params, launcher=search_launcher,
+                                                        log=log)
+        cache = SearchCache(os.path.join(get_appdata_path(), 'search_cache.json'),
+                            ttl=args.cache_hours * 3600)
+        history = SearchHistory.in_folder(get_appdata_path())
+        journal.reopen()
         try:
-            settings = {
-                'client_list': self.client_text.get('1.0', 'end-1c'),
-                'search_term': self.search_term_var.get(),
-                'time_period': self.time_var.get(),
-                'delay': self.delay_var.get(),
-                'batch_size': self.batch_var.get()
-            }
-            
-            # Use ensure_ascii=False to properly save Devanagari and other Unicode characters
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, ensure_ascii=False, indent=2)
-            
-            return True
-        except Exception as e:
-            print(f"Save error: {e}")
-            return False
-    
-    def on_closing(self):
-        """Handle window closing event"""
-        self.save_settings()
-        self.root.destroy()
-        
-    def create_widgets(self):
-        """Create all GUI widgets"""
-        
-        # Create main container with scrollbar
-        main_container = tk.Frame(self.root, bg="#7bceff")
-        main_container.pack(fill='both', expand=True)
-        
-        # Create canvas and scrollbar
-        canvas = tk.Canvas(main_container, bg='#7bceff', highlightthickness=0)
-        scrollbar = ttk.Scrollbar(main_container, orient='vertical', command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg='#7bceff')
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor='nw')
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # Pack scrollbar and canvas
-        scrollbar.pack(side='right', fill='y')
-        canvas.pack(side='left', fill='both', expand=True)
-        
-        # Enable mousewheel scrolling
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
-        
-        # Title
-        title_frame = tk.Frame(scrollable_frame, bg='#7bceff')
-        title_frame.pack(fill='x', padx=10, pady=10)
-        
-        title_label = tk.Label(title_frame, 
-                              text="🚀 The Web Search-inator", 
-                              font=('Arial', 16, 'bold'),
-                              bg='#7bceff',
-                              fg="#000000")
-        title_label.pack()
-        
-        subtitle_label = tk.Label(title_frame,
-                                 text="Supports English script",
-                                 font=('Nirmala UI', 10),
-                                 bg='#7bceff',
-                                 fg="#182122")
-        subtitle_label.pack()
-        
-        # Client input section
-        input_frame = tk.LabelFrame(scrollable_frame, text="📝 Client List", 
-                                   font=('Arial', 12, 'bold'),
-                                   padx=10, pady=10)
-        input_frame.pack(fill='both', expand=True, padx=10, pady=5)
-        
-        # Instructions with file import button
-        instructions_frame = tk.Frame(input_frame)
-        instructions_frame.pack(fill='x', pady=(0, 5))
-        
-        instructions = tk.Label(instructions_frame,
-                               text="Type or paste your client list below (one name per line):",
-                               font=('Arial', 10),
-                               justify='left')
-        instructions.pack(side='left')
-        
-        import_btn = tk.Button(instructions_frame,
-                              text="📁 Import from File",
-                              command=self.import_from_file,
-                              font=('Arial', 9),
-                              bg='#7bceff',
-                              fg='white',
-                              padx=10,
-                              pady=2)
-        import_btn.pack(side='right')
-        
-        # Text area for clients - FIXED for Devanagari input
-        text_container = tk.Frame(input_frame)
-        text_container.pack(fill='both', expand=True, pady=5)
-        
-        # Get Devanagari font
-        devanagari_font = self.get_devanagari_font()
-        
-        # Create Text widget with scrollbar
-        text_scroll = tk.Scrollbar(text_container)
-        text_scroll.pack(side='right', fill='y')
-        
-        # FIXED: Added insertunfocussed='solid' to prevent IME issues
-        self.client_text = tk.Text(text_container,
-                                   height=8,
-                                   width=70,
-                                   font=devanagari_font,
-                                   wrap='word',
-                                   yscrollcommand=text_scroll.set,
-                                   insertunfocussed='solid',  # This helps with IME
-                                   undo=True,  # Enable undo
-                                   maxundo=-1)  # Unlimited undo
-        self.client_text.pack(side='left', fill='both', expand=True)
-        text_scroll.config(command=self.client_text.yview)
-        
-        # FIXED: Bind proper events for text changes that work with IME
-        self.client_text.bind('<KeyRelease>', self.on_text_modified)
-        # Remove <<Modified>> binding as it can interfere with IME
-        
-        # Counter label
-        self.count_label = tk.Label(input_frame,
-                                    text="Clients: 0",
-                                    font=('Arial', 9),
-                                    fg='#7bceff')
-        self.count_label.pack(anchor='e', pady=(2, 0))
-        
-        # Search term customization
-        search_term_frame = tk.LabelFrame(scrollable_frame, text="🔍 Search Terms",
-                                         font=('Arial', 12, 'bold'),
-                                         padx=10, pady=10)
-        search_term_frame.pack(fill='x', padx=10, pady=5)
-        
-        tk.Label(search_term_frame, 
-                text="Add custom search terms after client name:",
-                font=('Arial', 10)).pack(anchor='w', pady=(0, 5))
-        
-        self.search_term_var = tk.StringVar(value="Goa news")
-        self.search_term_var.trace('w', self.on_setting_changed)
-        
-        # FIXED: Use Entry with better IME support
-        search_term_entry = tk.Entry(search_term_frame, 
-                                     textvariable=self.search_term_var,
-                                     font=devanagari_font,
-                                     width=40)
-        search_term_entry.pack(anchor='w')
-        
-        tk.Label(search_term_frame,
-                text='Example: "news" will search for "Client Name news"',
-                font=('Arial', 8),
-                fg='#7f8c8d').pack(anchor='w', pady=(2, 0))
-        
-        # Time period section
-        time_frame = tk.LabelFrame(scrollable_frame, text="⏰ Time Period", 
-                                  font=('Arial', 12, 'bold'),
-                                  padx=10, pady=10)
-        time_frame.pack(fill='x', padx=10, pady=5)
-        
-        self.time_var = tk.StringVar(value="qdr:d")
-        self.time_var.trace('w', self.on_setting_changed)
-        
-        # Time options in a grid
-        time_options = [
-            ("Last 24 hours", "qdr:d"),
-            ("Last 2 days", get_last_n_days_param(2)),
-            ("Last 3 days", get_last_n_days_param(3)),
-            ("Last 4 days", get_last_n_days_param(4)),
-            ("Last week", "qdr:w"),
-            ("Last month", "qdr:m"),
-            ("Last year", "qdr:y"),
-            ("Any time", "")
-        ]
-        
-        # Create grid layout for radio buttons
-        time_grid = tk.Frame(time_frame)
-        time_grid.pack(fill='x')
-        
-        for i, (text, value) in enumerate(time_options):
-            rb = tk.Radiobutton(time_grid,
-                               text=text,
-                               variable=self.time_var,
-                               value=value,
-                               font=('Arial', 10))
-            rb.grid(row=i//2, column=i%2, sticky='w', padx=5, pady=2)
-        
-        # Settings section
-        settings_frame = tk.LabelFrame(scrollable_frame, text="⚙️ Settings",
-                                      font=('Arial', 12, 'bold'),
-                                      padx=10, pady=10)
-        settings_frame.pack(fill='x', padx=10, pady=5)
-        
-        # Delay setting
-        delay_frame = tk.Frame(settings_frame)
-        delay_frame.pack(fill='x', pady=2)
-        
-        tk.Label(delay_frame, text="Delay between tabs (seconds):", 
-                font=('Arial', 10)).pack(side='left')
-        
-        self.delay_var = tk.StringVar(value="2")
-        self.delay_var.trace('w', self.on_setting_changed)
-        delay_entry = tk.Entry(delay_frame, textvariable=self.delay_var, width=10)
-        delay_entry.pack(side='right')
-        
-        # Batch size setting
-        batch_frame = tk.Frame(settings_frame)
-        batch_frame.pack(fill='x', pady=2)
-        
-        tk.Label(batch_frame, text="Open tabs in batches of:", 
-                font=('Arial', 10)).pack(side='left')
-        
-        self.batch_var = tk.StringVar(value="10")
-        self.batch_var.trace('w', self.on_setting_changed)
-        batch_entry = tk.Entry(batch_frame, textvariable=self.batch_var, width=10)
-        batch_entry.pack(side='right')
-        
-        tk.Label(settings_frame,
-                text="(Pause after each batch to avoid browser overload)",
-                font=('Arial', 8),
-                fg='#7f8c8d').pack(anchor='w')
-        
-        # Buttons section
-        button_frame = tk.Frame(scrollable_frame, bg="#ed9393")
-        button_frame.pack(fill='x', padx=10, pady=10)
-        
-        self.search_button = tk.Button(button_frame,
-                                      text="🔍 Start Search",
-                                      command=self.start_search,
-                                      font=('Arial', 12, 'bold'),
-                                      bg='#3498db',
-                                      fg='white',
-                                      padx=20,
-                                      pady=10)
-        self.search_button.pack(side='left', padx=5)
-        
-        self.clear_button = tk.Button(button_frame,
-                                     text="🗑️ Clear",
-                                     command=self.clear_clients,
-                                     font=('Arial', 12),
-                                     bg='#e74c3c',
-                                     fg='white',
-                                     padx=20,
-                                     pady=10)
-        self.clear_button.pack(side='left', padx=5)
-        
-        save_btn = tk.Button(button_frame,
-                            text="💾 Save List",
-                            command=self.save_to_file,
-                            font=('Arial', 12),
-                            bg='#16a085',
-                            fg='white',
-                            padx=20,
-                            pady=10)
-        save_btn.pack(side='left', padx=5)
-        
-        # Status section
-        status_frame = tk.LabelFrame(scrollable_frame, text="📊 Status",
-                                    font=('Arial', 12, 'bold'),
-                                    padx=10, pady=5)
-        status_frame.pack(fill='both', expand=True, padx=10, pady=5)
-        
-        self.status_text = scrolledtext.ScrolledText(status_frame,
-                                                    height=8,
-                                                    width=70,
-                                                    font=('Consolas', 9),
-                                                    bg='#2c3e50',
-                                                    fg='#7bceff',
-                                                    wrap='word')
-        self.status_text.pack(fill='both', expand=True, pady=5)
-        
-        # Progress bar
-        self.progress = ttk.Progressbar(scrollable_frame, mode='determinate')
-        self.progress.pack(fill='x', padx=10, pady=5)
-        
-        # Initial status message
-        self.log_message("Ready! Enter your clients and click 'Start Search'")
-        self.log_message(f"💾 Settings saved to: {get_appdata_path()}")
-        self.log_message(f"🔤 Font used: {devanagari_font[0]}")
-        self.log_message("✅ Devanagari input enabled - you can type in Hindi!")
-    
-    def on_text_modified(self, event=None):
-        """Handle text modifications"""
-        self.update_client_count()
-        # Use after_idle to avoid too frequent saves while typing
-        if hasattr(self, '_save_job'):
-            self.root.after_cancel(self._save_job)
-        self._save_job = self.root.after(1000, self.save_settings)
-    
-    def on_setting_changed(self, *args):
-        """Auto-save when any setting changes"""
-        self.save_settings()
-        
-    def update_client_count(self, event=None):
-        """Update the client counter"""
-        clients = self.get_clients_from_text()
-        self.count_label.config(text=f"Clients: {len(clients)}")
-    
-    def import_from_file(self):
-        """Import client list from a text file"""
-        filename = filedialog.askopenfilename(
-            title="Select Client List File",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
-        )
-        
-        if filename:
-            try:
-                with open(filename, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    self.client_text.delete('1.0', 'end')
-                    self.client_text.insert('1.0', content)
-                    self.log_message(f"Imported from: {os.path.basename(filename)}")
-                    self.update_client_count()
-                    self.save_settings()
-            except Exception as e:
-                messagebox.showerror("Import Error", f"Failed to import file: {e}")
-    
-    def save_to_file(self):
-        """Save client list to a text file"""
-        filename = filedialog.asksaveasfilename(
-            title="Save Client List",
-            defaultextension=".txt",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
-        )
-        
-        if filename:
+            result = run_journaled(search_engine, journal, [state.search(i) for i in indices],
+                                   indices, cache=cache, coverage=coverage, history=history)
+        finally:
+            cache.save()
+            coverage.save()
+            history.save()
+        report_run(result, search_launcher, log)
+        return 0 if result.failed == 0 else 1
+
+    params = {'search_term': '; '.join(terms),
+              'time_param': periods[0][1] if isinstance(periods[0][1], str) else '',
+              'delay': args.delay,
+              'batch_size': args.batch_size,
+              'max_rate': args.max_rate if args.adaptive else None}
+    search_launcher = launcher.get_launcher(args.launcher) if args.open else None
+    search_engine = engine.SearchEngine.from_params(params, launcher=search_launcher, log=log)
+
+    stream = None if args.registry else open_client_stream(args.input, args.encoding)
+    stub = StubSearchServer().start() if args.fetch and args.stub_server else None
+    if stub is not None:
+        log(f"Fetching from stub server at {stub.base_url}")
+    try:
+        overrides = None
+        dedupe_stats = normalize.DedupeStats()
+        if args.registry:
+            # Registered names are unique already
+            registry = ClientRegistry.in_folder(get_appdata_path())
             try:
-                content = self.client_text.get('1.0', 'end-1c')
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                self.log_message(f"Saved to: {os.path.basename(filename)}")
-                messagebox.showinfo("Success", "Client list saved successfully!")
-            except Exception as e:
-                messagebox.showerror("Save Error", f"Failed to save file: {e}")
-        
-    def log_message(self, message):
-        """Add message to status log"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.status_text.insert('end', f"[{timestamp}] {message}\n")
-        self.status_text.see('end')
-        self.root.update()
-        
-    def clear_clients(self):
-        """Clear the client text area"""
-        self.client_text.delete('1.0', 'end')
-        self.log_message("Client list cleared")
-        self.update_client_count()
-        self.save_settings()
-        
-    def get_clients_from_text(self):
-        """Extract clients from text area"""
-        text_content = self.client_text.get('1.0', 'end-1c')
-        clients = []
-        
-        for line in text_content.split('\n'):
-            line = line.strip()
-            if line:
-                clients.append(line)
-                
-        return clients
-    
-    def create_search_query(self, client_name):
-        """Create a Google search query for client + custom search terms"""
-        search_term = self.search_term_var.get().strip()
-        if search_term:
-            return f'"{client_name}" {search_term}'
+                with trace.span('registry.select'):
+                    registered = registry.select(args.group, parse_tags(','.join(args.tag)))
+            finally:
+                registry.close()
+            clients = [client.name for client in registered]
+            overrides = client_terms(registered)
+            log(f"{len(clients)} clients from the registry")
         else:
-            return f'"{client_name}"'
-    
-    def create_search_url(self, query, time_param=""):
-        """Create complete Google search URL"""
-        encoded_query = urllib.parse.quote_plus(query)
-        google_url = f"https://www.google.com/search?q={encoded_query}"
-        if time_param:
-            google_url += f"&tbs={time_param}"
-        return google_url
-    
-    def open_google_search(self, query, time_param="", delay=1.0):
-        """Open a Google search in the browser"""
-        try:
-            search_url = self.create_search_url(query, time_param)
-            webbrowser.open(search_url)
-            self.log_message(f"🔍 Opened: {query}")
-            time.sleep(delay)
-            return True
-        except Exception as e:
-            self.log_message(f"❌ Error opening search for '{query}': {e}")
-            return False
-    
-    def search_worker(self):
-        """Worker function for search operations (runs in separate thread)"""
+            clients = engine.iter_clients(stream)
+            if not args.keep_duplicates:
+                clients = normalize.iter_unique_clients(clients, dedupe_stats)
+
+        def report_duplicates():
+            if dedupe_stats.duplicates:
+                log(f"Skipped {dedupe_stats.duplicates} duplicate clients "
+                    f"({dedupe_stats.duplicates} tabs saved)")
+
+        base_url = stub.base_url if stub is not None else args.base_url
+        order = args.order
+        export_format = None
+        if args.export:
+            export_format = args.format or export.format_for_path(args.export)
+        if export_format == export.FORMAT_HTML:
+            # The results page has one section per client
+            order = ORDER_CLIENT_MAJOR
+        matrix = QueryMatrix(clients, terms, periods, order, base_url=base_url,
+                             client_terms=overrides)
+        packer = None
+        if args.pack:
+            packer = QueryPacker(args.max_query_length, args.max_url_length, args.max_words,
+                                 base_url=base_url)
+
+        def packed(searches):
+            return packer.pack(searches) if packer is not None else searches
+
+        def report_packing():
+            if packer is not None and packer.searches_in:
+                log(f"Packed {packer.searches_in} searches into {packer.searches_out}")
+
+        if args.fetch:
+            status = run_fetch(args, packed(matrix), log)
+            report_duplicates()
+            report_packing()
+            return status
+
+        if args.export:
+            with trace.span('export.write'):
+                count = export.export_rows(args.export, iter_export_rows(packed(matrix)),
+                                           export_format)
+            report_duplicates()
+            report_packing()
+            log(f"Exported {count} searches to {args.export}")
+            return 0
+
+        if not args.open:
+            with trace.span('urls.emit'):
+                for search in packed(matrix):
+                    sys.stdout.write(search.url + '\n')
+            report_duplicates()
+            report_packing()
+            return 0
+
+        # Opening tabs takes far longer than holding the list, and the
+        # journal needs it up front so the run can be resumed
+        cache = SearchCache(os.path.join(get_appdata_path(), 'search_cache.json'),
+                            ttl=args.cache_hours * 3600)
+        history = SearchHistory.in_folder(get_appdata_path())
+        with trace.span('queries.build'):
+            # Filter before packing so a packed search only holds clients still due
+            searches = [search for search in matrix
+                        if not cache.is_fresh(search.query, search.time_param)]
+            if args.prioritize:
+                registry = ClientRegistry.in_folder(get_appdata_path())
+                try:
+                    priorities = registry.priorities({search.client for search in searches})
+                finally:
+                    registry.close()
+                searches = prioritize(searches, history, priorities)
+            searches = list(packed(searches))
+        report_duplicates()
+        if cache.hits:
+            log(f"Skipping {cache.hits} searches opened in the last {args.cache_hours:g} hours")
+        if matrix.combinations > 1:
+            log(f"{len(searches)} searches: {len(terms)} terms x {len(periods)} periods "
+                f"per client, {args.order}-major order")
+        report_packing()
+        estimate = search_engine.estimate_seconds(len(searches))
+        log(f"Estimated time: {engine.format_duration(estimate)}")
+        journal.start(params, searches)
         try:
-            clients = self.get_clients_from_text()
-            if not clients:
-                messagebox.showwarning("No Clients", "Please enter some client names first!")
-                return
-            
-            # Get settings
-            time_param = self.time_var.get()
-            try:
-                delay = float(self.delay_var.get())
-            except ValueError:
-                delay = 1.5
-                self.log_message("Invalid delay, using 1.5 seconds")
-            
-            try:
-                batch_size = int(self.batch_var.get())
-                if batch_size < 1:
-                    batch_size = 10
-            except ValueError:
-                batch_size = 10
-                self.log_message("Invalid batch size, using 10")
-            
-            # Generate queries
-            queries = [self.create_search_query(client) for client in clients]
-            
-            self.log_message(f"✅ Found {len(clients)} clients")
-            self.log_message(f"⚠️ Will open {len(queries)} browser tabs in batches of {batch_size}")
-            
-            # Show preview
-            self.log_message("🔍 Preview of searches:")
-            for i, query in enumerate(queries[:3], 1):
-                self.log_message(f"  {i}. {query}")
-            if len(queries) > 3:
-                self.log_message(f"  ... and {len(queries) - 3} more")
-            
-            # Ask for confirmation
-            if len(queries) > 10:
-                response = messagebox.askyesno("Confirm", 
-                    f"This will open {len(queries)} browser tabs.\n\nContinue?")
-                if not response:
-                    self.log_message("❌ Search cancelled by user")
-                    return
-            
-            # Configure progress bar
-            self.progress['maximum'] = len(queries)
-            self.progress['value'] = 0
-            
-            # Perform searches
-            self.log_message("🔄 Starting searches...")
-            successful_opens = 0
-            
-            for i, query in enumerate(queries):
-                if not self.is_searching:
-                    break
-                
-                # Batch pause
-                if i > 0 and i % batch_size == 0:
-                    self.log_message(f"⏸️ Batch complete ({i}/{len(queries)}). Pausing 3 seconds...")
-                    time.sleep(3)
-                    
-                if self.open_google_search(query, time_param, delay):
-                    successful_opens += 1
-                
-                # Update progress bar
-                self.progress['value'] = i + 1
-                self.root.update_idletasks()
-            
-            # Summary
-            self.log_message("=" * 50)
-            self.log_message("📊 SEARCH SUMMARY")
-            self.log_message("=" * 50)
-            self.log_message(f"Total clients: {len(clients)}")
-            self.log_message(f"Browser tabs opened: {successful_opens}/{len(queries)}")
-            
-            if successful_opens < len(queries):
-                self.log_message(f"⚠️ {len(queries) - successful_opens} searches failed")
-            else:
-                self.log_message("✅ All searches opened successfully!")
-                
-            self.log_message("🎉 Done! Check your browser tabs.")
-            
-        except Exception as e:
-            self.log_message(f"❌ Unexpected error: {e}")
-            messagebox.showerror("Error", f"An error occurred: {e}")
-        
+            result = run_journaled(search_engine, journal, searches, cache=cache,
+                                   coverage=coverage, history=history)
         finally:
-            self.progress['value'] = 0
-            self.is_searching = False
-            self.search_button.config(text="🔍 Start Search", state='normal')
-    
-    def start_search(self):
-        """Start the search process"""
-        if self.is_searching:
-            self.is_searching = False
-            self.search_button.config(text="🔍 Start Search")
-            self.log_message("⚠️ Cancelling search...")
-            return
-        
-        self.is_searching = True
-        self.search_button.config(text="⏹️ Cancel", state='normal')
-        
-        self.status_text.delete('1.0', 'end')
-        self.log_message("🚀 The Web Search-inator")
-        
-        search_thread = threading.Thread(target=self.search_worker)
-        search_thread.daemon = True
-        search_thread.start()
-
-
-def main():
-    """Main function to run the GUI application"""
-    root = tk.Tk()
-    app = GoaNewsSearchGUI(root)
-    
-    # Center window on screen
-    root.update_idletasks()
-    width = root.winfo_width()
-    height = root.winfo_height()
-    x = (root.winfo_screenwidth() // 2) - (width // 2)
-    y = (root.winfo_screenheight() // 2) - (height // 2)
-    root.geometry(f"{width}x{height}+{x}+{y}")
-    
-    root.mainloop()
+            cache.save()
+            coverage.save()
+            history.save()
+        report_run(result, search_launcher, log)
+        report_cache(cache, log)
+        return 0 if result.failed == 0 else 1
+    finally:
+        if stream is not None and stream is not sys.stdin:
+            stream.close()
+        if stub is not None:
+            stub.stop()
 
 
-if __name__ == "__main__":
+def run_gui():
+    """Start the Tk application"""
     try:
-        main()
+        from searchinator.gui import main as gui_main
+        gui_main()
     except Exception as e:
-        messagebox.showerror("Error", f"Failed to start application: {e}")
\ No newline at end of file
+        from tkinter import messagebox
+        messagebox.showerror("Error", f"Failed to start application: {e}")
+
+
+def main(argv=None):
+    """Dispatch to the command line when arguments are given, else the GUI"""
+    if argv is None:
+        argv = sys.argv[1:]
+    # Finder passes a process serial number when launching the bundled app
+    argv = [arg for arg in argv if not arg.startswith('-psn_')]
+    if argv:
+        return run_cli(argv)
+    trace.enable()
+    run_gui()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())